@@ -1 +1,3 @@
 """Pathbuilder 2e → single-page HTML character sheet generator."""
+
+__version__ = "0.1.0"
@@ -0,0 +1,213 @@
+"""Render many Pathbuilder exports in one process pool."""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import render as _render
+from .cache import ParseCache
+from .fragments import Counts, counts_since
+from .manifest import Manifest, content_digest, is_current, make_entry, stream_if_changed
+from .minify import bytes_since
+from .model import CharacterModel
+from .options import BuildOptions
+from .parse import parse_build, unwrap_build
+from .profile import classify
+from .timings import StageTimer
+
+# BuildResult.status values
+WRITTEN = "written"
+UNCHANGED = "unchanged"  # rendered, but identical to the file already on disk
+SKIPPED = "skipped"  # manifest says inputs are unchanged; not rendered at all
+FAILED = "failed"
+
+
+@dataclass
+class BuildResult:
+    source: Path
+    out: Path | None = None
+    profile_type: str = ""
+    error: str = ""
+    seconds: float = 0.0
+    status: str = ""
+    entry: dict | None = None
+    stages: dict[str, float] = field(default_factory=dict)  # seconds, see timings.py
+    fragments: Counts = field(default_factory=dict)  # fragment cache hits/misses while rendering
+    minified: tuple[int, int] = (0, 0)  # UTF-8 bytes before and after --minify
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def collect_inputs(patterns: Iterable[str]) -> list[Path]:
+    """Expand directories and glob patterns into a sorted list of JSON files."""
+    found: set[Path] = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            found.update(p for p in path.glob("*.json") if p.is_file())
+        elif path.is_file():
+            found.add(path)
+        else:
+            found.update(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+    return sorted(found)
+
+
+def input_root(sources: Iterable[Path]) -> Path:
+    """The deepest directory holding every one of ``sources``."""
+    parents = {source.resolve().parent for source in sources}
+    return Path(os.path.commonpath(parents)) if parents else Path.cwd()
+
+
+def output_path(source: Path, out_dir: Path, root: Path | None = None) -> Path:
+    """``out_dir/<stem>_onepager.html``, in the source's subdirectory of ``root`` if given.
+
+    Sources from one directory get flat names; ``a/wizard.json`` and
+    ``b/wizard.json`` become ``a/wizard_onepager.html`` and
+    ``b/wizard_onepager.html`` under their common root.
+    """
+    name = f"{source.stem}_onepager.html"
+    if root is None:
+        return out_dir / name
+    return out_dir / source.resolve().parent.relative_to(root) / name
+
+
+def output_paths(sources: list[Path], out_dir: Path) -> list[Path]:
+    """One distinct output path per source; see ``output_path``."""
+    root = input_root(sources)
+    return [output_path(source, out_dir, root) for source in sources]
+
+
+def load_character(
+    raw: bytes,
+    timer: StageTimer,
+    strict: bool = False,
+    cache: ParseCache | None = None,
+    input_digest: str | None = None,
+) -> CharacterModel:
+    """Parse export bytes, through ``cache`` if one is given."""
+    if cache is not None:
+        return cache.load(raw, strict=strict, timer=timer, input_digest=input_digest)
+    with timer.stage("load_json"):
+        b = unwrap_build(json.loads(raw))
+    return parse_build(b, strict=strict, timer=timer)
+
+
+def build_one(
+    source: Path,
+    out: Path,
+    previous: dict | None,
+    options: BuildOptions,
+    strict: bool = False,
+    cache: ParseCache | None = None,
+) -> BuildResult:
+    """Parse, classify and render one file to ``out``; errors are captured, not raised.
+
+    ``previous`` is the manifest entry from the last build of this output, if
+    any; when it matches the current inputs the file is not rendered again.
+    With a ``cache``, the parsed model is read from or stored in it.
+    """
+    start = time.perf_counter()
+    result = BuildResult(source=source, out=out)
+    timer = StageTimer()
+    result.stages = timer.stages
+    try:
+        with timer.stage("read"):
+            raw = source.read_bytes()
+        engine = _render.default_engine()
+        with timer.stage("manifest"):
+            digest = content_digest(raw)
+            fingerprint = engine.fingerprint_for(options.font_source, options.fit)
+            entry = make_entry(source, digest, options, fingerprint)
+            current = is_current(previous, entry, result.out)
+        result.entry = entry
+        if current:
+            result.status = SKIPPED
+            result.profile_type = previous.get("profile", "")
+        else:
+            char = load_character(raw, timer, strict=strict, cache=cache, input_digest=digest)
+            with timer.stage("classify"):
+                profile = classify(char, override=options.profile_override)
+            counts, sizes = engine.fragment_counts(), engine.minified_bytes()
+            chunks = engine.generate(char, profile, timer=timer, **options.render_kwargs())
+            out.parent.mkdir(parents=True, exist_ok=True)
+            written = timer.stream(partial(stream_if_changed, result.out), chunks)
+            result.fragments = counts_since(counts, engine.fragment_counts())
+            result.minified = bytes_since(sizes, engine.minified_bytes())
+            result.status = WRITTEN if written else UNCHANGED
+            result.profile_type = profile.profile_type
+        entry["profile"] = result.profile_type
+    except Exception as e:  # noqa: BLE001 - one bad file must not stop the batch
+        result.error = f"{type(e).__name__}: {e}"
+        result.status = FAILED
+        result.entry = None
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _init_worker() -> None:
+    _render.default_engine()
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def build_many(
+    sources: list[Path],
+    out_dir: Path,
+    options: BuildOptions,
+    jobs: int | None = None,
+    incremental: bool = True,
+    strict: bool = False,
+    cache: ParseCache | None = None,
+) -> Iterator[BuildResult]:
+    """Yield a BuildResult per source, in input order.
+
+    Outputs are named by ``output_paths``, so sources in different
+    directories never share an output file.
+
+    With ``incremental`` the output directory's manifest is consulted to skip
+    unchanged inputs, and updated once the batch finishes. ``cache`` is
+    passed to every ``build_one``.
+    """
+    jobs = jobs or default_jobs()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest.load(out_dir)
+    outs = output_paths(sources, out_dir)
+    previous = [manifest.get(out) if incremental else None for out in outs]
+    work = partial(build_one, options=options, strict=strict, cache=cache)
+
+    try:
+        if jobs == 1 or len(sources) <= 1:
+            _init_worker()
+            results = map(work, sources, outs, previous)
+            for result in results:
+                _record(manifest, result)
+                yield result
+            return
+
+        chunksize = max(1, len(sources) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+        ) as pool:
+            for result in pool.map(work, sources, outs, previous, chunksize=chunksize):
+                _record(manifest, result)
+                yield result
+    finally:
+        manifest.save()
+
+
+def _record(manifest: Manifest, result: BuildResult) -> None:
+    if result.entry is not None and result.out is not None:
+        manifest.update(result.out, result.entry)
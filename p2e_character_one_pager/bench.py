@@ -0,0 +1,571 @@
+"""Benchmarks for the parse → classify → render pipeline.
+
+``run_suite`` times every stage separately — ``load_json``, each ``parse_*``
+function, ``classify`` and ``render`` — over a corpus of exports (synthetic by
+default, see ``corpus.py``), and reports cold and warm timings for single-file
+and batch use. Results are flat ``{metric: milliseconds}`` dicts so they can be
+saved as a baseline and compared against later runs.
+"""
+
+from __future__ import annotations
+
+import json
+import operator
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from . import parse as _parse
+from .options import BuildOptions
+from .parse import load_json, parse_build, parse_builds
+from .profile import classify
+
+if TYPE_CHECKING:
+    from .fragments import FragmentStats
+    from .model import CharacterModel
+    from .pipeline import PipelineStats
+    from .profile import Profile
+
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BUDGET_MS = 200.0  # spec §2.11: "< 200ms typical"
+NOISE_FLOOR_MS = 0.01
+
+# Cold-start budgets, in milliseconds, enforced by ``bench startup``
+STARTUP_BUDGETS_MS = {
+    "help.wall": 150.0,
+    "help.imports": 100.0,
+    "build.wall": 600.0,
+    "build.imports": 350.0,
+}
+# Modules the CLI must not import just to print help or a usage error
+HEAVY_MODULES = ("pydantic", "jinja2", "p2e_character_one_pager.render", "p2e_character_one_pager.spells")
+
+# (stage name, callable taking (build, abilities))
+PARSE_STAGES: list[tuple[str, Callable]] = [
+    ("parse_identity", lambda b, ab: _parse.parse_identity(b)),
+    ("parse_abilities", lambda b, ab: _parse.parse_abilities(b)),
+    ("parse_defense", lambda b, ab: _parse.parse_defense(b, ab)),
+    ("parse_skills", lambda b, ab: _parse.parse_skills(b, ab)),
+    ("parse_lores", lambda b, ab: _parse.parse_lores(b, ab)),
+    ("parse_feats", lambda b, ab: _parse.parse_feats(b)),
+    ("parse_weapons", lambda b, ab: _parse.parse_weapons(b)),
+    ("parse_items", lambda b, ab: _parse.parse_items(b)),
+    ("parse_spellcasters", lambda b, ab: _parse.parse_spellcasters(b, ab)),
+    ("parse_focus", lambda b, ab: _parse.parse_focus(b)),
+    ("parse_specials", lambda b, ab: _parse.parse_specials(b)),
+]
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """Best mean wall time per call, in seconds, over ``repeat`` rounds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def compare_variants(
+    variants: dict[str, Callable[[], list]],
+    reference: str,
+    same: Callable[[object, object], bool] = operator.eq,
+    repeat: int = 3,
+    number: int = 1,
+) -> tuple[dict[str, float], list[int], dict[str, list]]:
+    """Cross-check and time ways of producing the same list of outputs.
+
+    Each variant is called once and its outputs are compared item by item
+    with ``reference``'s using ``same``; that call also warms caches. Each is
+    then timed with ``best_of`` (``repeat=0`` skips the timing). Returns the
+    seconds per call of each variant, the indexes of items where any variant
+    differs from the reference, and the outputs of the checking calls.
+    """
+    outputs = {name: run() for name, run in variants.items()}
+    expected = outputs[reference]
+    mismatches: set[int] = set()
+    for name, got in outputs.items():
+        if name == reference:
+            continue
+        mismatches.update(range(min(len(got), len(expected)), max(len(got), len(expected))))
+        mismatches.update(i for i, (a, b) in enumerate(zip(expected, got)) if not same(a, b))
+    timings = {name: best_of(run, repeat=repeat, number=number) for name, run in variants.items()} if repeat else {}
+    return timings, sorted(mismatches), outputs
+
+
+def _same_model(a: CharacterModel, b: CharacterModel) -> bool:
+    return a.model_dump() == b.model_dump()
+
+
+def compare_parse_modes(builds: list[dict], repeat: int = 5, number: int = 20) -> dict[str, float]:
+    """Seconds per character for the trusted (default) and strict parse modes."""
+    timings, _mismatches, _outputs = compare_variants(
+        {
+            "trusted": lambda: [parse_build(b) for b in builds],
+            "strict": lambda: [parse_build(b, strict=True) for b in builds],
+        },
+        reference="strict",
+        same=_same_model,
+        repeat=repeat,
+        number=number,
+    )
+    return {mode: seconds / len(builds) for mode, seconds in timings.items()}
+
+
+def compare_vectorized(builds: list[dict], repeat: int = 5) -> tuple[dict[str, float], list[int]]:
+    """Seconds per character for scalar and vectorized batch parsing, and mismatches.
+
+    Timings are keyed ``scalar``, ``vectorized`` and ``derive`` (the NumPy pass
+    alone). The second value lists the indexes of builds whose two models differ.
+    """
+    from .derived import derive_stats
+
+    timings, mismatches, _outputs = compare_variants(
+        {
+            "scalar": lambda: parse_builds(builds),
+            "vectorized": lambda: parse_builds(builds, vectorized=True),
+        },
+        reference="scalar",
+        same=_same_model,
+        repeat=repeat,
+    )
+    timings["derive"] = best_of(lambda: derive_stats(builds), repeat=repeat)
+    return {name: seconds / len(builds) for name, seconds in timings.items()}, mismatches
+
+
+def compare_pipeline(
+    sources: list[Path], out_dir: Path, latency: float, jobs: int = 1, io_concurrency: int = 8
+) -> tuple[dict[str, float], PipelineStats, list[str]]:
+    """Files/sec building ``sources`` one at a time vs. through ``run_pipeline``.
+
+    Both add ``latency`` seconds to every read and write. Returns the rates
+    (``sequential``, ``pipeline``), the pipeline's counters and the names of
+    sources whose two outputs differ.
+    """
+    import asyncio
+
+    from .batch import output_paths
+    from .manifest import content_digest, stream_if_changed
+    from .pipeline import render_text, run_pipeline
+
+    options = BuildOptions()
+    sequential_dir, pipeline_dir = out_dir / "sequential", out_dir / "pipeline"
+    sequential_dir.mkdir(parents=True, exist_ok=True)
+    render_text(sources[0].read_bytes(), "", options)  # load the engine outside the timing
+    sequential_outs = output_paths(sources, sequential_dir)
+    start = time.perf_counter()
+    for source, out in zip(sources, sequential_outs):
+        time.sleep(latency)
+        raw = source.read_bytes()
+        try:
+            html = render_text(raw, content_digest(raw), options)[0]
+        except Exception:  # noqa: BLE001 - counted as a mismatch below
+            continue
+        time.sleep(latency)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        stream_if_changed(out, [html])
+    sequential = time.perf_counter() - start
+    stats = asyncio.run(run_pipeline(
+        sources, pipeline_dir, options, jobs=jobs, io_concurrency=io_concurrency, incremental=False, latency=latency
+    ))
+
+    def output(path: Path) -> bytes | None:
+        return path.read_bytes() if path.exists() else None
+
+    mismatches = [
+        source.name
+        for source, sequential_out, pipeline_out in zip(
+            sources, sequential_outs, output_paths(sources, pipeline_dir)
+        )
+        if output(sequential_out) is None or output(sequential_out) != output(pipeline_out)
+    ]
+    return {"sequential": len(sources) / sequential, "pipeline": stats.throughput}, stats, mismatches
+
+
+def compare_templates(builds: list[dict]) -> tuple[int, list[str]]:
+    """Render ``builds`` with source-compiled and precompiled templates.
+
+    Every build is rendered in each theme and page size, with ``fit``, and
+    with known spells instead of prepared ones, plus one roster document and
+    one static-site index page of them all. Returns how many documents were
+    compared and a label for each one that differed.
+    """
+    from .options import PAGE_SIZE_CHOICES, THEME_CHOICES
+    from .render import OnePagerEngine
+
+    variants = [dict(theme=theme, page_size=size) for theme in THEME_CHOICES for size in PAGE_SIZE_CHOICES]
+    variants += [dict(fit=True), dict(include_prepared=False, include_known=True)]
+    sheets = [(char, classify(char)) for char in parse_builds(builds)]
+    index = [
+        dict(href=f"#{i}", name=char.identity.name, char_class=char.identity.char_class,
+             level=char.identity.level, ancestry=char.identity.ancestry)
+        for i, (char, _profile) in enumerate(sheets)
+    ]
+    labels = [f"build {i} {options}" for i in range(len(sheets)) for options in variants]
+    labels += ["roster", "site index"]
+
+    def render_all(engine: OnePagerEngine) -> list[str]:
+        documents = [engine.render(char, profile, **options) for char, profile in sheets for options in variants]
+        documents.append("".join(engine.generate_roster(sheets)))
+        documents.append(engine.render_index(index))
+        return documents
+
+    source = OnePagerEngine(compiled_templates=False)
+    compiled = OnePagerEngine(compiled_templates=True)
+    _timings, mismatches, _outputs = compare_variants(
+        {"source": lambda: render_all(source), "compiled": lambda: render_all(compiled)},
+        reference="source",
+        repeat=0,
+    )
+    return len(labels), [labels[i] for i in mismatches]
+
+
+def level_up(char: CharacterModel) -> CharacterModel:
+    """``char`` one level higher: new level and hit points, and a better top skill."""
+    identity = char.identity.model_copy(update={"level": char.identity.level + 1})
+    defense = char.defense.model_copy(update={"hp": char.defense.hp + 8})
+    skills = list(char.skills)
+    if skills:
+        skills[0] = skills[0].model_copy(update={"modifier": skills[0].modifier + 1})
+    return char.model_copy(update={"identity": identity, "defense": defense, "skills": skills})
+
+
+def compare_fragments(
+    builds: list[dict], repeat: int = 3
+) -> tuple[dict[str, float], dict[str, FragmentStats], list[str]]:
+    """Seconds per character rendering ``builds`` with and without the fragment caches.
+
+    Timings are keyed:
+
+    - ``uncached``: neither cache
+    - ``lines``: only the line cache, starting empty, so entries repeated
+      between characters render once
+    - ``cold``: both caches, starting empty
+    - ``level_up``: re-rendering every character after ``level_up``, with
+      its earlier sheet cached
+
+    Also returns the counters of the line cache for a ``cold`` round and of
+    the section cache for a ``level_up`` round, and a label for each document
+    that differs from the uncached render.
+    """
+    from .fragments import FragmentCache
+    from .render import OnePagerEngine
+
+    uncached = OnePagerEngine(fragments=FragmentCache(0), lines=FragmentCache(0))
+    engine = OnePagerEngine()
+    sections_size, lines_size = engine.fragments.max_chars, engine.lines.max_chars
+    sheets = [(char, classify(char)) for char in parse_builds(builds)]
+    leveled = [(level_up(char), profile) for char, profile in sheets]
+
+    def render_all(renderer: OnePagerEngine, batch: list[tuple[CharacterModel, Profile]]) -> list[str]:
+        return [renderer.render(char, profile) for char, profile in batch]
+
+    def fresh(sections: bool = True) -> OnePagerEngine:
+        engine.fragments = FragmentCache(sections_size if sections else 0)
+        engine.lines = FragmentCache(lines_size)
+        return engine
+
+    # "cold" last: the line cache's counters below are from its final round
+    results, mismatches, _outputs = compare_variants(
+        {
+            "uncached": lambda: render_all(uncached, sheets),
+            "lines": lambda: render_all(fresh(sections=False), sheets),
+            "cold": lambda: render_all(fresh(), sheets),
+        },
+        reference="uncached",
+        repeat=repeat,
+    )
+    labels = [f"build {i}" for i in mismatches]
+    stats = {"lines": engine.lines.stats}
+
+    best = float("inf")
+    for _ in range(repeat):
+        render_all(fresh(), sheets)
+        before = engine.fragments.stats
+        start = time.perf_counter()
+        rendered = render_all(engine, leveled)
+        best = min(best, time.perf_counter() - start)
+    results["level_up"] = best
+    stats["sections"] = engine.fragments.stats
+    stats["sections"].hits -= before.hits
+    stats["sections"].misses -= before.misses
+    expected = render_all(uncached, leveled)
+    labels += [f"leveled build {i}" for i, html in enumerate(rendered) if html != expected[i]]
+    return {name: seconds / len(sheets) for name, seconds in results.items()}, stats, labels
+
+
+def layout_outline(html: str) -> tuple[list[tuple], str]:
+    """The tags of ``html`` with their attributes, and its text as a browser lays it out.
+
+    Text is read as CSS ``white-space: normal`` would show it: whitespace runs
+    become one space, and none is kept next to a block-level tag, which is
+    written as a line break. ``<style>`` contents are left out and script
+    lines are stripped. Documents with equal outlines render the same text in
+    the same elements.
+    """
+    from html.parser import HTMLParser
+
+    from .minify import BLOCK_TAGS
+
+    blocks = set(BLOCK_TAGS)
+    tags: list[tuple] = []
+    text: list[str] = []
+
+    class Outline(HTMLParser):
+        raw = ""
+
+        def handle_starttag(self, tag, attrs):
+            tags.append((tag, tuple(attrs)))
+            if tag in blocks:
+                text.append("\x00")
+            if tag in ("script", "style"):
+                self.raw = tag
+
+        def handle_endtag(self, tag):
+            tags.append(("/" + tag,))
+            if tag in blocks:
+                text.append("\x00")
+            if tag == self.raw:
+                self.raw = ""
+
+        def handle_data(self, data):
+            if self.raw == "script":
+                tags.append(("script", tuple(line.strip() for line in data.splitlines() if line.strip())))
+            elif not self.raw:
+                text.append(data)
+
+    parser = Outline(convert_charrefs=False)
+    parser.feed(html)
+    parser.close()
+    laid_out = re.sub(r"\s+", " ", "".join(text))
+    return tags, re.sub(r" ?\x00[ \x00]*", "\n", laid_out).strip()
+
+
+def compare_minify(
+    builds: list[dict], repeat: int = 3
+) -> tuple[dict[str, float], dict[str, tuple[int, int, int]], list[str]]:
+    """Render ``builds`` with and without ``minify`` and compare the results.
+
+    Returns seconds per character for ``plain`` and ``minify`` renders, the
+    ``(sheets, bytes before, bytes after)`` per profile type and for the
+    roster, and a label for each document whose ``layout_outline`` differs
+    from the plain render's.
+    """
+    from .render import OnePagerEngine
+
+    engine = OnePagerEngine()
+    sheets = [(char, classify(char)) for char in parse_builds(builds)]
+
+    def render_all(**options) -> list[str]:
+        return [engine.render(char, profile, **options) for char, profile in sheets]
+
+    results, mismatches, outputs = compare_variants(
+        {"plain": render_all, "minify": lambda: render_all(minify=True)},
+        reference="plain",
+        same=lambda a, b: layout_outline(a) == layout_outline(b),
+        repeat=repeat,
+    )
+    labels = [f"build {i} {sheets[i][0].identity.name}" for i in mismatches]
+    sizes: dict[str, tuple[int, int, int]] = {}
+    for (_char, profile), plain, minified in zip(sheets, outputs["plain"], outputs["minify"]):
+        count, before, after = sizes.get(profile.profile_type, (0, 0, 0))
+        sizes[profile.profile_type] = (
+            count + 1, before + len(plain.encode("utf-8")), after + len(minified.encode("utf-8"))
+        )
+    plain = "".join(engine.generate_roster(sheets))
+    minified = "".join(engine.generate_roster(sheets, minify=True))
+    if layout_outline(plain) != layout_outline(minified):
+        labels.append("roster")
+    sizes["roster"] = (1, len(plain.encode("utf-8")), len(minified.encode("utf-8")))
+    return {name: seconds / len(sheets) for name, seconds in results.items()}, sizes, labels
+
+
+def time_stages(paths: list[Path], repeat: int = 3) -> dict[str, float]:
+    """Warm per-character milliseconds for each pipeline stage over ``paths``."""
+    from .render import default_engine
+
+    n = len(paths)
+    metrics: dict[str, float] = {}
+
+    def per_char(fn: Callable[[], object]) -> float:
+        fn()
+        return best_of(fn, repeat=repeat) / n * 1000
+
+    metrics["load_json"] = per_char(lambda: [load_json(p) for p in paths])
+    builds = [load_json(p) for p in paths]
+    abilities = [_parse.parse_abilities(b) for b in builds]
+    for name, stage in PARSE_STAGES:
+        metrics[name] = per_char(lambda stage=stage: [stage(b, ab) for b, ab in zip(builds, abilities)])
+    metrics["parse_build"] = per_char(lambda: [parse_build(b) for b in builds])
+
+    chars = [parse_build(b) for b in builds]
+    metrics["classify"] = per_char(lambda: [classify(c) for c in chars])
+    profiles = [classify(c) for c in chars]
+    engine = default_engine()
+    metrics["render"] = per_char(lambda: [engine.render(c, p) for c, p in zip(chars, profiles)])
+    return metrics
+
+
+def time_cold_single(path: Path, repeat: int = 3) -> dict[str, float]:
+    """Milliseconds for a first render: fresh engine in-process and a fresh CLI process."""
+    from .render import OnePagerEngine
+
+    metrics: dict[str, float] = {}
+    start = time.perf_counter()
+    engine = OnePagerEngine()
+    metrics["engine_init"] = (time.perf_counter() - start) * 1000
+    char = parse_build(load_json(path))
+    start = time.perf_counter()
+    engine.render(char, classify(char))
+    metrics["first_render"] = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args = ["build", str(path), "-o", str(Path(tmp) / "out.html"), "--no-cache"]
+        metrics["cli_build"] = time_cli(args, repeat=repeat)
+    return metrics
+
+
+def _cli_command(args: list[str], interpreter_flags: list[str] = ()) -> tuple[list[str], dict[str, str]]:
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    return [sys.executable, *interpreter_flags, "-m", "p2e_character_one_pager.cli", *args], env
+
+
+def time_cli(args: list[str], repeat: int = 1) -> float:
+    """Best wall-clock milliseconds for a fresh ``p2e-character-one-pager`` process."""
+    cmd, env = _cli_command(args)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True, capture_output=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_profile(args: list[str], repeat: int = 1) -> tuple[float, set[str]]:
+    """Total ``-X importtime`` milliseconds and the modules imported for a CLI run.
+
+    The total is the sum of every module's self time, i.e. time spent importing
+    beyond the bare interpreter start-up; the best of ``repeat`` runs is kept.
+    """
+    cmd, env = _cli_command(args, ["-X", "importtime"])
+    best = float("inf")
+    modules: set[str] = set()
+    for _ in range(repeat):
+        proc = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+        total_us = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            self_us, _, name = line[len("import time:"):].split("|")
+            if not self_us.strip().isdigit():
+                continue  # the header row
+            total_us += int(self_us)
+            modules.add(name.strip())
+        best = min(best, total_us / 1000)
+    return best, modules
+
+
+def measure_startup(path: Path, repeat: int = 3) -> tuple[dict[str, float], set[str]]:
+    """Cold-start metrics for ``--help`` and a minimal ``build`` of ``path``.
+
+    Returns ``{metric: ms}`` (``help.wall``, ``help.imports``, ``build.wall``,
+    ``build.imports``) and the set of modules ``--help`` imported.
+    """
+    metrics: dict[str, float] = {}
+    metrics["help.wall"] = time_cli(["--help"], repeat=repeat)
+    metrics["help.imports"], help_modules = import_profile(["--help"], repeat=repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        args = ["build", str(path), "-o", str(Path(tmp) / "out.html"), "--no-cache"]
+        metrics["build.wall"] = time_cli(args, repeat=repeat)
+        metrics["build.imports"], _ = import_profile(args, repeat=repeat)
+    return metrics, help_modules
+
+
+def check_startup(
+    metrics: dict[str, float],
+    help_modules: set[str],
+    budgets: dict[str, float] = STARTUP_BUDGETS_MS,
+) -> list[str]:
+    """Describe every startup budget exceeded and heavy module loaded by ``--help``."""
+    violations = [
+        f"{name}: {metrics[name]:.1f} ms exceeds budget {budget:.1f} ms"
+        for name, budget in budgets.items()
+        if name in metrics and metrics[name] > budget
+    ]
+    for heavy in HEAVY_MODULES:
+        if any(m == heavy or m.startswith(heavy + ".") for m in help_modules):
+            violations.append(f"--help imports {heavy}")
+    return violations
+
+
+def time_batch(paths: list[Path], jobs: int) -> dict[str, float]:
+    """Milliseconds per file for batch builds.
+
+    Cold runs are fresh ``build-all`` processes (interpreter start, imports and
+    pool start-up included); the warm run reuses this process's engine.
+    """
+    from .batch import build_many
+
+    metrics: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_jobs in sorted({1, jobs}):
+            args = ["build-all", *map(str, paths), "-d", str(Path(tmp) / f"jobs{n_jobs}"), "-j", str(n_jobs), "--force"]
+            metrics[f"cold.jobs{n_jobs}"] = time_cli(args) / len(paths)
+        list(build_many(paths, Path(tmp) / "warm", BuildOptions(), jobs=1, incremental=False))
+        start = time.perf_counter()
+        list(build_many(paths, Path(tmp) / "warm", BuildOptions(), jobs=1, incremental=False))
+        metrics["warm.jobs1"] = (time.perf_counter() - start) / len(paths) * 1000
+    return metrics
+
+
+def run_suite(paths: list[Path], repeat: int = 3, jobs: int | None = None) -> dict[str, float]:
+    """All metrics, in milliseconds, keyed ``mode.temperature.stage``."""
+    jobs = jobs or os.cpu_count() or 1
+    # The single-file case uses the median-sized export as the typical sheet
+    typical = sorted(paths, key=lambda p: p.stat().st_size)[len(paths) // 2]
+    results: dict[str, float] = {}
+    for name, value in time_cold_single(typical, repeat=repeat).items():
+        results[f"single.cold.{name}"] = value
+    for name, value in time_stages([typical], repeat=max(repeat, 5)).items():
+        results[f"single.warm.{name}"] = value
+    for name, value in time_stages(paths, repeat=repeat).items():
+        results[f"batch.warm.{name}"] = value
+    for name, value in time_batch(paths, jobs).items():
+        results[f"batch.{name}"] = value
+    return results
+
+
+def find_regressions(
+    current: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Describe every metric more than ``threshold`` (fraction) slower than baseline.
+
+    Differences below ``NOISE_FLOOR_MS`` are ignored so sub-microsecond stages
+    cannot fail the run on timer jitter alone.
+    """
+    regressions = []
+    for name, value in current.items():
+        base = baseline.get(name)
+        if base and value > base * (1 + threshold) and value - base > NOISE_FLOOR_MS:
+            regressions.append(f"{name}: {value:.3f} ms vs baseline {base:.3f} ms (+{(value / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data.get("metrics", data)
+
+
+def save_results(path: Path, metrics: dict[str, float], **meta: object) -> None:
+    payload = {"meta": meta, "metrics": metrics}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
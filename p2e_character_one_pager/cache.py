@@ -0,0 +1,277 @@
+"""Persistent cache of parsed characters, keyed by input content and parser version.
+
+Re-rendering the same exports under other themes, page sizes or profiles
+need not parse them again. Each entry is one file in the cache directory
+named by ``sha256(parser stamp, parse mode, content hash)``. The parser stamp
+hashes the package version and the parser and model sources, so editing
+either invalidates every entry.
+
+Entries are pickles of the ``CharacterModel`` tree written with a reducer
+that restores each model straight into its instance state, as
+``construct_trusted`` does, skipping pydantic's slower ``__setstate__``.
+Loading one is cheaper than ``json.loads`` plus ``parse_build``. Pickles
+run code when loaded, so the directory is created private to the user, and
+an existing directory that another user owns or that group or others can
+write to is not used at all (see ``ParseCache.problem``).
+
+A read marks an entry as used (its mtime). Once the directory grows past
+``max_bytes``, the least recently used entries are removed until it is back
+under ``EVICT_TO`` of the limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import stat
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from . import __version__
+from .manifest import content_digest
+from .model import CharacterModel
+from .parse import parse_build, unwrap_build
+
+if TYPE_CHECKING:
+    from .timings import StageTimer
+
+CACHE_DIR_ENV = "P2E_ONEPAGER_CACHE_DIR"
+CACHE_MAX_MB_ENV = "P2E_ONEPAGER_CACHE_MAX_MB"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+EVICT_TO = 0.9
+ENTRY_SUFFIX = ".pickle"
+# Bump when the entry encoding changes
+CACHE_FORMAT = 1
+
+
+def default_cache_dir() -> Path:
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "p2e-character-one-pager" / "parse"
+
+
+def default_max_bytes() -> int:
+    try:
+        return int(float(os.environ[CACHE_MAX_MB_ENV]) * 1024 * 1024)
+    except (KeyError, ValueError):
+        return DEFAULT_MAX_BYTES
+
+
+@lru_cache(maxsize=1)
+def parser_stamp() -> str:
+    """Hash of everything besides the input that can change a parsed model."""
+    digest = hashlib.sha256(f"{__version__}:{CACHE_FORMAT}".encode())
+    for name in ("parse.py", "model.py"):
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()
+
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+def _restore(cls: type[BaseModel], state: dict, fields_set: tuple[str, ...]) -> BaseModel:
+    obj = _object_new(cls)
+    _object_setattr(obj, "__dict__", state)
+    _object_setattr(obj, "__pydantic_fields_set__", set(fields_set))
+    _object_setattr(obj, "__pydantic_extra__", None)
+    _object_setattr(obj, "__pydantic_private__", None)
+    return obj
+
+
+class _ModelPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if isinstance(obj, BaseModel):
+            return _restore, (type(obj), obj.__dict__, tuple(obj.__pydantic_fields_set__))
+        return NotImplemented
+
+
+def dumps(char: CharacterModel) -> bytes:
+    buffer = io.BytesIO()
+    _ModelPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(char)
+    return buffer.getvalue()
+
+
+def _unsafe_directory(directory: Path) -> str | None:
+    """Why ``directory`` must not hold our pickles, or None; a missing one is fine."""
+    try:
+        st = directory.stat()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        return f"cannot inspect {directory}: {e}"
+    if not stat.S_ISDIR(st.st_mode):
+        return f"{directory} is not a directory"
+    if not hasattr(os, "getuid"):
+        return None  # no POSIX ownership or modes to check
+    if st.st_uid != os.getuid():
+        return f"{directory} is owned by another user"
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return f"{directory} is writable by other users (mode {stat.S_IMODE(st.st_mode):o}; chmod 700 it)"
+    return None
+
+
+@dataclass
+class CacheStats:
+    directory: Path
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int = 0
+    misses: int = 0
+
+
+class ParseCache:
+    """Parsed models on disk, with size-bounded LRU eviction.
+
+    Safe to share between threads and processes: entries are written
+    atomically, and a missing or unreadable entry is simply a miss.
+    """
+
+    def __init__(self, directory: Path | str | None = None, max_bytes: int | None = None) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = default_max_bytes() if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None  # bytes on disk, counted on the first write
+        self._problem: str | None = None
+        self._checked = False
+
+    @property
+    def problem(self) -> str | None:
+        """Why the directory is unsafe to load pickles from, or None if it is fine.
+
+        Checked once, on first use. While there is a problem every lookup is
+        a miss and nothing is written.
+        """
+        if not self._checked:
+            self._problem = _unsafe_directory(self.directory)
+            self._checked = True
+        return self._problem
+
+    def key(self, input_digest: str, strict: bool = False) -> str:
+        mode = "strict" if strict else "trusted"
+        return hashlib.sha256(f"{parser_stamp()}:{mode}:{input_digest}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> CharacterModel | None:
+        if self.problem:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            char = pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:  # noqa: BLE001 - a truncated or stale entry is just a miss
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return char
+
+    def put(self, key: str, char: CharacterModel) -> None:
+        """Store ``char``; failures to write are ignored (the cache is best-effort)."""
+        if self.problem:
+            return
+        data = dumps(char)
+        path = self._path(key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        if self._size is None:
+            self._size = sum(size for _path, size, _mtime in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        try:
+            scan = os.scandir(self.directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        with scan:
+            for entry in scan:
+                if entry.name.endswith(ENTRY_SUFFIX) and not entry.name.startswith("."):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((Path(entry.path), st.st_size, st.st_mtime))
+        return entries
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under ``EVICT_TO`` of the limit."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _path, size, _mtime in entries)
+        removed = 0
+        for path, size, _mtime in entries:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many there were."""
+        entries = self._entries()
+        for path, _size, _mtime in entries:
+            path.unlink(missing_ok=True)
+        self._size = 0
+        return len(entries)
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(
+            directory=self.directory,
+            entries=len(entries),
+            bytes=sum(size for _path, size, _mtime in entries),
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    def load(
+        self,
+        raw: bytes,
+        strict: bool = False,
+        timer: StageTimer | None = None,
+        input_digest: str | None = None,
+    ) -> CharacterModel:
+        """The model for export bytes ``raw``: cached, or parsed and then cached."""
+        stage = timer.stage if timer is not None else (lambda _name: nullcontext())
+        key = self.key(input_digest or content_digest(raw), strict)
+        with stage("cache_get"):
+            char = self.get(key)
+        if char is None:
+            with stage("load_json"):
+                b = unwrap_build(json.loads(raw))
+            char = parse_build(b, strict=strict, timer=timer)
+            with stage("cache_put"):
+                self.put(key, char)
+        return char
@@ -1,16 +1,35 @@
-"""CLI entry point for p2e-character-one-pager."""
+"""CLI entry point for p2e-character-one-pager.
+
+Only click and the lightweight option definitions are imported at module load.
+The parser (pydantic), the renderer (jinja2) and everything else a command
+needs are imported inside that command, so ``--help``, usage errors and
+commands that never render don't pay for them. ``bench startup`` measures
+and enforces this.
+"""
 
 from __future__ import annotations
 
-import json
+import functools
+import itertools
 import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
 import click
 
-from .parse import parse
-from .profile import classify
-from .render import render
+from .options import (
+    FONT_SOURCE_CHOICES,
+    PAGE_SIZE_CHOICES,
+    PROFILE_CHOICES,
+    THEME_CHOICES,
+    BuildOptions,
+)
+
+if TYPE_CHECKING:
+    from .parse import DerivedStats
+
+VECTORIZED_HELP = "Derive stats for batches of characters with NumPy (needs the [fast] extra)"
 
 
 @click.group()
@@ -19,61 +38,1116 @@ def main() -> None:
     pass
 
 
+def render_options(f):
+    """Options shared by every command that renders sheets."""
+    options = [
+        click.option("--page-size", type=click.Choice(PAGE_SIZE_CHOICES), default="letter"),
+        click.option("--theme", type=click.Choice(THEME_CHOICES), default="default"),
+        click.option("--profile", "profile_override", type=click.Choice(PROFILE_CHOICES), default="auto"),
+        click.option("--skills", "max_skills", type=int, default=8, help="Number of skills to display"),
+        click.option("--include-prepared/--no-include-prepared", default=True),
+        click.option("--include-known/--no-include-known", default=False),
+        click.option("--font-source", type=click.Choice(FONT_SOURCE_CHOICES), default="google"),
+        click.option("--fit/--no-fit", default=False, help="Scale or trim the sheet to fit one printed page"),
+        click.option("--minify/--no-minify", default=False, help="Drop unused CSS rules and collapse whitespace"),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def instrument_options(f):
+    """--timings and --profile-out, for commands that build sheets."""
+    @functools.wraps(f)
+    def command(*args, profile_out: str | None, **kwargs):
+        if profile_out is None:
+            return f(*args, **kwargs)
+        from .timings import profiled
+
+        try:
+            with profiled(profile_out):
+                return f(*args, **kwargs)
+        finally:
+            click.echo(f"cProfile data: {profile_out}", err=True)
+
+    command = click.option(
+        "--timings", default=None, metavar="PATH",
+        help="Write per-stage timings as JSON to PATH (- for stderr)",
+    )(command)
+    return click.option(
+        "--profile-out", default=None, metavar="PATH", type=click.Path(dir_okay=False),
+        help="Write a cProfile/pstats dump of the run to PATH",
+    )(command)
+
+
+def _build_options(opts: dict) -> BuildOptions:
+    """BuildOptions from the render_options flags; exits if --font-source inline cannot work."""
+    options = BuildOptions(**opts)
+    if options.font_source == "inline":
+        from .fonts import FontError, find_faces
+
+        try:
+            find_faces()
+        except FontError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+    return options
+
+
+def cache_option(default: bool):
+    """``--cache/--no-cache``; on by default only where exports are rebuilt often."""
+    return click.option(
+        "--cache/--no-cache", "use_cache", default=default, show_default=True,
+        help="Reuse parsed characters from the on-disk parse cache (see 'cache stats')",
+    )
+
+
+def _parse_cache(use_cache: bool):
+    """A ``ParseCache``, or None if disabled or its directory is unsafe (with a warning)."""
+    if not use_cache:
+        return None
+    from .cache import ParseCache
+
+    parse_cache = ParseCache()
+    if parse_cache.problem:
+        click.echo(f"Warning: not using the parse cache: {parse_cache.problem}", err=True)
+        return None
+    return parse_cache
+
+
 @main.command()
 @click.argument("json_file", type=click.Path(exists=True, dir_okay=False))
-@click.option("--out", "-o", default=None, help="Output HTML file path")
-@click.option("--page-size", type=click.Choice(["letter", "a4"]), default="letter")
-@click.option("--theme", type=click.Choice(["default", "dark"]), default="default")
-@click.option("--profile", "profile_override", type=click.Choice(["auto", "caster", "martial", "hybrid"]), default="auto")
-@click.option("--skills", "max_skills", type=int, default=8, help="Number of skills to display")
-@click.option("--include-prepared/--no-include-prepared", default=True)
-@click.option("--include-known/--no-include-known", default=False)
-@click.option("--font-source", type=click.Choice(["google", "none"]), default="google")
+@click.option("--out", "-o", default=None, help="Output HTML file path (- for stdout)")
+@render_options
+@click.option("--strict", is_flag=True, default=False, help="Validate every parsed model (slower)")
 @click.option("--debug", is_flag=True, default=False, help="Dump computed model as JSON")
+@cache_option(default=False)
+@instrument_options
 def build(
-    json_file: str,
-    out: str | None,
-    page_size: str,
-    theme: str,
-    profile_override: str,
-    max_skills: int,
-    include_prepared: bool,
-    include_known: bool,
-    font_source: str,
-    debug: bool,
+    json_file: str, out: str | None, strict: bool, debug: bool, use_cache: bool, timings: str | None, **opts
 ) -> None:
-    """Build a one-pager HTML from a Pathbuilder JSON export."""
+    """Build a one-pager HTML from a Pathbuilder JSON export.
+
+    The sheet is written as it is rendered. With -o - it goes to stdout and
+    status messages go to stderr.
+    """
+    import io
+
+    from .manifest import stream_if_changed
+    from .parse import load_json, parse_build
+    from .profile import classify
+    from .render import default_engine
+    from .timings import StageTimer, write_report
+
+    timer = StageTimer()
+    parse_cache = _parse_cache(use_cache)
     try:
-        char = parse(json_file)
-    except (json.JSONDecodeError, KeyError) as e:
+        if parse_cache is not None:
+            char = parse_cache.load(Path(json_file).read_bytes(), strict=strict, timer=timer)
+        else:
+            with timer.stage("load_json"):
+                b = load_json(json_file)
+            char = parse_build(b, strict=strict, timer=timer)
+    except (ValueError, KeyError) as e:
         click.echo(f"Error parsing {json_file}: {e}", err=True)
         sys.exit(1)
 
-    profile = classify(char, override=profile_override)
+    options = _build_options(opts)
+    with timer.stage("classify"):
+        profile = classify(char, override=options.profile_override)
 
+    stem = Path(json_file).stem
     if out is None:
-        stem = Path(json_file).stem
         out = f"{stem}_onepager.html"
+    to_stdout = out == "-"
 
-    html = render(
-        char=char,
-        profile=profile,
-        page_size=page_size,
-        theme=theme,
-        font_source=font_source,
-        max_skills=max_skills,
-        include_prepared=include_prepared,
-        include_known=include_known,
-    )
+    with timer.stage("engine"):
+        engine = default_engine()
+    chunks = engine.generate(char, profile, timer=timer, **options.render_kwargs())
+    if to_stdout:
+        stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+        timer.stream(stdout.writelines, chunks)
+        stdout.flush()
+        stdout.detach()
+        click.echo(f"Profile: {profile.profile_type}", err=True)
+    else:
+        written = timer.stream(functools.partial(stream_if_changed, Path(out)), chunks)
+        click.echo(f"Profile: {profile.profile_type}")
+        click.echo(f"{'Written' if written else 'Unchanged'}: {out}")
+    if timings:
+        write_report(
+            {
+                "source": json_file,
+                "stages_ms": timer.as_ms(),
+                "total_ms": round(timer.total * 1000, 3),
+                "engine_ms": {part: round(s * 1000, 3) for part, s in engine.load_times.items()},
+            },
+            timings,
+        )
+    if options.fit:
+        click.echo(f"Fit: {engine.last_fit.summary()}", err=to_stdout)
+    if options.minify:
+        from .minify import saved_summary
 
-    Path(out).write_text(html, encoding="utf-8")
-    click.echo(f"Profile: {profile.profile_type}")
-    click.echo(f"Written: {out}")
+        click.echo(f"Minified: {saved_summary(*engine.minified_bytes())}", err=to_stdout)
 
     if debug:
-        debug_path = Path(out).with_suffix(".debug.json")
+        debug_path = Path(f"{stem}_onepager.debug.json") if to_stdout else Path(out).with_suffix(".debug.json")
         debug_path.write_text(char.model_dump_json(indent=2), encoding="utf-8")
-        click.echo(f"Debug: {debug_path}")
+        click.echo(f"Debug: {debug_path}", err=to_stdout)
+
+
+@main.command("build-all")
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("--out-dir", "-d", type=click.Path(file_okay=False), default=".", help="Directory for the HTML files")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None, help="Worker processes (default: CPU count)")
+@click.option("--force", is_flag=True, default=False, help="Rebuild even if the manifest says nothing changed")
+@click.option("--strict", is_flag=True, default=False, help="Validate every parsed model (slower)")
+@click.option("--io-concurrency", type=click.IntRange(min=1), default=None, metavar="N",
+              help="Overlap file I/O with rendering, N reads/writes at a time (for slow network mounts)")
+@render_options
+@cache_option(default=True)
+@instrument_options
+def build_all(
+    inputs: tuple[str, ...],
+    out_dir: str,
+    jobs: int | None,
+    force: bool,
+    strict: bool,
+    io_concurrency: int | None,
+    use_cache: bool,
+    timings: str | None,
+    **opts,
+) -> None:
+    """Build one-pagers for every export in directories or glob patterns.
+
+    Outputs whose input JSON, options and renderer are unchanged since the last
+    run (per the manifest in the output directory) are skipped. --timings
+    reports per-stage percentiles over the sheets that were rendered. Each
+    worker caches rendered sections and spell/weapon/item lines across the
+    sheets it renders; their hit rates are reported. With --minify, the bytes
+    saved are reported per sheet and in total. With --io-concurrency, files
+    are read and written by an asyncio pipeline while the workers render, and
+    are reported in the order they finish.
+    """
+    from .batch import SKIPPED, UNCHANGED, WRITTEN, BuildResult, build_many, collect_inputs, default_jobs
+    from .fragments import add_counts, counts_summary
+    from .minify import saved_summary
+    from .timings import summarize, write_report
+
+    sources = collect_inputs(inputs)
+    if not sources:
+        click.echo("No JSON files matched.", err=True)
+        sys.exit(1)
+
+    jobs = min(jobs or default_jobs(), len(sources))
+    options = _build_options(opts)
+    failures = []
+    counts = {SKIPPED: 0, UNCHANGED: 0}
+    rendered = []
+    fragments: dict[str, tuple[int, int]] = {}
+    minified = [0, 0]
+    cache = _parse_cache(use_cache)
+
+    def report(result: BuildResult) -> None:
+        if result.status in (WRITTEN, UNCHANGED):
+            rendered.append(result.stages)
+            add_counts(fragments, result.fragments)
+            minified[0] += result.minified[0]
+            minified[1] += result.minified[1]
+        if result.status in counts:
+            counts[result.status] += 1
+        elif result.ok:
+            detail = f"; {saved_summary(*result.minified)}" if options.minify else ""
+            click.echo(f"Written: {result.out} ({result.profile_type}{detail})")
+        else:
+            failures.append(result)
+            click.echo(f"Failed: {result.source}: {result.error}", err=True)
+
+    start = time.perf_counter()
+    pipeline_stats = None
+    if io_concurrency:
+        import asyncio
+
+        from .pipeline import run_pipeline
+
+        pipeline_stats = asyncio.run(run_pipeline(
+            sources, Path(out_dir), options, jobs=jobs, io_concurrency=io_concurrency,
+            incremental=not force, strict=strict, cache=cache, on_result=report,
+        ))
+    else:
+        for result in build_many(
+            sources, Path(out_dir), options, jobs=jobs, incremental=not force, strict=strict, cache=cache
+        ):
+            report(result)
+    elapsed = time.perf_counter() - start
+
+    built = len(sources) - len(failures)
+    rate = len(sources) / elapsed if elapsed > 0 else 0.0
+    click.echo(
+        f"Built {built}/{len(sources)} sheets in {elapsed:.2f}s "
+        f"({rate:.1f} files/sec, {jobs} worker{'s' if jobs != 1 else ''}; "
+        f"{counts[SKIPPED]} skipped, {counts[UNCHANGED]} unchanged)"
+    )
+    if fragments:
+        click.echo(f"Fragment cache hits: {counts_summary(fragments)}")
+    if options.minify and rendered:
+        click.echo(f"Minified: {saved_summary(*minified)} over {len(rendered)} sheets")
+    if pipeline_stats is not None:
+        click.echo(f"Pipeline: {pipeline_stats.summary()}")
+    if timings:
+        report_data = summarize(rendered) | {"files": len(sources), "skipped": counts[SKIPPED], "jobs": jobs}
+        report_data["fragments"] = {name: {"hits": h, "misses": m} for name, (h, m) in fragments.items()}
+        if options.minify:
+            report_data["minify"] = {"bytes_in": minified[0], "bytes_out": minified[1]}
+        if pipeline_stats is not None:
+            report_data["pipeline"] = pipeline_stats.as_dict()
+        write_report(report_data, timings)
+    if failures:
+        click.echo(f"{len(failures)} failed:", err=True)
+        for result in failures:
+            click.echo(f"  {result.source}", err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind")
+@click.option("--port", type=int, default=8000, show_default=True, help="Port to listen on (0 picks a free port)")
+def serve(host: str, port: int) -> None:
+    """Serve POST /render: Pathbuilder JSON in, one-pager HTML out."""
+    from .serve import make_server
+
+    server = make_server(host, port)
+    bound_host, bound_port = server.server_address[:2]
+    click.echo(f"Serving on http://{bound_host}:{bound_port}/render (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _require_numpy() -> None:
+    from .derived import numpy_available
+
+    if not numpy_available():
+        click.echo("NumPy is not installed: pip install 'p2e-character-one-pager[fast]'", err=True)
+        sys.exit(1)
+
+
+def _with_derived(
+    records: Iterator[tuple[float, dict]], vectorized: bool
+) -> Iterator[tuple[float, dict, DerivedStats | None, float]]:
+    """Yield ``(read seconds, build, derived stats, derive seconds)`` for each record.
+
+    With ``vectorized`` the stats are computed ``BATCH_SIZE`` builds at a
+    time and each build is charged an equal share of the pass.
+    """
+    if not vectorized:
+        for read_seconds, b in records:
+            yield read_seconds, b, None, 0.0
+        return
+    from .derived import BATCH_SIZE, derive_stats
+
+    while batch := list(itertools.islice(records, BATCH_SIZE)):
+        start = time.perf_counter()
+        derived = derive_stats([b for _seconds, b in batch])
+        share = (time.perf_counter() - start) / len(batch)
+        for (read_seconds, b), d in zip(batch, derived):
+            yield read_seconds, b, d, share
+
+
+@main.command("build-stream")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option("--out-dir", "-d", type=click.Path(file_okay=False), default=".", help="Directory for the HTML files")
+@click.option("--strict", is_flag=True, default=False, help="Validate every parsed model (slower)")
+@click.option("--vectorized", is_flag=True, default=False, help=VECTORIZED_HELP)
+@render_options
+@instrument_options
+def build_stream(source: str, out_dir: str, strict: bool, vectorized: bool, timings: str | None, **opts) -> None:
+    """Build one-pagers from a multi-character archive as it is read.
+
+    SOURCE is a JSON array of exports, NDJSON (one export per line) or a single
+    export; use - to read from stdin. Each sheet is written as soon as its
+    character has been parsed, named after the character. With --vectorized,
+    characters are parsed in batches, so sheets are written a batch at a time.
+    """
+    from .manifest import stream_if_changed
+    from .parse import parse_build
+    from .profile import classify
+    from .render import default_engine
+    from .stream import RecordError, StreamError, iter_builds, slugify
+    from .timings import StageTimer, summarize, timed_iter, write_report
+
+    if vectorized:
+        _require_numpy()
+    options = _build_options(opts)
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    engine = default_engine()
+    used: set[str] = set()
+    built = failed = 0
+    runs = []
+
+    def report(error: RecordError) -> None:
+        nonlocal failed
+        failed += 1
+        click.echo(f"Failed: {error}", err=True)
+
+    def unique_out(character_name: str) -> Path:
+        stem = slugify(character_name)
+        name, n = stem, 1
+        while name in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name)
+        return out_path / f"{name}_onepager.html"
+
+    start = time.perf_counter()
+    with click.open_file(source, "r", encoding="utf-8") as fp:
+        try:
+            records = _with_derived(timed_iter(iter_builds(fp, on_error=report)), vectorized)
+            for index, (read_seconds, b, derived, derive_seconds) in enumerate(records, start=1):
+                timer = StageTimer()
+                timer.record("load_json", read_seconds)
+                if vectorized:
+                    timer.record("derive", derive_seconds)
+                try:
+                    char = parse_build(b, strict=strict, derived=derived, timer=timer)
+                    with timer.stage("classify"):
+                        profile = classify(char, override=options.profile_override)
+                    out = unique_out(char.identity.name)
+                    chunks = engine.generate(char, profile, timer=timer, **options.render_kwargs())
+                    timer.stream(functools.partial(stream_if_changed, out), chunks)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    report(RecordError(index, f"{type(e).__name__}: {e}"))
+                    continue
+                built += 1
+                runs.append(timer.stages)
+                click.echo(f"Written: {out} ({profile.profile_type})")
+        except StreamError as e:
+            click.echo(f"Error reading {source}: {e}", err=True)
+            failed += 1
+
+    elapsed = time.perf_counter() - start
+    rate = built / elapsed if elapsed > 0 else 0.0
+    click.echo(f"Built {built} sheets in {elapsed:.2f}s ({rate:.1f} files/sec, {failed} failed)")
+    if options.minify and built:
+        from .minify import saved_summary
+
+        click.echo(f"Minified: {saved_summary(*engine.minified_bytes())}")
+    if timings:
+        write_report(summarize(runs), timings)
+    if failed:
+        sys.exit(1)
+
+
+def _read_sheets(sources: list[Path], strict: bool, profile_override: str) -> tuple[list, int]:
+    """Parse and classify every character in ``sources`` (exports or archives).
+
+    Failures are reported as they happen. Returns the ``(char, profile)``
+    pairs and how many records failed; exits if none could be read.
+    """
+    from .parse import parse_build
+    from .profile import classify
+    from .stream import RecordError, StreamError, iter_builds
+
+    sheets = []
+    failed = 0
+    for source in sources:
+        def report(error: RecordError, source: Path = source) -> None:
+            nonlocal failed
+            failed += 1
+            click.echo(f"Failed: {source}: {error}", err=True)
+
+        with open(source, encoding="utf-8") as fp:
+            try:
+                for index, b in enumerate(iter_builds(fp, on_error=report), start=1):
+                    try:
+                        char = parse_build(b, strict=strict)
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:
+                        report(RecordError(index, f"{type(e).__name__}: {e}"))
+                        continue
+                    sheets.append((char, classify(char, override=profile_override)))
+            except StreamError as e:
+                failed += 1
+                click.echo(f"Failed: {source}: {e}", err=True)
+
+    if not sheets:
+        click.echo("No characters could be read.", err=True)
+        sys.exit(1)
+    return sheets, failed
+
+
+@main.command()
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("--out", "-o", default="roster.html", show_default=True, help="Output HTML file path (- for stdout)")
+@click.option("--eager", is_flag=True, default=False, help="Put every sheet in the DOM up front (no script needed)")
+@click.option("--strict", is_flag=True, default=False, help="Validate every parsed model (slower)")
+@render_options
+def roster(inputs: tuple[str, ...], out: str, eager: bool, strict: bool, **opts) -> None:
+    """Build one HTML document holding every character's one-pager.
+
+    INPUTS are exports, archives (JSON arrays or NDJSON), directories or glob
+    patterns. The stylesheet and fonts are included once. Each character gets
+    its own print page, and an index at the top links to every sheet. Sheets
+    further down are only attached to the page when scrolled near or printed.
+    """
+    import io
+
+    from .batch import collect_inputs
+    from .manifest import stream_if_changed
+    from .render import default_engine
+
+    sources = collect_inputs(inputs)
+    if not sources:
+        click.echo("No JSON files matched.", err=True)
+        sys.exit(1)
+
+    options = _build_options(opts)
+    sheets, failed = _read_sheets(sources, strict, options.profile_override)
+
+    engine = default_engine()
+    chunks = engine.generate_roster(sheets, lazy=not eager, **options.render_kwargs())
+    to_stdout = out == "-"
+    if to_stdout:
+        stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+        stdout.writelines(chunks)
+        stdout.flush()
+        stdout.detach()
+        status = "Written: stdout"
+    else:
+        written = stream_if_changed(Path(out), chunks)
+        status = f"{'Written' if written else 'Unchanged'}: {out}"
+    click.echo(f"{status} ({len(sheets)} sheets, {failed} failed)", err=to_stdout)
+    if options.minify:
+        from .minify import saved_summary
+
+        click.echo(f"Minified: {saved_summary(*engine.minified_bytes())}", err=to_stdout)
+    if failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("--out-dir", "-d", type=click.Path(file_okay=False), default="site", show_default=True,
+              help="Directory to export the site into")
+@click.option("--title", default="Characters", show_default=True, help="Title of the index page")
+@click.option("--strict", is_flag=True, default=False, help="Validate every parsed model (slower)")
+@render_options
+def export(inputs: tuple[str, ...], out_dir: str, title: str, strict: bool, **opts) -> None:
+    """Export sheets as a static site with an index page.
+
+    INPUTS are as for roster. Each sheet is written under a content-hashed
+    name in sheets/, with .gz (and .br, if brotli is installed) variants
+    beside it. index.html lists every character by name, class and level, and
+    site-manifest.json records each file's hash and Cache-Control header.
+    Files whose content is unchanged are not rewritten, and files only the
+    previous export listed are removed.
+    """
+    from .batch import collect_inputs
+    from .export import export_site
+
+    sources = collect_inputs(inputs)
+    if not sources:
+        click.echo("No JSON files matched.", err=True)
+        sys.exit(1)
+
+    options = _build_options(opts)
+    sheets, failed = _read_sheets(sources, strict, options.profile_override)
+    start = time.perf_counter()
+    result = export_site(sheets, Path(out_dir), options, title=title)
+    elapsed = time.perf_counter() - start
+    click.echo(f"Exported {result.summary()} in {elapsed:.2f}s")
+    click.echo(f"Index: {Path(out_dir) / 'index.html'}")
+    if failed:
+        click.echo(f"{failed} failed", err=True)
+        sys.exit(1)
+
+
+@main.command("index")
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("--store", "-s", "store_path", type=click.Path(file_okay=False), default="roster.store",
+              show_default=True, help="Store directory (created if missing)")
+@click.option("--strict", is_flag=True, default=False, help="Validate every parsed model (slower)")
+@click.option("--vectorized", is_flag=True, default=False, help=VECTORIZED_HELP)
+def index(inputs: tuple[str, ...], store_path: str, strict: bool, vectorized: bool) -> None:
+    """Add exports to a columnar store for the query command.
+
+    INPUTS are files, directories or glob patterns; a file may also be an
+    archive of exports. Files already indexed with the same content are
+    skipped, and a changed file's new rows replace its old ones.
+    """
+    from .batch import collect_inputs
+    from .store import FAILED, INDEXED, RosterStore, StoreError, index_files
+
+    if vectorized:
+        _require_numpy()
+
+    sources = collect_inputs(inputs)
+    if not sources:
+        click.echo("No JSON files matched.", err=True)
+        sys.exit(1)
+    try:
+        store = RosterStore(store_path)
+    except StoreError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    counts = {INDEXED: 0, FAILED: 0}
+    added = 0
+    start = time.perf_counter()
+    for result in index_files(store, sources, strict=strict, vectorized=vectorized):
+        if result.status == FAILED:
+            click.echo(f"Failed: {result.source}: {result.error}", err=True)
+        elif result.status == INDEXED:
+            added += result.rows
+        counts[result.status] = counts.get(result.status, 0) + 1
+    elapsed = time.perf_counter() - start
+    click.echo(
+        f"Indexed {added} characters from {counts[INDEXED]} files in {elapsed:.2f}s "
+        f"({len(sources) - counts[INDEXED] - counts[FAILED]} unchanged, {counts[FAILED]} failed); "
+        f"{sum(store.live())} characters in {store_path}"
+    )
+    if counts[FAILED]:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("store_path", metavar="STORE", type=click.Path(exists=True, file_okay=False))
+@click.option("--where", "-w", "filters", multiple=True, metavar="EXPR",
+              help="Filter such as level=5, ac>=22 or class=Wizard (repeatable; all must match)")
+@click.option("--group-by", "-g", default=None, metavar="COLUMN", help="Aggregate per value of COLUMN")
+@click.option("--agg", "-a", "aggregates", multiple=True, metavar="FUNC[:COLUMN]",
+              help="count, or min/max/sum/mean/median of a column, e.g. median:will (repeatable)")
+@click.option("--show", default="name,class,level,source", show_default=True,
+              help="Columns to list when not aggregating")
+@click.option("--limit", type=click.IntRange(min=0), default=50, show_default=True,
+              help="Rows to list when not aggregating (0 for all)")
+@click.option("--json", "as_json", is_flag=True, default=False, help="Print results as JSON")
+def query(
+    store_path: str,
+    filters: tuple[str, ...],
+    group_by: str | None,
+    aggregates: tuple[str, ...],
+    show: str,
+    limit: int,
+    as_json: bool,
+) -> None:
+    """Filter and aggregate characters in a store made by index.
+
+    Without --agg or --group-by, matching characters are listed. Columns:
+    source, record, name, class, ancestry, heritage, background, level, the
+    six ability scores (str, dex, ...), ac, hp, fortitude, reflex, will,
+    perception, each skill's modifier (acrobatics, ...), spell_dc and
+    spell_attack.
+    """
+    import json
+
+    from .store import COLUMNS, Aggregate, Filter, RosterStore, StoreError, aggregate, select
+
+    try:
+        store = RosterStore(store_path)
+        rows = select(store, [Filter.parse(f) for f in filters])
+        if aggregates or group_by:
+            if group_by is not None and group_by not in COLUMNS:
+                raise StoreError(f"unknown column {group_by!r}")
+            results = aggregate(store, rows, [Aggregate.parse(a) for a in aggregates or ("count",)], group_by)
+        else:
+            columns = [c.strip() for c in show.split(",") if c.strip()]
+            listed = rows[:limit] if limit else rows
+            values = [store.values(column, listed) for column in columns]
+            results = [dict(zip(columns, row)) for row in zip(*values)]
+    except StoreError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+    _echo_table(results)
+    if not (aggregates or group_by):
+        click.echo(f"{len(rows)} matching" + (f", first {limit} shown" if limit and len(rows) > limit else ""))
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "-"
+    return f"{round(value, 2):g}" if isinstance(value, float) else str(value)
+
+
+def _echo_table(results: list[dict]) -> None:
+    """Print result rows as aligned columns ("-" where a value is missing)."""
+    if not results:
+        return
+    header = list(results[0])
+    cells = [[_cell(r[c]) for c in header] for r in results]
+    widths = [max(len(str(h)), *(len(row[i]) for row in cells)) for i, h in enumerate(header)]
+    click.echo("  ".join(str(h).ljust(w) for h, w in zip(header, widths)).rstrip())
+    for row in cells:
+        click.echo("  ".join(v.ljust(w) for v, w in zip(row, widths)).rstrip())
+
+
+@main.group()
+def spells() -> None:
+    """Spell description database."""
+    pass
+
+
+@spells.command("compile")
+@click.argument("source", required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+              help="Index file to write (default: the packaged spells.idx)")
+def spells_compile(source: str | None, output: str | None) -> None:
+    """Compile a spell list (TSV or JSON) into the lookup index.
+
+    SOURCE defaults to the packaged data/spells.tsv.
+    """
+    from .spells import SPELL_INDEX, SPELL_SOURCE, compile_file
+
+    source_path = Path(source) if source else SPELL_SOURCE
+    out = Path(output) if output else SPELL_INDEX
+    try:
+        count = compile_file(source_path, out)
+    except (ValueError, KeyError) as e:
+        click.echo(f"Error compiling {source_path}: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Compiled {count} spells: {out}")
+
+
+@spells.command("lookup")
+@click.argument("names", nargs=-1, required=True)
+@click.option("--index", "index_path", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Index file to query (default: the packaged spells.idx)")
+def spells_lookup(names: tuple[str, ...], index_path: str | None) -> None:
+    """Print the description of each spell NAME.
+
+    Names are resolved the same way as on a sheet: normalized, then through the
+    legacy/remaster alias table, then by fuzzy match.
+    """
+    from .spells import SpellDB, SpellResolver, default_resolver, read_aliases
+
+    resolver = SpellResolver(SpellDB.open(Path(index_path)), read_aliases()) if index_path else default_resolver()
+    missing = 0
+    for name in names:
+        resolved = resolver.resolve(name)
+        if resolved is None:
+            click.echo(f"{name}: (no description)")
+            missing += 1
+            continue
+        label = name if resolved == name else f"{name} → {resolved}"
+        click.echo(f"{label}: {resolver.get(name)}")
+    if missing:
+        sys.exit(1)
+
+
+@main.group()
+def templates() -> None:
+    """Ahead-of-time compiled Jinja2 templates."""
+    pass
+
+
+@templates.command("compile")
+@click.option("--check/--no-check", default=True, help="Verify compiled output matches source-compiled output")
+@click.option("--count", type=click.IntRange(min=1), default=30, show_default=True,
+              help="Synthetic builds to render for the check")
+def templates_compile(check: bool, count: int) -> None:
+    """Precompile the packaged templates and stylesheet bundles.
+
+    Package builds do this automatically; run it in a source checkout after
+    editing templates or stylesheets to get the faster startup.
+    """
+    from .css import COMPILED_BUNDLES, compile_bundles
+    from .precompile import COMPILED_DIR, compile_templates
+    from .render import ASSETS_DIR
+
+    click.echo(f"Compiled {compile_templates()} templates: {COMPILED_DIR}")
+    click.echo(f"Compiled {compile_bundles(ASSETS_DIR)} stylesheets: {ASSETS_DIR / COMPILED_BUNDLES}")
+    if check:
+        _check_templates(count)
+
+
+@templates.command("check")
+@click.option("--count", type=click.IntRange(min=1), default=30, show_default=True,
+              help="Synthetic builds to render")
+def templates_check(count: int) -> None:
+    """Fail unless precompiled and source templates render identical output."""
+    _check_templates(count)
+
+
+def _check_templates(count: int) -> None:
+    from . import bench as _bench
+    from .corpus import generate_corpus
+    from .parse import unwrap_build
+
+    try:
+        compared, mismatches = _bench.compare_templates([unwrap_build(b) for b in generate_corpus(count)])
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    if mismatches:
+        click.echo(f"{len(mismatches)} of {compared} documents differ:", err=True)
+        for label in mismatches[:10]:
+            click.echo(f"  {label}", err=True)
+        sys.exit(1)
+    click.echo(f"Identical: {compared} documents")
+
+
+@main.group()
+def cache() -> None:
+    """On-disk cache of parsed characters.
+
+    build-all uses it unless given --no-cache; build only with --cache. The
+    directory is $P2E_ONEPAGER_CACHE_DIR, else $XDG_CACHE_HOME or
+    ~/.cache under p2e-character-one-pager/parse. Its size limit is
+    $P2E_ONEPAGER_CACHE_MAX_MB (default 64).
+    """
+    pass
+
+
+@cache.command("stats")
+def cache_stats() -> None:
+    """Show where the parse cache is and how much it holds."""
+    from .cache import ParseCache
+
+    parse_cache = ParseCache()
+    stats = parse_cache.stats()
+    click.echo(f"Directory: {stats.directory}")
+    if parse_cache.problem:
+        click.echo(f"Unsafe:    {parse_cache.problem}; the cache is not used")
+    click.echo(f"Entries:   {stats.entries}")
+    click.echo(f"Size:      {stats.bytes / 1024:.1f} KiB of {stats.max_bytes / 1024 / 1024:g} MiB")
+
+
+@cache.command("clear")
+def cache_clear() -> None:
+    """Remove every entry from the parse cache."""
+    from .cache import ParseCache
+
+    parse_cache = ParseCache()
+    click.echo(f"Removed {parse_cache.clear()} entries from {parse_cache.directory}")
+
+
+@main.group()
+def bench() -> None:
+    """Performance benchmarks."""
+    pass
+
+
+def _bench_builds(inputs: tuple[str, ...], count: int | None = None, seed: int = 0) -> list[dict]:
+    """Builds from the JSON files matching INPUTS, or ``count`` synthetic ones if none are given.
+
+    Files that fail to load are skipped with a message; exits if nothing loads.
+    """
+    from .batch import collect_inputs
+    from .parse import load_json
+
+    if inputs or count is None:
+        builds = []
+        for source in collect_inputs(inputs):
+            try:
+                builds.append(load_json(source))
+            except (ValueError, KeyError) as e:
+                click.echo(f"Skipping {source}: {e}", err=True)
+    else:
+        from .corpus import generate_corpus
+        from .parse import unwrap_build
+
+        builds = [unwrap_build(b) for b in generate_corpus(count, seed=seed)]
+    if not builds:
+        click.echo("No loadable JSON files matched.", err=True)
+        sys.exit(1)
+    return builds
+
+
+@bench.command("parse-modes")
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True, help="Timing rounds (best is kept)")
+def bench_parse_modes(inputs: tuple[str, ...], repeat: int) -> None:
+    """Compare trusted (default) and strict parsing on real exports."""
+    from .bench import compare_parse_modes
+
+    builds = _bench_builds(inputs)
+
+    results = compare_parse_modes(builds, repeat=repeat)
+    baseline = results["strict"]
+    click.echo(f"{len(builds)} character(s), best of {repeat}")
+    for mode, seconds in results.items():
+        click.echo(f"  {mode:<8} {seconds * 1e6:9.1f} µs/character  {baseline / seconds:5.2f}x")
+
+
+@bench.command("vectorized")
+@click.argument("inputs", nargs=-1)
+@click.option("--count", type=click.IntRange(min=1), default=2000, show_default=True,
+              help="Synthetic builds to generate when no INPUTS are given")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True, help="Timing rounds (best is kept)")
+def bench_vectorized(inputs: tuple[str, ...], count: int, seed: int, repeat: int) -> None:
+    """Cross-check and time NumPy batch parsing against the scalar path.
+
+    Exits non-zero if any character's model differs between the two, or if
+    NumPy is not installed.
+    """
+    from .bench import compare_vectorized
+
+    _require_numpy()
+    builds = _bench_builds(inputs, count, seed)
+
+    results, mismatches = compare_vectorized(builds, repeat=repeat)
+    baseline = results["scalar"]
+    click.echo(f"{len(builds)} character(s), best of {repeat}")
+    for mode in ("scalar", "vectorized"):
+        click.echo(f"  {mode:<10} {results[mode] * 1e6:9.1f} µs/character  {baseline / results[mode]:5.2f}x")
+    click.echo(f"  {'derive':<10} {results['derive'] * 1e6:9.1f} µs/character  (NumPy pass alone)")
+    click.echo(f"Identical: {len(builds) - len(mismatches)}/{len(builds)}")
+    for i in mismatches[:10]:
+        click.echo(f"  differs: #{i} {builds[i].get('name', 'Unknown')}", err=True)
+    if mismatches:
+        sys.exit(1)
+
+
+@bench.command("corpus")
+@click.argument("out_dir", type=click.Path(file_okay=False))
+@click.option("--count", type=click.IntRange(min=1), default=60, show_default=True, help="Number of builds")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--extreme-every", type=click.IntRange(min=0), default=25, show_default=True,
+              help="Make every Nth build an extreme one (0 = never)")
+def bench_corpus(out_dir: str, count: int, seed: int, extreme_every: int) -> None:
+    """Write a synthetic Pathbuilder corpus (levels 1-20, martial to caster)."""
+    from .corpus import write_corpus
+
+    paths = write_corpus(Path(out_dir), count, seed=seed, extreme_every=extreme_every)
+    click.echo(f"Wrote {len(paths)} builds to {out_dir}")
+
+
+@bench.command("pipeline")
+@click.argument("inputs", nargs=-1)
+@click.option("--count", type=click.IntRange(min=1), default=60, show_default=True,
+              help="Synthetic builds to generate when no INPUTS are given")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--latency-ms", type=click.FloatRange(min=0), default=20.0, show_default=True,
+              help="Delay injected into every read and write")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=1, show_default=True, help="Render workers")
+@click.option("--io-concurrency", type=click.IntRange(min=1), default=8, show_default=True,
+              help="Concurrent reads/writes in the pipeline")
+def bench_pipeline(
+    inputs: tuple[str, ...], count: int, seed: int, latency_ms: float, jobs: int, io_concurrency: int
+) -> None:
+    """Compare one-file-at-a-time builds with the asyncio pipeline on a slow disk.
+
+    Every read and write is delayed by --latency-ms, simulating a network
+    mount. Exits non-zero if any output differs between the two.
+    """
+    import tempfile
+
+    from . import bench as _bench
+    from .batch import collect_inputs
+    from .corpus import write_corpus
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = collect_inputs(inputs) if inputs else write_corpus(Path(tmp) / "corpus", count, seed=seed)
+        if not sources:
+            click.echo("No JSON files matched.", err=True)
+            sys.exit(1)
+        rates, stats, mismatches = _bench.compare_pipeline(
+            sources, Path(tmp) / "out", latency_ms / 1000, jobs=jobs, io_concurrency=io_concurrency
+        )
+
+    click.echo(f"sequential  {rates['sequential']:8.1f} files/sec")
+    click.echo(f"pipeline    {rates['pipeline']:8.1f} files/sec  ({rates['pipeline'] / rates['sequential']:.1f}x)")
+    click.echo(f"Pipeline: {stats.summary()}")
+    if mismatches:
+        click.echo(f"{len(mismatches)} outputs differ or failed: {', '.join(mismatches[:10])}", err=True)
+        sys.exit(1)
+
+
+@bench.command("fragments")
+@click.argument("inputs", nargs=-1)
+@click.option("--count", type=click.IntRange(min=1), default=60, show_default=True,
+              help="Synthetic builds to generate when no INPUTS are given")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True, help="Timing rounds (best is kept)")
+def bench_fragments(inputs: tuple[str, ...], count: int, seed: int, repeat: int) -> None:
+    """Time the fragment caches on distinct characters and after a level-up.
+
+    The line cache shares spell, weapon and item lines between characters;
+    the section cache reuses whole sections. Exits non-zero if any sheet
+    rendered through the caches differs from one rendered without them.
+    """
+    from .bench import compare_fragments
+
+    builds = _bench_builds(inputs, count, seed)
+
+    results, stats, mismatches = compare_fragments(builds, repeat=repeat)
+    baseline = results["uncached"]
+    click.echo(f"{len(builds)} character(s), best of {repeat}")
+    modes = (
+        ("uncached", "no caches"),
+        ("lines", "line cache"),
+        ("cold", "both caches"),
+        ("level_up", "after level-up"),
+    )
+    for mode, label in modes:
+        click.echo(
+            f"  {label:<15} {results[mode] * 1e6:9.1f} µs/character  {1 / results[mode]:8.0f} sheets/sec"
+            f"  {baseline / results[mode]:5.2f}x"
+        )
+    click.echo(f"Lines, one batch: {stats['lines'].summary()}")
+    click.echo(f"Sections, level-up: {stats['sections'].summary()}")
+    if mismatches:
+        click.echo(f"{len(mismatches)} sheets differ: {', '.join(mismatches[:10])}", err=True)
+        sys.exit(1)
+
+
+@bench.command("minify")
+@click.argument("inputs", nargs=-1)
+@click.option("--count", type=click.IntRange(min=1), default=60, show_default=True,
+              help="Synthetic builds to generate when no INPUTS are given")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True, help="Timing rounds (best is kept)")
+def bench_minify(inputs: tuple[str, ...], count: int, seed: int, repeat: int) -> None:
+    """Report the bytes --minify saves per profile type, and what it costs.
+
+    Exits non-zero if any minified sheet, or the minified roster, lays out
+    different text or elements than the plain one.
+    """
+    from .bench import compare_minify
+    from .minify import saved_summary
+
+    builds = _bench_builds(inputs, count, seed)
+
+    results, sizes, mismatches = compare_minify(builds, repeat=repeat)
+    click.echo(f"{len(builds)} character(s), best of {repeat}")
+    for name, (sheets, before, after) in sizes.items():
+        click.echo(f"  {name:<8} {sheets:4d}  {saved_summary(before, after)}")
+    total_before = sum(before for name, (_n, before, _after) in sizes.items() if name != "roster")
+    total_after = sum(after for name, (_n, _before, after) in sizes.items() if name != "roster")
+    click.echo(f"Sheets: {saved_summary(total_before, total_after)}")
+    click.echo(
+        f"Render: {results['plain'] * 1e6:.1f} µs/character plain, {results['minify'] * 1e6:.1f} minified "
+        f"(+{(results['minify'] - results['plain']) * 1e6:.1f})"
+    )
+    if mismatches:
+        click.echo(f"{len(mismatches)} documents lay out differently: {', '.join(mismatches[:10])}", err=True)
+        sys.exit(1)
+
+
+@bench.command("run")
+@click.argument("inputs", nargs=-1)
+@click.option("--count", type=click.IntRange(min=1), default=60, show_default=True,
+              help="Synthetic builds to generate when no INPUTS are given")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True, help="Timing rounds (best is kept)")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None, help="Workers for the batch run (default: CPU count)")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Previous results to compare against")
+@click.option("--threshold", type=float, default=None,
+              help="Allowed slowdown vs baseline, as a fraction (default 0.25)")
+@click.option("--budget-ms", type=float, default=None,
+              help="Fail if a cold single-file CLI build exceeds this (default 200)")
+@click.option("--save", "save_path", type=click.Path(dir_okay=False), default=None, help="Write results as JSON")
+def bench_run(
+    inputs: tuple[str, ...],
+    count: int,
+    seed: int,
+    repeat: int,
+    jobs: int | None,
+    baseline: str | None,
+    threshold: float | None,
+    budget_ms: float | None,
+    save_path: str | None,
+) -> None:
+    """Time every pipeline stage, cold and warm, single-file and batch.
+
+    Exits non-zero if any metric regressed more than --threshold against
+    --baseline, or the cold single-file build exceeds --budget-ms.
+    """
+    import tempfile
+
+    from . import bench as _bench
+    from .batch import collect_inputs
+    from .corpus import write_corpus
+
+    threshold = _bench.DEFAULT_THRESHOLD if threshold is None else threshold
+    budget_ms = _bench.DEFAULT_BUDGET_MS if budget_ms is None else budget_ms
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if inputs:
+            sources = collect_inputs(inputs)
+            corpus_label = f"{len(sources)} files"
+        else:
+            sources = write_corpus(Path(tmp), count, seed=seed)
+            corpus_label = f"{count} synthetic builds (seed {seed})"
+        if not sources:
+            click.echo("No JSON files matched.", err=True)
+            sys.exit(1)
+        click.echo(f"Benchmarking {corpus_label}...", err=True)
+        metrics = _bench.run_suite(sources, repeat=repeat, jobs=jobs)
+
+    width = max(len(name) for name in metrics)
+    for name, value in metrics.items():
+        click.echo(f"{name:<{width}}  {value:10.3f} ms")
+
+    if save_path:
+        _bench.save_results(Path(save_path), metrics, corpus=corpus_label, repeat=repeat)
+        click.echo(f"Saved: {save_path}")
+
+    failures = []
+    cold = metrics["single.cold.cli_build"]
+    if cold > budget_ms:
+        failures.append(f"single.cold.cli_build: {cold:.1f} ms exceeds budget of {budget_ms:.0f} ms")
+    if baseline:
+        failures.extend(_bench.find_regressions(metrics, _bench.load_baseline(Path(baseline)), threshold))
+    if failures:
+        click.echo("Performance check failed:", err=True)
+        for failure in failures:
+            click.echo(f"  {failure}", err=True)
+        sys.exit(1)
+
+
+@bench.command("startup")
+@click.argument("source", required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True, help="Timing rounds (best is kept)")
+@click.option("--help-budget-ms", type=float, default=None, help="Wall-clock budget for --help (default 150)")
+@click.option("--build-budget-ms", type=float, default=None, help="Wall-clock budget for a minimal build (default 600)")
+def bench_startup(source: str | None, repeat: int, help_budget_ms: float | None, build_budget_ms: float | None) -> None:
+    """Measure CLI cold start: -X importtime totals and wall clock.
+
+    Covers --help and a minimal build of SOURCE (a synthetic sheet by default).
+    Exits non-zero if a budget is exceeded or --help imports pydantic, jinja2
+    or the renderer.
+    """
+    import json
+    import random
+    import tempfile
+
+    from . import bench as _bench
+    from .corpus import generate_build
+
+    budgets = dict(_bench.STARTUP_BUDGETS_MS)
+    if help_budget_ms is not None:
+        budgets["help.wall"] = help_budget_ms
+    if build_budget_ms is not None:
+        budgets["build.wall"] = build_budget_ms
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if source:
+            path = Path(source)
+        else:
+            path = Path(tmp) / "typical.json"
+            path.write_text(json.dumps(generate_build(random.Random(0), 5, "hybrid")), encoding="utf-8")
+        metrics, help_modules = _bench.measure_startup(path, repeat=repeat)
+
+    for name, value in metrics.items():
+        click.echo(f"{name:<14}  {value:8.1f} ms  (budget {budgets[name]:.0f} ms)")
+
+    violations = _bench.check_startup(metrics, help_modules, budgets)
+    if violations:
+        click.echo("Startup check failed:", err=True)
+        for violation in violations:
+            click.echo(f"  {violation}", err=True)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
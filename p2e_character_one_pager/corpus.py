@@ -0,0 +1,155 @@
+"""Synthetic Pathbuilder 2e builds for benchmarking.
+
+The generator produces exports shaped like real Pathbuilder JSON across levels
+1–20 and the martial → full-caster range, plus deliberately extreme builds
+(hundreds of spells per rank, long equipment and feat lists) that stress the
+parser and template. Output is deterministic for a given seed.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Iterator
+
+from .parse import FEAT_TYPE_MAP, SKILL_NAMES
+from .spells import default_db
+
+ARCHETYPES = ("martial", "hybrid", "caster")
+
+_CLASSES = {
+    "martial": [("Fighter", 10), ("Barbarian", 12), ("Rogue", 8), ("Ranger", 10), ("Monk", 10)],
+    "hybrid": [("Magus", 8), ("Champion", 10), ("Summoner", 10), ("Warpriest", 8)],
+    "caster": [("Wizard", 6), ("Cleric", 8), ("Druid", 8), ("Sorcerer", 6), ("Bard", 8)],
+}
+_TRADITIONS = {"Wizard": "arcane", "Magus": "arcane", "Cleric": "divine", "Warpriest": "divine",
+               "Champion": "divine", "Druid": "primal", "Sorcerer": "arcane", "Bard": "occult",
+               "Summoner": "arcane"}
+_ANCESTRIES = [("Human", 8), ("Elf", 6), ("Dwarf", 10), ("Gnome", 8), ("Halfling", 6), ("Orc", 10)]
+_WEAPONS = [("Longsword", "d8", "S"), ("Greataxe", "d12", "S"), ("Rapier", "d6", "P"),
+            ("Longbow", "d8", "P"), ("Staff", "d4", "B"), ("Warhammer", "d8", "B")]
+_STRIKING = ["", "striking", "greaterStriking", "majorStriking"]
+_ITEMS = ["Healing Potion", "Rope", "Torch", "Rations", "Scroll of Fireball", "Wand of Heal",
+          "Bag of Holding", "Caltrops", "Alchemist's Fire", "Climbing Kit", "Bedroll"]
+_FEATS = ["Toughness", "Power Attack", "Reach Spell", "Fleet", "Incredible Initiative",
+          "Assurance", "Battle Medicine", "Cat Fall", "Quick Jump", "Shield Block"]
+_PROF_BY_LEVEL = [(1, 2), (5, 4), (13, 6), (19, 8)]
+
+
+def _prof(level: int, rng: random.Random) -> int:
+    best = max(rank for min_level, rank in _PROF_BY_LEVEL if level >= min_level)
+    return rng.choice([r for r in (0, 2, 4, 6, 8) if r <= best])
+
+
+def _spell_name(rng: random.Random, rank: int, i: int, known: list[str]) -> str:
+    if rng.random() < 0.6:
+        return rng.choice(known)
+    return f"Synthetic Spell {rank}-{i}"
+
+
+def generate_build(
+    rng: random.Random,
+    level: int,
+    archetype: str,
+    extreme: bool = False,
+) -> dict:
+    """One Pathbuilder-shaped export (wrapped in ``{"build": ...}``)."""
+    char_class, class_hp = rng.choice(_CLASSES[archetype])
+    ancestry, ancestry_hp = rng.choice(_ANCESTRIES)
+    max_rank = min(10, (level + 1) // 2)
+
+    spells_per_rank = 200 if extreme else {"martial": 0, "hybrid": 3, "caster": 6}[archetype]
+    casters = []
+    if spells_per_rank:
+        known = default_db().names()
+        spells = [
+            {"spellLevel": rank, "list": [_spell_name(rng, rank, i, known) for i in range(spells_per_rank)]}
+            for rank in range(max_rank + 1)
+        ]
+        casters.append({
+            "name": char_class,
+            "magicTradition": _TRADITIONS.get(char_class, "arcane"),
+            "spellcastingType": rng.choice(["prepared", "spontaneous"]),
+            "ability": rng.choice(["int", "wis", "cha"]),
+            "proficiency": _prof(level, rng) or 2,
+            "focusPoints": rng.randint(0, 3),
+            "innate": False,
+            "perDay": [5] + [rng.randint(1, 4) for _ in range(max_rank)] + [0] * (10 - max_rank),
+            "spells": spells,
+            "prepared": spells if rng.random() < 0.5 else [],
+        })
+
+    feat_count = 300 if extreme else level + 4
+    feat_types = list(FEAT_TYPE_MAP)
+    feats = [
+        [rng.choice(_FEATS) if i else "Toughness", None, rng.choice(feat_types), rng.randint(1, level)]
+        for i in range(feat_count)
+    ]
+    equipment_count = 500 if extreme else rng.randint(3, 15)
+    equipment = [
+        [rng.choice(_ITEMS), rng.randint(1, 5)] + (["Invested"] if rng.random() < 0.1 else [])
+        for _ in range(equipment_count)
+    ]
+    weapon_count = {"martial": 3, "hybrid": 2, "caster": 1}[archetype]
+    weapons = []
+    for _ in range(weapon_count):
+        name, die, damage_type = rng.choice(_WEAPONS)
+        weapons.append({
+            "name": name, "display": name, "die": die,
+            "str": _STRIKING[min(3, level // 6)],
+            "attack": level + rng.randint(2, 8), "damageBonus": rng.randint(0, 6),
+            "damageType": damage_type, "mat": None,
+        })
+
+    return {"build": {
+        "name": f"Synthetic {char_class} {level}",
+        "class": char_class,
+        "level": level,
+        "ancestry": ancestry,
+        "heritage": f"Synthetic {ancestry}",
+        "background": "Scholar",
+        "alignment": "N",
+        "age": str(rng.randint(16, 200)),
+        "sizeName": "Medium",
+        "languages": ["Common"] + rng.sample(["Elven", "Dwarven", "Draconic", "Orcish", "Sylvan"], 2),
+        "attributes": {"ancestryhp": ancestry_hp, "classhp": class_hp, "bonushp": 0,
+                       "bonushpPerLevel": 0, "speed": 25, "speedBonus": rng.choice([0, 0, 5, 10])},
+        "abilities": {k: rng.randint(8, 18 + level // 5) for k in ("str", "dex", "con", "int", "wis", "cha")},
+        "proficiencies": {k: _prof(level, rng) for k in SKILL_NAMES + ["fortitude", "reflex", "will", "perception"]},
+        "feats": feats,
+        "specials": ["Shield Block", "Attack of Opportunity", "Weapon Specialization"][: rng.randint(0, 3)],
+        "lores": [[rng.choice(["Academia", "Farming", "Warfare"]), 2]],
+        "equipment": equipment,
+        "money": {"cp": rng.randint(0, 9), "sp": rng.randint(0, 9), "gp": rng.randint(0, 500), "pp": 0},
+        "acTotal": {"acTotal": 14 + level + rng.randint(0, 4)},
+        "weapons": weapons,
+        "spellCasters": casters,
+        "focusPoints": 1 if casters else 0,
+        "focus": {"arcane": {"int": {"focusSpells": ["Hand of the Apprentice"], "focusCantrips": []}}} if casters else {},
+        "resistances": [],
+    }}
+
+
+def generate_corpus(count: int, seed: int = 0, extreme_every: int = 25) -> Iterator[dict]:
+    """Yield ``count`` builds cycling through levels 1–20 and every archetype.
+
+    Level and archetype advance together, so any three consecutive builds
+    cover every archetype and sixty cover every level of each. Every ``extreme_every``-th build is an extreme one (0 disables them).
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        level = i % 20 + 1
+        archetype = ARCHETYPES[i % len(ARCHETYPES)]
+        extreme = bool(extreme_every) and i % extreme_every == extreme_every - 1
+        yield generate_build(rng, level, archetype, extreme=extreme)
+
+
+def write_corpus(out_dir: Path, count: int, seed: int = 0, extreme_every: int = 25) -> list[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, build in enumerate(generate_corpus(count, seed=seed, extreme_every=extreme_every)):
+        path = out_dir / f"synthetic_{i:05d}.json"
+        path.write_text(json.dumps(build), encoding="utf-8")
+        paths.append(path)
+    return paths
@@ -0,0 +1,378 @@
+"""Build one minified stylesheet per (theme, page size) combination.
+
+The stylesheets shipped in ``assets/`` are small and hand-written, so this is a
+deliberately tiny CSS reader: it understands comments, strings, plain rules,
+``@page`` and block at-rules such as ``@media`` — enough to merge, minify,
+de-duplicate and prune our own files, not to parse arbitrary CSS.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PAGE_SIZES = {"letter": "letter", "a4": "A4"}
+# Written beside the stylesheets when the package is built (see setup.py)
+COMPILED_BUNDLES = "bundles.json"
+
+# At-rules whose body holds further rules rather than declarations
+_NESTED_AT_RULES = ("@media", "@supports", "@layer", "@container")
+
+
+@dataclass
+class Rule:
+    selector: str
+    declarations: list[tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class AtBlock:
+    prelude: str
+    rules: list[Rule] = field(default_factory=list)
+
+
+def _strip_comments(text: str) -> str:
+    out: list[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c in "\"'":
+            end = i + 1
+            while end < n and text[end] != c:
+                end += 2 if text[end] == "\\" else 1
+            out.append(text[i:end + 1])
+            i = end + 1
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def _split_top(text: str, sep: str) -> list[str]:
+    """Split on ``sep`` outside strings and parentheses."""
+    parts: list[str] = []
+    depth = 0
+    quote = ""
+    current: list[str] = []
+    for c in text:
+        if quote:
+            if c == quote:
+                quote = ""
+        elif c in "\"'":
+            quote = c
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(c)
+    parts.append("".join(current))
+    return parts
+
+
+def _collapse(text: str) -> str:
+    """Collapse whitespace outside strings and tighten around commas."""
+    out: list[str] = []
+    for i, chunk in enumerate(re.split(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", text)):
+        if i % 2:
+            out.append(chunk)
+        else:
+            out.append(re.sub(r"\s*,\s*", ",", re.sub(r"\s+", " ", chunk)))
+    return "".join(out).strip()
+
+
+def _minify_selector(selector: str) -> str:
+    return re.sub(r"\s*([>+~])\s*", r"\1", _collapse(selector))
+
+
+def _parse_declarations(body: str) -> list[tuple[str, str]]:
+    decls = []
+    for chunk in _split_top(body, ";"):
+        prop, sep, value = chunk.partition(":")
+        if sep and prop.strip():
+            decls.append((prop.strip().lower(), _collapse(value)))
+    return decls
+
+
+def _parse_block(text: str, i: int) -> tuple[list[Rule | AtBlock], int]:
+    items: list[Rule | AtBlock] = []
+    n = len(text)
+    while i < n:
+        j = i
+        quote = ""
+        while j < n:
+            c = text[j]
+            if quote:
+                if c == quote:
+                    quote = ""
+            elif c in "\"'":
+                quote = c
+            elif c in "{};":
+                break
+            j += 1
+        prelude = text[i:j].strip()
+        if j >= n:
+            break
+        if text[j] == "}":
+            return items, j + 1
+        if text[j] == ";":
+            # Statement at-rules (@import, @charset) are kept verbatim
+            if prelude:
+                items.append(AtBlock(prelude=_collapse(prelude) + ";"))
+            i = j + 1
+            continue
+        if prelude.split(None, 1)[0].lower() in _NESTED_AT_RULES:
+            inner, i = _parse_block(text, j + 1)
+            items.append(AtBlock(prelude=_collapse(prelude), rules=[r for r in inner if isinstance(r, Rule)]))
+            continue
+        end = j + 1
+        quote = ""
+        while end < n and (quote or text[end] != "}"):
+            c = text[end]
+            if quote:
+                if c == quote:
+                    quote = ""
+            elif c in "\"'":
+                quote = c
+            end += 1
+        items.append(Rule(selector=_minify_selector(prelude), declarations=_parse_declarations(text[j + 1:end])))
+        i = end + 1
+    return items, i
+
+
+def parse_css(text: str) -> list[Rule | AtBlock]:
+    items, _ = _parse_block(_strip_comments(text), 0)
+    return items
+
+
+def _serialize_rule(rule: Rule) -> str:
+    body = ";".join(f"{prop}:{value}" for prop, value in rule.declarations)
+    return f"{rule.selector}{{{body}}}"
+
+
+def serialize(items: list[Rule | AtBlock]) -> str:
+    out = []
+    for item in items:
+        if isinstance(item, Rule):
+            if item.declarations:
+                out.append(_serialize_rule(item))
+        elif item.prelude.endswith(";"):
+            out.append(item.prelude)
+        else:
+            body = "".join(_serialize_rule(r) for r in item.rules if r.declarations)
+            if body:
+                out.append(f"{item.prelude}{{{body}}}")
+    return "".join(out)
+
+
+def _contexts(items: list[Rule | AtBlock]):
+    """Yield (context, rule) pairs, where context is the enclosing at-rule prelude."""
+    for item in items:
+        if isinstance(item, Rule):
+            yield "", item
+        else:
+            for rule in item.rules:
+                yield item.prelude, rule
+
+
+def _is_important(value: str) -> bool:
+    return value.replace(" ", "").lower().endswith("!important")
+
+
+def strip_overridden(items: list[Rule | AtBlock], overrides: list[Rule | AtBlock]) -> None:
+    """Drop declarations in ``items`` that a later ``overrides`` sheet replaces.
+
+    A declaration is only dropped when the override has the same selector,
+    property and enclosing at-rule, so the cascade outcome is unchanged.
+    """
+    replaced: dict[tuple[str, str], set[str]] = {}
+    for context, rule in _contexts(overrides):
+        props = replaced.setdefault((context, rule.selector), set())
+        props.update(prop for prop, value in rule.declarations if not _is_important(value))
+    if not replaced:
+        return
+    for context, rule in _contexts(items):
+        props = replaced.get((context, rule.selector))
+        if props:
+            rule.declarations = [
+                (prop, value) for prop, value in rule.declarations
+                if prop not in props or _is_important(value)
+            ]
+
+
+_CLASS_NAME = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+
+
+def _outside_arguments(selector: str) -> str:
+    """``selector`` without attribute selectors and functional pseudo-class arguments."""
+    out: list[str] = []
+    depth = 0
+    for c in selector:
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif depth == 0:
+            out.append(c)
+    return "".join(out)
+
+
+def selector_classes(selector: str) -> frozenset[str]:
+    """Classes some element must have for one complex selector to match.
+
+    Classes inside ``:not(...)``, ``:is(...)`` and attribute selectors are
+    ignored, so the answer errs towards keeping a selector.
+    """
+    return frozenset(_CLASS_NAME.findall(_outside_arguments(selector)))
+
+
+def stylesheet_classes(items: list[Rule | AtBlock]) -> frozenset[str]:
+    """Every class a selector in ``items`` depends on."""
+    classes: set[str] = set()
+    for _context, rule in _contexts(items):
+        for selector in _split_top(rule.selector, ","):
+            classes |= selector_classes(selector)
+    return frozenset(classes)
+
+
+def _prune_rule(rule: Rule, used: frozenset[str]) -> Rule | None:
+    selectors = _split_top(rule.selector, ",")
+    kept = [selector for selector in selectors if selector_classes(selector) <= used]
+    if not kept:
+        return None
+    if len(kept) == len(selectors):
+        return rule
+    return Rule(selector=",".join(kept), declarations=rule.declarations)
+
+
+def prune_unused(items: list[Rule | AtBlock], used: frozenset[str]) -> list[Rule | AtBlock]:
+    """``items`` without the selectors that need a class missing from ``used``.
+
+    A rule keeps the selectors in its list that can still match and is
+    dropped when none can; at-rule blocks left empty are dropped too. Rules
+    without classes (``body``, ``@page``) are always kept. ``items`` is not
+    modified.
+    """
+    pruned: list[Rule | AtBlock] = []
+    for item in items:
+        if isinstance(item, Rule):
+            rule = _prune_rule(item, used)
+            if rule is not None:
+                pruned.append(rule)
+        elif item.prelude.endswith(";"):
+            pruned.append(item)
+        else:
+            rules = [rule for rule in (_prune_rule(r, used) for r in item.rules) if rule is not None]
+            if rules:
+                pruned.append(AtBlock(prelude=item.prelude, rules=rules))
+    return pruned
+
+
+def _set_page_size(items: list[Rule | AtBlock], size: str) -> None:
+    for _context, rule in _contexts(items):
+        if rule.selector == "@page":
+            rule.declarations = [
+                (prop, size if prop == "size" else value) for prop, value in rule.declarations
+            ]
+
+
+def build_bundle(base_css: str, print_css: str, theme_css: str, page_size: str = "letter") -> str:
+    """Concatenate, de-duplicate and minify one theme/page-size stylesheet."""
+    sheet = parse_css(base_css) + parse_css(print_css)
+    theme = parse_css(theme_css)
+    _set_page_size(sheet, PAGE_SIZES.get(page_size, "letter"))
+    strip_overridden(sheet, theme)
+    return serialize(sheet + theme)
+
+
+_bundle_cache: dict[str, str] = {}
+
+
+def _content_key(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cached_bundle(base_css: str, print_css: str, theme_css: str, page_size: str = "letter") -> str:
+    """``build_bundle`` memoized on the content hash of its inputs."""
+    key = _content_key(base_css, print_css, theme_css, page_size)
+    bundle = _bundle_cache.get(key)
+    if bundle is None:
+        bundle = _bundle_cache.setdefault(key, build_bundle(base_css, print_css, theme_css, page_size))
+    return bundle
+
+
+def _read(path: Path) -> str:
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    return ""
+
+
+def _bundle_sources(assets_dir: Path) -> tuple[str, str, dict[str, str]]:
+    themes = {path.stem: _read(path) for path in sorted((assets_dir / "themes").glob("*.css"))}
+    return _read(assets_dir / "base.css"), _read(assets_dir / "print.css"), themes
+
+
+def _bundles_key(base_css: str, print_css: str, themes: dict[str, str]) -> str:
+    """Hash of the stylesheets and of this module, which decides what they bundle to."""
+    return _content_key(
+        Path(__file__).read_text(encoding="utf-8"),
+        base_css,
+        print_css,
+        *(f"{theme}\0{css}" for theme, css in themes.items()),
+    )
+
+
+def compile_bundles(assets_dir: Path, target: Path | None = None) -> int:
+    """Write every bundle for ``assets_dir`` to ``target`` for ``build_bundles`` to load.
+
+    ``target`` defaults to ``assets_dir/bundles.json``. Returns the number of bundles.
+    """
+    base_css, print_css, themes = _bundle_sources(assets_dir)
+    bundles = {
+        f"{theme}/{page_size}": build_bundle(base_css, print_css, theme_css, page_size)
+        for theme, theme_css in themes.items()
+        for page_size in PAGE_SIZES
+    }
+    payload = {"key": _bundles_key(base_css, print_css, themes), "bundles": bundles}
+    (target or assets_dir / COMPILED_BUNDLES).write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    return len(bundles)
+
+
+def _load_compiled(path: Path, key: str) -> dict[tuple[str, str], str] | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("key") != key or not isinstance(payload.get("bundles"), dict):
+        return None
+    return {tuple(name.split("/", 1)): css for name, css in payload["bundles"].items()}
+
+
+def build_bundles(assets_dir: Path) -> dict[tuple[str, str], str]:
+    """Return a bundle for every theme in ``assets_dir/themes`` and page size.
+
+    The bundles ``compile_bundles`` wrote are used while the stylesheets and
+    this module are unchanged; otherwise each bundle is built here.
+    """
+    base_css, print_css, themes = _bundle_sources(assets_dir)
+    compiled = _load_compiled(assets_dir / COMPILED_BUNDLES, _bundles_key(base_css, print_css, themes))
+    if compiled is not None:
+        return compiled
+    return {
+        (theme, page_size): cached_bundle(base_css, print_css, theme_css, page_size)
+        for theme, theme_css in themes.items()
+        for page_size in PAGE_SIZES
+    }
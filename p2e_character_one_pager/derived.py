@@ -0,0 +1,141 @@
+"""Vectorized derived stats for batch parsing (optional NumPy).
+
+``derive_stats`` gathers levels, ability scores and proficiency ranks from
+many builds into arrays and computes ability modifiers, saves, perception,
+skill and lore modifiers, spell DC/attack and HP in whole-batch passes. The
+results feed ``parse_build(derived=...)`` and are exactly what the scalar
+functions in ``parse.py`` compute: any build holding a value that is not a
+plain integer, or a caster ability the arrays cannot express, gets ``None``
+and is parsed by the scalar path instead.
+
+NumPy is an optional dependency: ``pip install 'p2e-character-one-pager[fast]'``.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Sequence
+
+from .model import Abilities
+from .parse import ABILITY_FOR_SKILL, SKILL_NAMES, DerivedStats, has_toughness
+
+ABILITY_KEYS = ("str", "dex", "con", "int", "wis", "cha")
+SAVE_KEYS = ("fortitude", "reflex", "will", "perception")
+# Ability column used by each save and skill
+_SAVE_ABILITY = [2, 1, 4, 4]
+_SKILL_ABILITY = [ABILITY_KEYS.index(ABILITY_FOR_SKILL.get(name, "dex")) for name in SKILL_NAMES]
+# Caster "ability" values and the ability column parse_spellcasters reads for them
+_CASTER_ABILITY = {key: i for i, key in enumerate(ABILITY_KEYS)} | {"str_": 0, "int_": 3}
+_CASTER_FALLBACK = 3
+# Inputs outside this range go to the scalar path, so int64 sums cannot overflow
+_INT_LIMIT = 2**31
+# Builds per pass when parsing a stream (build-stream --vectorized)
+BATCH_SIZE = 256
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "vectorized parsing needs NumPy: pip install 'p2e-character-one-pager[fast]'"
+        ) from None
+    return numpy
+
+
+def _plain_ints(values: list) -> bool:
+    # set/min/max run in C; a per-value generator costs more than the math saved
+    return set(map(type, values)) <= {int} and -_INT_LIMIT < min(values) and max(values) < _INT_LIMIT
+
+
+def _caster_ability(key: object) -> int | None:
+    if key in _CASTER_ABILITY:
+        return _CASTER_ABILITY[key]
+    if not isinstance(key, str) or key.startswith("_") or hasattr(Abilities, key):
+        return None  # getattr() would find something other than the INT fallback
+    return _CASTER_FALLBACK
+
+
+def _extract(b: dict) -> tuple | None:
+    """The integer inputs of one build, or None if it needs the scalar path."""
+    try:
+        level = b.get("level", 1)
+        ab = b.get("abilities", {})
+        scores = [ab.get(key, 10) for key in ABILITY_KEYS]
+        profs = b.get("proficiencies", {})
+        ranks = [profs.get(key, 0) for key in (*SAVE_KEYS, *SKILL_NAMES)]
+        attrs = b.get("attributes", {})
+        hp_terms = [attrs.get(key, 0) for key in ("ancestryhp", "classhp", "bonushp", "bonushpPerLevel")]
+        toughness = has_toughness(b)
+        lore_ranks = [
+            lore[1] for lore in b.get("lores", []) if isinstance(lore, (list, tuple)) and len(lore) >= 2
+        ]
+        casters = [(_caster_ability(rc.get("ability", "int")), rc.get("proficiency", 0)) for rc in b.get("spellCasters", [])]
+    except (AttributeError, TypeError, IndexError, KeyError):
+        return None  # malformed: let the scalar path raise its usual error
+    caster_abilities = [a for a, _prof in casters]
+    if None in caster_abilities:
+        return None
+    if not _plain_ints([level, *scores, *ranks, *hp_terms, *lore_ranks, *(p for _a, p in casters)]):
+        return None
+    return level, scores, ranks, hp_terms, toughness, lore_ranks, casters
+
+
+def derive_stats(builds: Sequence[dict]) -> list[DerivedStats | None]:
+    """Derived numbers for each build, computed in vectorized passes.
+
+    Entries are ``None`` for builds the scalar path must handle.
+    """
+    np = _numpy()
+    rows = [_extract(b) for b in builds]
+    ok = [i for i, row in enumerate(rows) if row is not None]
+    result: list[DerivedStats | None] = [None] * len(builds)
+    if not ok:
+        return result
+    rows = [rows[i] for i in ok]
+
+    def prof_bonus(level, rank):
+        return np.where(rank == 0, 0, level + rank)
+
+    level = np.array([r[0] for r in rows], dtype=np.int64)
+    mods = np.floor_divide(np.array([r[1] for r in rows], dtype=np.int64) - 10, 2)
+    prof = prof_bonus(level[:, None], np.array([r[2] for r in rows], dtype=np.int64))
+    saves = prof[:, :4] + mods[:, _SAVE_ABILITY]
+    skills = prof[:, 4:] + mods[:, _SKILL_ABILITY]
+
+    ancestry_hp, class_hp, bonus_hp, per_level = np.array([r[3] for r in rows], dtype=np.int64).T
+    toughness = np.array([r[4] for r in rows], dtype=bool)
+    hp = ancestry_hp + (class_hp + mods[:, 2] + per_level) * level + bonus_hp + np.where(toughness, level, 0)
+
+    # Lores and casters are ragged: flatten with an owner index, split afterwards
+    lore_owner = np.array([n for n, r in enumerate(rows) for _rank in r[5]], dtype=np.intp)
+    lore_rank = np.array([rank for r in rows for rank in r[5]], dtype=np.int64)
+    lores = prof_bonus(level[lore_owner], lore_rank) + mods[lore_owner, 3]
+
+    caster_owner = np.array([n for n, r in enumerate(rows) for _c in r[6]], dtype=np.intp)
+    caster_ability = np.array([a for r in rows for a, _p in r[6]], dtype=np.intp)
+    caster_prof = np.array([p for r in rows for _a, p in r[6]], dtype=np.int64)
+    attack = prof_bonus(level[caster_owner], caster_prof) + mods[caster_owner, caster_ability]
+    dc = attack + 10
+
+    mods_l, hp_l, saves_l, skills_l = mods.tolist(), hp.tolist(), saves.tolist(), skills.tolist()
+    lores_l = lores.tolist()
+    casters_l = list(zip(dc.tolist(), attack.tolist()))
+    lore_at = caster_at = 0
+    for n, i in enumerate(ok):
+        n_lores, n_casters = len(rows[n][5]), len(rows[n][6])
+        result[i] = DerivedStats(
+            ability_mods=mods_l[n],
+            hp=hp_l[n],
+            saves=saves_l[n],
+            skills=skills_l[n],
+            lores=lores_l[lore_at:lore_at + n_lores],
+            casters=casters_l[caster_at:caster_at + n_casters],
+        )
+        lore_at += n_lores
+        caster_at += n_casters
+    return result
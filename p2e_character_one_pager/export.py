@@ -0,0 +1,236 @@
+"""Static-site export: content-hashed sheets, precompressed, with an index page.
+
+``export_site`` writes a directory a plain static file server can host::
+
+    site/
+    ├── index.html                      # every character: name, class, level
+    ├── index.html.gz
+    ├── sheets/
+    │   ├── ezren.3f2a9c1d0b7e.html     # slug of the name + hash of the content
+    │   ├── ezren.3f2a9c1d0b7e.html.gz
+    │   └── ezren.3f2a9c1d0b7e.html.br  # only if brotli is installed
+    └── site-manifest.json
+
+A sheet's file name changes whenever its content does, so sheets can be
+cached forever; ``index.html`` keeps its name and must be revalidated. The
+manifest lists every file with its hash, size, content type, the
+``Cache-Control`` header to serve it with and its precompressed variants.
+Gzip variants are written with a zero mtime, so identical content compresses
+to identical bytes.
+
+Repeat exports leave unchanged files alone: a file whose bytes are already on
+disk is not rewritten, and its variants are not compressed again. Files that
+the previous export's manifest lists and this one does not are removed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib.util
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from .manifest import write_bytes_if_changed, write_if_changed
+from .stream import slugify
+
+if TYPE_CHECKING:
+    from .model import CharacterModel
+    from .options import BuildOptions
+    from .profile import Profile
+    from .render import OnePagerEngine
+
+SITE_MANIFEST = "site-manifest.json"
+SITE_MANIFEST_VERSION = 1
+SHEETS_DIR = "sheets"
+INDEX_NAME = "index.html"
+# Hex digits of the content hash kept in sheet file names
+HASH_LENGTH = 12
+HTML_TYPE = "text/html; charset=utf-8"
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Quality 11 is ~6x slower than 10 on a sheet for ~2.5% smaller output
+BROTLI_QUALITY = 10
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    import brotli
+
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+
+
+def brotli_available() -> bool:
+    return importlib.util.find_spec("brotli") is not None
+
+
+def encodings() -> dict[str, tuple[str, Callable[[bytes], bytes]]]:
+    """``Content-Encoding`` → (file suffix, compressor) for every variant written."""
+    available = {"gzip": (".gz", _gzip)}
+    if brotli_available():
+        available["br"] = (".br", _brotli)
+    return available
+
+
+def sheet_name(character_name: str, data: bytes) -> str:
+    """``sheets/ezren.3f2a9c1d0b7e.html``: where a sheet with these bytes is written."""
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f"{SHEETS_DIR}/{slugify(character_name)}.{digest}.html"
+
+
+@dataclass
+class ExportResult:
+    sheets: int = 0
+    written: int = 0  # files, counting each compressed variant
+    unchanged: int = 0
+    removed: int = 0
+    bytes_written: int = 0
+    encodings: list[str] = field(default_factory=list)
+    files: dict[str, dict] = field(default_factory=dict)  # the manifest's entries
+
+    def summary(self) -> str:
+        variants = ", ".join(["html", *self.encodings])
+        return (
+            f"{self.sheets} sheet{'s' if self.sheets != 1 else ''} ({variants}): "
+            f"{self.written} files written ({self.bytes_written / 1024:.0f} KiB), "
+            f"{self.unchanged} unchanged, {self.removed} removed"
+        )
+
+
+def _same_bytes(path: Path, data: bytes) -> bool:
+    try:
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def _publish(
+    out_dir: Path,
+    name: str,
+    data: bytes,
+    cache_control: str,
+    variants: dict[str, tuple[str, Callable[[bytes], bytes]]],
+    result: ExportResult,
+) -> dict:
+    """Write ``name`` and its ``variants`` if they changed; return its manifest entry.
+
+    The variants are written first, so an interrupted export leaves the old
+    file in place and the next one compresses again.
+    """
+    path = out_dir / name
+    changed = not _same_bytes(path, data)
+    entry = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "bytes": len(data),
+        "content_type": HTML_TYPE,
+        "cache_control": cache_control,
+        "encodings": {},
+    }
+    for encoding, (suffix, compress) in variants.items():
+        variant = path.with_name(path.name + suffix)
+        if changed or not variant.exists():
+            compressed = compress(data)
+            if write_bytes_if_changed(variant, compressed):
+                result.written += 1
+                result.bytes_written += len(compressed)
+            else:
+                result.unchanged += 1
+            size = len(compressed)
+        else:
+            result.unchanged += 1
+            size = variant.stat().st_size
+        entry["encodings"][encoding] = {"path": name + suffix, "bytes": size}
+    if changed:
+        write_bytes_if_changed(path, data)
+        result.written += 1
+        result.bytes_written += len(data)
+    else:
+        result.unchanged += 1
+    return entry
+
+
+def load_site_manifest(out_dir: Path) -> dict[str, dict]:
+    """The files the last export into ``out_dir`` recorded, or {}."""
+    try:
+        data = json.loads((out_dir / SITE_MANIFEST).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SITE_MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _remove_stale(out_dir: Path, previous: dict[str, dict], current: dict[str, dict]) -> int:
+    removed = 0
+    for name, entry in previous.items():
+        if name in current:
+            continue
+        variants = entry.get("encodings") if isinstance(entry, dict) else None
+        paths = [name]
+        if isinstance(variants, dict):
+            paths += [v["path"] for v in variants.values() if isinstance(v, dict) and isinstance(v.get("path"), str)]
+        for path in paths:
+            target = out_dir / path
+            # Only files inside the export directory, whatever the manifest says
+            if target.resolve().is_relative_to(out_dir.resolve()) and target.is_file():
+                target.unlink()
+                removed += 1
+    return removed
+
+
+def export_site(
+    sheets: Sequence[tuple[CharacterModel, Profile]],
+    out_dir: Path,
+    options: BuildOptions,
+    engine: OnePagerEngine | None = None,
+    title: str = "Characters",
+) -> ExportResult:
+    """Render every sheet into ``out_dir`` as a static site; see the module docstring.
+
+    The index lists characters by name, then level. Two characters whose
+    sheets render identically share one file.
+    """
+    if engine is None:
+        from .render import default_engine
+
+        engine = default_engine()
+    variants = encodings()
+    result = ExportResult(sheets=len(sheets), encodings=list(variants))
+    (out_dir / SHEETS_DIR).mkdir(parents=True, exist_ok=True)
+    previous = load_site_manifest(out_dir)
+    kwargs = options.render_kwargs()
+
+    entries = []
+    for char, profile in sheets:
+        data = engine.render(char, profile, **kwargs).encode("utf-8")
+        identity = char.identity
+        name = sheet_name(identity.name, data)
+        if name not in result.files:
+            result.files[name] = _publish(out_dir, name, data, IMMUTABLE, variants, result)
+        entries.append(
+            dict(
+                href=name,
+                name=identity.name,
+                char_class=identity.char_class,
+                level=identity.level,
+                ancestry=identity.ancestry,
+            )
+        )
+    entries.sort(key=lambda entry: (entry["name"].casefold(), entry["level"], entry["href"]))
+
+    index = engine.render_index(entries, title=title, **kwargs).encode("utf-8")
+    result.files[INDEX_NAME] = _publish(out_dir, INDEX_NAME, index, REVALIDATE, variants, result)
+
+    result.removed = _remove_stale(out_dir, previous, result.files)
+    payload = {"version": SITE_MANIFEST_VERSION, "files": dict(sorted(result.files.items()))}
+    if write_if_changed(out_dir / SITE_MANIFEST, json.dumps(payload, indent=2) + "\n"):
+        result.written += 1
+    else:
+        result.unchanged += 1
+    return result
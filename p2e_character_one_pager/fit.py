@@ -0,0 +1,567 @@
+"""Estimate a sheet's printed height and make it fit on one page, without a browser.
+
+The estimator lays text out the way the stylesheet does — font sizes, line
+heights, paddings, borders, column counts and gaps, page size and margins
+are read from the theme bundle — using per-glyph advance widths. Wrapping is
+greedy and columns are balanced, so the result is an approximation that
+errs slightly tall (see ``SAFETY``); it is meant to choose a scale or trim
+long lists, not to replace print preview.
+
+Advance widths come from Alegreya itself when fontTools and the font files
+are installed (found as for ``--font-source inline``, see ``fonts.py``).
+Otherwise a built-in table is used: Times metrics narrowed by
+``FALLBACK_WIDTH_FACTOR``, which is close to Alegreya for running text but
+not exact. ``glyph_widths().source`` says which one an estimate used.
+
+``fit_sheet`` first tries the sheet as is, then the largest CSS ``zoom``
+down to ``MIN_SCALE`` that fits, then trims spells per rank and finally
+skills until the estimate fits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from .css import AtBlock, Rule, parse_css
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .fonts import FontFace
+
+CSS_PX = {"px": 1.0, "in": 96.0, "cm": 96 / 2.54, "mm": 96 / 25.4, "pt": 96 / 72, "pc": 16.0}
+PAGE_SIZES_PX = {"letter": (8.5 * 96, 11 * 96), "a4": (210 * 96 / 25.4, 297 * 96 / 25.4)}
+
+MIN_SCALE = 0.8
+# Scales are searched and emitted in steps of 1/SCALE_STEPS
+SCALE_STEPS = 100
+MIN_SPELLS_PER_RANK = 3
+MIN_SKILLS = 4
+# Share of the printable height an estimate may use, to absorb metric error
+SAFETY = 0.97
+
+# Boxes per row in the header's ability and stat groups
+ABILITY_BOXES = 6
+# "Languages" / "Features" label of the header's inline lines, margin included
+INLINE_LABEL_WIDTH = 60.0
+# Font weight the estimator measures bold runs at (names, weapon and spell names)
+BOLD_WEIGHT = 700
+
+# Fallback advance widths (1/1000 em) for ASCII 32–126, used when Alegreya
+# cannot be read: Times metrics, narrowed by FALLBACK_WIDTH_FACTOR.
+_REGULAR = (
+    250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278, 564, 564, 564, 444,
+    921, 722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889, 722, 722,
+    556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611, 333, 278, 333, 469, 500,
+    333, 444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778, 500, 500,
+    500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,
+)
+_BOLD = (
+    250, 333, 555, 500, 500, 1000, 833, 278, 333, 333, 500, 570, 250, 333, 250, 278,
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 333, 333, 570, 570, 570, 500,
+    930, 722, 667, 722, 722, 667, 611, 778, 778, 389, 500, 778, 667, 944, 722, 778,
+    611, 778, 722, 556, 667, 722, 722, 1000, 722, 722, 667, 333, 278, 333, 581, 500,
+    333, 500, 556, 444, 556, 444, 333, 500, 556, 278, 333, 556, 278, 833, 556, 500,
+    556, 556, 444, 389, 333, 556, 500, 722, 500, 500, 444, 394, 220, 394, 520,
+)
+_EXTRA = {"—": 1000, "–": 500, "·": 250, "’": 333, "‘": 333, "×": 564, "“": 444, "”": 444}
+_DEFAULT_WIDTH = 500
+FALLBACK_WIDTH_FACTOR = 0.96
+# Characters measured from the font: printable ASCII, Latin-1 and the extras above
+MEASURED_CHARS = "".join(chr(c) for c in [*range(0x20, 0x7F), *range(0xA0, 0x100)]) + "".join(_EXTRA)
+
+
+@dataclass(frozen=True)
+class GlyphWidths:
+    """Advance widths in em for the regular and bold weights, and where they came from."""
+
+    regular: dict[str, float]
+    bold: dict[str, float]
+    default: float
+    source: str
+
+    @property
+    def stamp(self) -> str:
+        """Hash of the widths, for render fingerprints."""
+        payload = repr((sorted(self.regular.items()), sorted(self.bold.items()), self.default))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def fallback_widths() -> GlyphWidths:
+    def table(widths: tuple[int, ...]) -> dict[str, float]:
+        em = {chr(32 + i): w for i, w in enumerate(widths)} | _EXTRA
+        return {c: w * FALLBACK_WIDTH_FACTOR / 1000 for c, w in em.items()}
+
+    default = _DEFAULT_WIDTH * FALLBACK_WIDTH_FACTOR / 1000
+    return GlyphWidths(table(_REGULAR), table(_BOLD), default, "built-in table (Times metrics, narrowed)")
+
+
+def _face_widths(face: FontFace, weight: int) -> dict[str, float]:
+    """Advance widths in em of ``MEASURED_CHARS`` in ``face`` at ``weight``."""
+    from fontTools import ttLib
+
+    with ttLib.TTFont(face.path, lazy=True, fontNumber=0) as font:
+        cmap = font.getBestCmap() or {}
+        units = font["head"].unitsPerEm
+        # A variable font is measured at the weight; a static one has only its own
+        location = {"wght": weight} if "fvar" in font else None
+        glyphs = font.getGlyphSet(location=location)
+        return {c: glyphs[cmap[ord(c)]].width / units for c in MEASURED_CHARS if ord(c) in cmap}
+
+
+def font_widths(dirs: list[Path] | None = None) -> GlyphWidths | None:
+    """Widths measured from a local Alegreya, or None without fontTools or the font."""
+    from .fonts import FontError, find_faces, fonttools_available
+
+    if not fonttools_available():
+        return None
+    try:
+        faces = find_faces(dirs=dirs)
+    except FontError:
+        return None
+    measured = []
+    for weight in (400, BOLD_WEIGHT):
+        face = next((face for face in faces if face.covers(weight, "normal")), None)
+        if face is None:
+            return None
+        try:
+            measured.append(_face_widths(face, weight))
+        except Exception:  # noqa: BLE001 - a font we cannot measure falls back to the table
+            return None
+    regular, bold = measured
+    default = regular.get("n", _DEFAULT_WIDTH / 1000)
+    return GlyphWidths(regular, bold, default, f"Alegreya ({faces[0].path.parent})")
+
+
+@lru_cache(maxsize=1)
+def glyph_widths() -> GlyphWidths:
+    """The widths estimates use: measured from Alegreya if possible, else the fallback table."""
+    return font_widths() or fallback_widths()
+
+
+@lru_cache(maxsize=8192)
+def text_width(text: str, bold: bool = False) -> float:
+    """Width of ``text`` in em at a 1px font size."""
+    widths = glyph_widths()
+    table = widths.bold if bold else widths.regular
+    default = widths.default
+    return sum([table.get(c, default) for c in text])
+
+
+def wrapped_lines(runs: Iterable[tuple[str, float, bool]], width: float) -> int:
+    """Lines needed for inline ``(text, font size, bold)`` runs wrapped at ``width``."""
+    lines, x = 0, 0.0
+    for text, size, bold in runs:
+        for word in re.findall(r"\S+\s*", text):
+            advance = text_width(word, bold) * size
+            ink = text_width(word.rstrip(), bold) * size
+            if lines == 0:
+                lines = 1
+            elif x > 0 and x + ink > width:
+                lines += 1
+                x = 0.0
+            x += advance
+    return lines
+
+
+def packed_lines(widths: Iterable[float], width: float) -> int:
+    """Lines needed to pack unbreakable items of ``widths`` into rows of ``width``."""
+    lines, x = 0, 0.0
+    for w in widths:
+        if lines == 0:
+            lines = 1
+        elif x > 0 and x + w > width:
+            lines += 1
+            x = 0.0
+        x += w
+    return lines
+
+
+def column_height(heights: Sequence[float], columns: int) -> float:
+    """Height of a balanced multi-column box whose children may not break."""
+    if not heights:
+        return 0.0
+    if columns <= 1:
+        return sum(heights)
+    target = max(max(heights), sum(heights) / columns)
+    while True:
+        used, col, tallest, grow = 1, 0.0, 0.0, math.inf
+        for h in heights:
+            if col + h > target + 1e-6:
+                grow = min(grow, col + h - target)
+                used += 1
+                col = 0.0
+            col += h
+            tallest = max(tallest, col)
+        if used <= columns:
+            return tallest
+        target += grow
+
+
+def _px(value: str | None, default: float = 0.0) -> float:
+    if not value:
+        return default
+    m = re.fullmatch(r"(-?[\d.]+)([a-z]*)", value.replace("!important", "").strip())
+    if not m or (m.group(2) and m.group(2) not in CSS_PX):
+        return default
+    return float(m.group(1)) * CSS_PX.get(m.group(2) or "px", 1.0)
+
+
+class StyleMetrics:
+    """Declarations of a stylesheet, by selector, with length helpers.
+
+    Top-level rules and ``@media print`` rules are merged in order, later
+    declarations winning, which is how the print layout sees them.
+    """
+
+    def __init__(self, css: str) -> None:
+        self._rules: dict[str, dict[str, str]] = {}
+        for item in parse_css(css):
+            rules = [item] if isinstance(item, Rule) else []
+            if isinstance(item, AtBlock) and item.prelude.lower() == "@media print":
+                rules = item.rules
+            for rule in rules:
+                for selector in rule.selector.split(","):
+                    self._rules.setdefault(selector.strip(), {}).update(rule.declarations)
+
+    def value(self, selector: str, prop: str) -> str | None:
+        return self._rules.get(selector, {}).get(prop)
+
+    def length(self, selector: str, prop: str, default: float = 0.0) -> float:
+        return _px(self.value(selector, prop), default)
+
+    def number(self, selector: str, prop: str, default: float) -> float:
+        try:
+            return float(self.value(selector, prop) or default)
+        except ValueError:
+            return default
+
+    def edges(self, selector: str, prop: str) -> tuple[float, float, float, float]:
+        """``(top, right, bottom, left)`` of a margin/padding shorthand plus longhands."""
+        parts = [_px(p) for p in (self.value(selector, prop) or "0").split()][:4]
+        # CSS shorthand: right defaults to top, bottom to top, left to right
+        while len(parts) < 4:
+            parts.append(parts[len(parts) - 2] if len(parts) > 1 else parts[0])
+        sides = dict(zip(("top", "right", "bottom", "left"), parts))
+        for side in sides:
+            longhand = self.value(selector, f"{prop}-{side}")
+            if longhand is not None:
+                sides[side] = _px(longhand)
+        return sides["top"], sides["right"], sides["bottom"], sides["left"]
+
+    def border(self, selector: str, side: str) -> float:
+        """Width of one side's border, from ``border-<side>`` or the ``border`` shorthand."""
+        value = self.value(selector, f"border-{side}") or self.value(selector, "border") or ""
+        for part in value.split():
+            if part == "none":
+                return 0.0
+            if re.fullmatch(r"[\d.]+[a-z]*", part):
+                return _px(part)
+        return 0.0
+
+    def page_size(self) -> tuple[float, float]:
+        size = (self.value("@page", "size") or "letter").split()[0].lower()
+        return PAGE_SIZES_PX.get(size, PAGE_SIZES_PX["letter"])
+
+
+@dataclass(frozen=True)
+class FitResult:
+    scale: float = 1.0
+    spell_limit: int | None = None
+    skill_limit: int | None = None
+    height: float = 0.0     # estimated sheet height, CSS px before zoom
+    available: float = 0.0  # height the sheet may use at ``scale``
+
+    @property
+    def fits(self) -> bool:
+        return self.height <= self.available
+
+    def summary(self) -> str:
+        parts = [f"scale {self.scale:.2f}"]
+        if self.spell_limit is not None:
+            parts.append(f"{self.spell_limit} spells/rank")
+        if self.skill_limit is not None:
+            parts.append(f"{self.skill_limit} skills")
+        parts.append(f"~{self.height / self.available:.0%} of page" if self.available else "")
+        return ", ".join(filter(None, parts)) + ("" if self.fits else " (still overflows)")
+
+
+class LayoutEstimator:
+    """Predict section heights for one stylesheet (one theme and page size)."""
+
+    def __init__(self, metrics: StyleMetrics) -> None:
+        m = metrics
+        self.page_w, self.page_h = m.page_size()
+        self.margin = m.edges("@page", "margin")
+        self.body_pad = m.edges("body", "padding")
+        self.max_width = m.length("body", "max-width", math.inf)
+        self.font = m.length("html", "font-size", 10.5)
+        self.leading = m.number("html", "line-height", 1.35)
+
+        self.header_pad = m.edges(".page-header", "padding")
+        self.header_gap = m.length(".page-header", "gap", 16)
+        self.header_margin = m.length(".page-header", "margin-bottom", 6)
+        self.name_size = m.length(".char-name", "font-size", 28)
+        self.name_leading = m.number(".char-name", "line-height", 1.1)
+        self.name_spacing = m.length(".char-name", "letter-spacing")
+        self.subtitle_size = m.length(".char-subtitle", "font-size", 11)
+        self.subtitle_margin = m.length(".char-subtitle", "margin-top", 1)
+        self.inline_size = m.length(".header-inline-line", "font-size", 9.5)
+        self.inline_margin = m.length(".header-inline-line", "margin-top", 2)
+        self.inline_label_size = m.length(".header-inline-label", "font-size", 8)
+
+        # Ability boxes: modifier over label over score; stat boxes: value over label
+        self.box_width = m.length(".ability-box", "min-width", 30)
+        self.box_mod_size = m.length(".ability-box .mod", "font-size", 14)
+        self.box_label_size = m.length(".ability-box .label", "font-size", 8)
+        self.box_score_size = m.length(".ability-box .score", "font-size", 8)
+        self.group_mod_size = m.length(".ability-box-group .ability-box .mod", "font-size", self.box_mod_size)
+        self.group_gap = m.length(".ability-box-group", "gap", 2)
+        self.ability_group_box = self._box(m, ".ability-box-group")
+        self.stat_group_box = self._box(m, ".stat-box-group")
+        self.ability_row_margin = m.length(".ability-row", "margin-bottom", 2)
+
+        self.section_margin = m.length(".section", "margin-bottom", 5)
+        title_pad = m.edges(".section-title", "padding")
+        self.title_size = m.length(".section-title", "font-size", 11)
+        self.title_extra = (
+            title_pad[0] + title_pad[2] + m.border(".section-title", "bottom")
+            + m.length(".section-title", "margin-bottom", 2)
+        )
+
+        self.skill_columns = int(m.number(".skill-list", "column-count", 3))
+        self.skill_gap = m.length(".skill-list", "column-gap", 14)
+        self.skill_fixed = m.length(".skill-row .mod", "min-width", 24) + m.length(".skill-row .prof", "min-width", 12)
+        skill_pad = m.edges(".skill-row", "padding")
+        self.skill_row_pad = skill_pad[0] + skill_pad[2]
+
+        self.stats_size = m.length(".weapon-stats", "font-size", 9.5)
+        self.material_size = m.length(".weapon-material", "font-size", 9)
+        weapon_pad = m.edges(".weapon-line", "padding")
+        self.weapon_pad = weapon_pad[0] + weapon_pad[2]
+        # Row gap of the wrapping item line (``gap: <row> <column>``)
+        self.item_gap = _px((m.value(".equipment-line", "gap") or "0").split()[0])
+
+        self.caster_size = m.length(".caster-header", "font-size", 11)
+        self.meta_size = m.length(".caster-meta", "font-size", 9.5)
+        self.meta_margin = m.length(".caster-meta", "margin-bottom", 2)
+        self.caster_margin = m.length(".caster-block", "margin-bottom", 4)
+        sep = m.edges(".caster-sep", "margin")
+        self.separator = sep[0] + sep[2] + m.border(".caster-sep", "top") + m.border(".caster-sep", "bottom")
+        self.rank_margin = m.length(".spell-rank", "margin-bottom", 2)
+        self.rank_label_size = m.length(".spell-rank-label", "font-size", 9.5)
+        self.slots_size = m.length(".spell-rank-slots", "font-size", 8.5)
+        self.list_size = m.length(".spell-rank-list", "font-size", 10)
+        self.spell_columns = int(m.number(".spell-rank-list", "column-count", 2))
+        self.spell_gap = m.length(".spell-rank-list", "column-gap", 14)
+        self.entry_indent = m.length(".spell-entry", "padding-left", 4)
+        self.entry_margin = m.length(".spell-entry", "margin-bottom", 1)
+        self.spell_name_size = m.length(".spell-entry .spell-name", "font-size", 10)
+        self.spell_desc_size = m.length(".spell-entry .spell-desc", "font-size", 9)
+
+    @staticmethod
+    def _box(m: StyleMetrics, selector: str) -> tuple[float, float]:
+        """``(horizontal, vertical)`` padding plus border of a box."""
+        top, right, bottom, left = m.edges(selector, "padding")
+        return (
+            left + right + m.border(selector, "left") + m.border(selector, "right"),
+            top + bottom + m.border(selector, "top") + m.border(selector, "bottom"),
+        )
+
+    def line(self, size: float | None = None) -> float:
+        return (size or self.font) * self.leading
+
+    def page_box(self, scale: float = 1.0) -> tuple[float, float]:
+        """Content ``(width, height)`` in CSS px when ``body`` is zoomed by ``scale``."""
+        top, right, bottom, left = self.margin
+        width = min((self.page_w - left - right) / scale, self.max_width)
+        width -= self.body_pad[1] + self.body_pad[3]
+        height = (self.page_h - top - bottom) / scale - self.body_pad[0] - self.body_pad[2]
+        return width, height
+
+    # --- sections -------------------------------------------------------
+
+    def _chrome(self) -> float:
+        return self.line(self.title_size) + self.title_extra + self.section_margin
+
+    def header(self, sheet: dict, width: float) -> float:
+        char = sheet["char"]
+        ident = char.identity
+        # Ability boxes over stat boxes, ABILITY_BOXES to a row
+        right_w = (
+            ABILITY_BOXES * self.box_width + (ABILITY_BOXES - 1) * self.group_gap + self.ability_group_box[0]
+        )
+        right_h = 0.0
+        if char.abilities:
+            right_h += self.line(self.group_mod_size) + self.line(self.box_label_size) + self.line(self.box_score_size)
+            right_h += self.ability_group_box[1]
+        right_h += self.line(self.box_mod_size) + self.line(self.box_label_size) + self.stat_group_box[1]
+        left_w = max(width - right_w - self.header_gap, 1.0)
+
+        name_w = left_w - self.name_spacing * len(ident.name)
+        name_lines = wrapped_lines([(ident.name, self.name_size, True)], name_w)
+        height = name_lines * self.name_size * self.name_leading
+        subtitle = (
+            f"Level {ident.level} {ident.ancestry} ({ident.heritage}) {ident.char_class} "
+            f"· {ident.background} · Speed: {char.mobility.speed} ft"
+        )
+        subtitle_lines = wrapped_lines([(subtitle, self.subtitle_size, False)], left_w)
+        height += self.subtitle_margin + subtitle_lines * self.line(self.subtitle_size)
+        if ident.languages:
+            languages = ", ".join(ident.languages)
+            lines = wrapped_lines([(languages, self.inline_size, False)], left_w - INLINE_LABEL_WIDTH)
+            height += self.inline_margin + lines * self.line(self.inline_size)
+        if sheet["key_features"]:
+            widths = [INLINE_LABEL_WIDTH] + [text_width(f + " · ") * self.inline_size for f in sheet["key_features"]]
+            height += self.inline_margin + packed_lines(widths, left_w) * self.line(self.inline_size)
+        return max(height, right_h) + self.header_pad[0] + self.header_pad[2] + self.header_margin
+
+    def abilities(self, sheet: dict, width: float) -> float:
+        if not sheet["char"].abilities:
+            return 0.0
+        boxes = self.line(self.box_mod_size) + self.line(self.box_label_size) + self.line(self.box_score_size)
+        return self._chrome() + boxes + self.ability_row_margin
+
+    def defense(self, sheet: dict, width: float) -> float:
+        resistances = sheet["char"].defense.resistances
+        if not resistances:
+            return 0.0
+        return self._chrome() + wrapped_lines([(", ".join(resistances), self.font, False)], width) * self.line()
+
+    def skills(self, sheet: dict, width: float) -> float:
+        skills = sheet["display_skills"]
+        if not skills:
+            return 0.0
+        col_w = (width - self.skill_gap * (self.skill_columns - 1)) / self.skill_columns
+        rows = [
+            wrapped_lines([(s.name, self.font, False)], col_w - self.skill_fixed) * self.line() + self.skill_row_pad
+            for s in skills
+        ]
+        return self._chrome() + column_height(rows, self.skill_columns)
+
+    def weapons(self, sheet: dict, width: float) -> float:
+        char = sheet["char"]
+        if not (char.weapons or char.items):
+            return 0.0
+        height = self._chrome()
+        for w in char.weapons:
+            runs = [
+                (w.display or w.name, self.font, True),
+                (f" +{w.attack} · {w.damage_dice}+{w.damage_bonus} {w.damage_type}", self.stats_size, False),
+                (f" {w.material}", self.material_size, False),
+            ]
+            height += wrapped_lines(runs, width) * self.line() + self.weapon_pad
+        if char.items:
+            widths = [text_width(f"{i.name} ×{i.qty} · ") * self.font for i in char.items]
+            height += packed_lines(widths, width) * (self.line() + self.item_gap)
+        return height
+
+    def _entries(self, entries: Sequence[tuple[str, str]], width: float) -> float:
+        col_w = (width - self.spell_gap * (self.spell_columns - 1)) / self.spell_columns - self.entry_indent
+        heights = [
+            wrapped_lines([(name, self.spell_name_size, True), (desc, self.spell_desc_size, False)], col_w)
+            * self.line(self.list_size) + self.entry_margin
+            for name, desc in entries
+        ]
+        return column_height(heights, self.spell_columns)
+
+    def spellcasting(self, sheet: dict, width: float, include_prepared: bool = True, spell_limit: int | None = None) -> float:
+        char = sheet["char"]
+        if not char.spellcasters:
+            return 0.0
+        spell_desc = sheet["spell_desc"]
+        height = self._chrome()
+        meta_line = self.line(self.meta_size)
+        for n, caster in enumerate(char.spellcasters):
+            height += (self.separator if n else 0.0) + self.caster_margin
+            height += self.line(self.caster_size) + 2 * meta_line + self.meta_margin
+            ranks = caster.prepared if caster.prepared and include_prepared else caster.spells
+            for rank in ranks:
+                spells = rank.spells[:spell_limit]
+                entries = [(s, f" — {spell_desc[s]}" if spell_desc.get(s) else "") for s in spells]
+                if len(rank.spells) > len(spells):
+                    entries.append((f"+{len(rank.spells) - len(spells)} more", ""))
+                height += self.line() + self.rank_margin + self._entries(entries, width)
+        if char.focus_spells:
+            height += self.separator + self.caster_margin + self.line(self.caster_size) + meta_line
+            entries = [
+                (f"{fs.name} ({fs.tradition})", f" — {spell_desc[fs.name]}" if spell_desc.get(fs.name) else "")
+                for fs in char.focus_spells
+            ]
+            height += self._entries(entries, width)
+        return height
+
+    def sheet(self, sheet: dict, width: float, include_prepared: bool = True, spell_limit: int | None = None) -> float:
+        """Estimated height of the whole sheet laid out at ``width``."""
+        height = self.header(sheet, width)
+        for section_id in sheet["profile"].section_order:
+            if section_id == "spellcasting":
+                height += self.spellcasting(sheet, width, include_prepared, spell_limit)
+            elif section_id in ("abilities", "defense", "skills", "weapons"):
+                height += getattr(self, section_id)(sheet, width)
+        return height
+
+
+@lru_cache(maxsize=16)
+def estimator_for(css: str) -> LayoutEstimator:
+    """The (cached) estimator for a built stylesheet."""
+    return LayoutEstimator(StyleMetrics(css))
+
+
+def fit_sheet(estimator: LayoutEstimator, sheet: dict, include_prepared: bool = True) -> FitResult:
+    """Find the largest scale, then the fewest cuts, at which ``sheet`` fits one page.
+
+    ``sheet`` is the per-character template context (``char``, ``profile``,
+    ``display_skills``, ``key_features``, ``spell_desc``).
+    """
+    skills = sheet["display_skills"]
+
+    def measure(steps: int, spell_limit: int | None = None, skill_limit: int | None = None) -> FitResult:
+        scale = steps / SCALE_STEPS
+        width, height = estimator.page_box(scale)
+        trimmed = sheet if skill_limit is None else sheet | dict(display_skills=skills[:skill_limit])
+        used = estimator.sheet(trimmed, width, include_prepared, spell_limit)
+        return FitResult(scale, spell_limit, skill_limit, used, height * SAFETY)
+
+    def largest(lo: int, hi: int, fits) -> int:
+        """Largest value in ``[lo, hi]`` for which ``fits`` holds, given it holds at ``lo``."""
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if fits(mid):
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    result = measure(SCALE_STEPS)
+    if result.fits:
+        return result
+    floor = round(MIN_SCALE * SCALE_STEPS)
+    if measure(floor).fits:
+        return measure(largest(floor, SCALE_STEPS, lambda s: measure(s).fits))
+
+    ranks = [
+        len(rank.spells)
+        for caster in sheet["char"].spellcasters
+        for rank in (caster.prepared if caster.prepared and include_prepared else caster.spells)
+    ]
+    longest = max(ranks, default=0)
+    spell_limit = None
+    if longest > MIN_SPELLS_PER_RANK:
+        if measure(floor, MIN_SPELLS_PER_RANK).fits:
+            spell_limit = largest(MIN_SPELLS_PER_RANK, longest - 1, lambda n: measure(floor, n).fits)
+            return measure(floor, spell_limit)
+        spell_limit = MIN_SPELLS_PER_RANK
+
+    if len(skills) > MIN_SKILLS:
+        if measure(floor, spell_limit, MIN_SKILLS).fits:
+            limit = largest(MIN_SKILLS, len(skills) - 1, lambda n: measure(floor, spell_limit, n).fits)
+            return measure(floor, spell_limit, limit)
+        return measure(floor, spell_limit, MIN_SKILLS)
+    return measure(floor, spell_limit)
@@ -0,0 +1,270 @@
+"""Inline, subsetted Alegreya for ``--font-source inline``.
+
+Sheets normally link Google Fonts, which fails offline and is slow on bad
+networks. With ``inline`` the font is embedded in the document as base64
+WOFF2 ``@font-face`` rules, subsetted to the characters the document uses.
+
+The font files are not shipped with the package. ``find_faces`` looks for
+Alegreya TTF/OTF files (static or variable, from Google Fonts or the
+Huerta Tipográfica release) in ``$P2E_ONEPAGER_FONT_DIR``, ``assets/fonts/``
+and the usual system and user font directories. It picks the faces the
+stylesheet uses: regular, semibold, bold and italic.
+
+Every subset covers printable ASCII plus whatever other characters the
+document holds (dashes, "×", accented names). The extra characters are the
+cache key, so a batch or roster subsets the font once per distinct set, and
+most sheets share the ASCII-only one. ``FontSubsetter`` keeps the last
+``max_entries`` stylesheets.
+
+Subsetting needs fontTools, and WOFF2 needs brotli:
+``pip install 'p2e-character-one-pager[fonts]'``. Without brotli the fonts
+are embedded as WOFF instead.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+FONT_FAMILY = "Alegreya"
+FONT_DIR_ENV = "P2E_ONEPAGER_FONT_DIR"
+ASSETS_FONT_DIR = Path(__file__).parent / "assets" / "fonts"
+FONT_SUFFIXES = (".ttf", ".otf")
+# (weight, style) of every face the stylesheet uses; as in the Google Fonts link
+FACES = ((400, "normal"), (600, "normal"), (700, "normal"), (400, "italic"))
+# Always in the subset, so most documents share one cache entry
+BASE_CHARS = frozenset(chr(c) for c in range(0x20, 0x7F))
+DEFAULT_MAX_ENTRIES = 32
+# Bump when the generated CSS changes
+FONT_FORMAT = 1
+
+
+class FontError(ValueError):
+    """The inline font source cannot be used: fontTools or the font files are missing."""
+
+
+def fonttools_available() -> bool:
+    return importlib.util.find_spec("fontTools") is not None
+
+
+def _fonttools():
+    try:
+        from fontTools import subset, ttLib
+    except ImportError:
+        raise FontError(
+            "--font-source inline needs fontTools: pip install 'p2e-character-one-pager[fonts]'"
+        ) from None
+    return subset, ttLib
+
+
+def font_dirs() -> list[Path]:
+    """Where ``find_faces`` looks, in order of preference."""
+    dirs = []
+    if os.environ.get(FONT_DIR_ENV):
+        dirs.append(Path(os.environ[FONT_DIR_ENV]))
+    dirs.append(ASSETS_FONT_DIR)
+    home = Path.home()
+    data_home = Path(os.environ.get("XDG_DATA_HOME") or home / ".local" / "share")
+    if sys.platform == "darwin":
+        dirs += [home / "Library" / "Fonts", Path("/Library/Fonts")]
+    elif sys.platform == "win32":
+        windir = Path(os.environ.get("WINDIR", r"C:\Windows"))
+        local = os.environ.get("LOCALAPPDATA")
+        if local:
+            dirs.append(Path(local) / "Microsoft" / "Windows" / "Fonts")
+        dirs.append(windir / "Fonts")
+    else:
+        dirs += [data_home / "fonts", home / ".fonts", Path("/usr/local/share/fonts"), Path("/usr/share/fonts")]
+    return dirs
+
+
+@dataclass(frozen=True)
+class FontFace:
+    path: Path
+    style: str  # "normal" | "italic"
+    weights: tuple[int, int]  # (min, max); equal unless it is a variable font
+
+    def covers(self, weight: int, style: str) -> bool:
+        return self.style == style and self.weights[0] <= weight <= self.weights[1]
+
+    @property
+    def css_weight(self) -> str:
+        low, high = self.weights
+        return str(low) if low == high else f"{low} {high}"
+
+
+def _read_face(path: Path, family: str) -> FontFace | None:
+    """The face in ``path`` if it belongs to ``family``, else None."""
+    _subset, ttLib = _fonttools()
+    try:
+        font = ttLib.TTFont(path, lazy=True, fontNumber=0)
+    except Exception:  # noqa: BLE001 - an unreadable file is just not a candidate
+        return None
+    with font:
+        name = font["name"]
+        face_family = name.getDebugName(16) or name.getDebugName(1)
+        if face_family != family:
+            return None
+        os2 = font["OS/2"] if "OS/2" in font else None
+        italic = bool(os2 and os2.fsSelection & 1) or "italic" in (name.getDebugName(2) or "").lower()
+        weight = os2.usWeightClass if os2 else 400
+        weights = (weight, weight)
+        if "fvar" in font:
+            for axis in font["fvar"].axes:
+                if axis.axisTag == "wght":
+                    weights = (int(axis.minValue), int(axis.maxValue))
+    return FontFace(path, "italic" if italic else "normal", weights)
+
+
+def find_faces(family: str = FONT_FAMILY, dirs: list[Path] | None = None) -> list[FontFace]:
+    """The faces of ``family`` covering ``FACES``, one file each, from the first dir that has any.
+
+    Only files whose name starts with the family name (spaces removed) are
+    opened. A variable font is preferred to static files for the weights it
+    covers. Raises FontError if fontTools is missing or no face is found.
+    """
+    _fonttools()
+    prefix = family.replace(" ", "").lower()
+    searched = font_dirs() if dirs is None else dirs
+    for directory in searched:
+        if not directory.is_dir():
+            continue
+        candidates = [
+            face
+            for path in sorted(directory.rglob("*"))
+            if path.suffix.lower() in FONT_SUFFIXES and path.name.lower().startswith(prefix)
+            if (face := _read_face(path, family)) is not None
+        ]
+        if not candidates:
+            continue
+        # Widest weight range first, so a variable font wins over static files
+        candidates.sort(key=lambda face: (face.weights[0] - face.weights[1], str(face.path)))
+        chosen: list[FontFace] = []
+        for weight, style in FACES:
+            if any(face.covers(weight, style) for face in chosen):
+                continue
+            face = next((face for face in candidates if face.covers(weight, style)), None)
+            if face is not None:
+                chosen.append(face)
+        if chosen:
+            return chosen
+    raise FontError(
+        f"{family} font files not found; put its .ttf files in ${FONT_DIR_ENV} "
+        f"or {ASSETS_FONT_DIR} (searched: {', '.join(str(d) for d in searched)})"
+    )
+
+
+def glyph_key(text: str) -> frozenset[str]:
+    """The characters of ``text`` a subset needs beyond ``BASE_CHARS``."""
+    return frozenset(c for c in set(text) if c >= " ") - BASE_CHARS
+
+
+@dataclass
+class SubsetStats:
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class FontSubsetter:
+    """``@font-face`` CSS for a document, cached by the characters it uses.
+
+    Faces are found on first use. Thread-safe; two threads missing on the same
+    set may both subset it.
+    """
+
+    def __init__(
+        self,
+        family: str = FONT_FAMILY,
+        dirs: list[Path] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.family = family
+        self.dirs = dirs
+        self.max_entries = max_entries
+        self._faces: list[tuple[FontFace, bytes]] | None = None
+        self._stamp: str | None = None
+        self._entries: OrderedDict[frozenset[str], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def faces(self) -> list[tuple[FontFace, bytes]]:
+        """Each face and its file's bytes."""
+        if self._faces is None:
+            with self._lock:
+                if self._faces is None:
+                    self._faces = [(face, face.path.read_bytes()) for face in find_faces(self.family, self.dirs)]
+        return self._faces
+
+    @property
+    def stamp(self) -> str:
+        """Hash of the font files, fontTools version and output format, for render fingerprints."""
+        if self._stamp is None:
+            _fonttools()
+            import fontTools
+
+            digest = hashlib.sha256(f"{FONT_FORMAT}:{fontTools.version}:{self.flavor}".encode())
+            for face, data in self.faces:
+                digest.update(f"{face.style}:{face.css_weight}".encode())
+                digest.update(hashlib.sha256(data).digest())
+            self._stamp = digest.hexdigest()
+        return self._stamp
+
+    @property
+    def flavor(self) -> str:
+        return "woff2" if importlib.util.find_spec("brotli") is not None else "woff"
+
+    def css(self, text: str) -> str:
+        """Minified ``@font-face`` rules embedding every face, subsetted for ``text``."""
+        key = glyph_key(text)
+        with self._lock:
+            css = self._entries.get(key)
+            if css is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return css
+            self.misses += 1
+        unicodes = sorted(map(ord, BASE_CHARS | key))
+        css = "".join(self._face_rule(face, data, unicodes) for face, data in self.faces)
+        with self._lock:
+            self._entries[key] = css
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return css
+
+    def _face_rule(self, face: FontFace, data: bytes, unicodes: list[int]) -> str:
+        subset, ttLib = _fonttools()
+        options = subset.Options()
+        # Hinting is most of a TrueType font's size and matters little at print resolution
+        options.hinting = False
+        # FontForge's timestamp table, which the subsetter would warn about and drop anyway
+        options.drop_tables += ["FFTM"]
+        font = ttLib.TTFont(io.BytesIO(data), fontNumber=0)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=unicodes)
+        subsetter.subset(font)
+        font.flavor = self.flavor
+        out = io.BytesIO()
+        font.save(out)
+        encoded = base64.b64encode(out.getvalue()).decode("ascii")
+        return (
+            f'@font-face{{font-family:"{self.family}";font-style:{face.style};'
+            f"font-weight:{face.css_weight};font-display:swap;"
+            f'src:url(data:font/{self.flavor};base64,{encoded}) format("{self.flavor}")}}'
+        )
+
+    @property
+    def stats(self) -> SubsetStats:
+        with self._lock:
+            return SubsetStats(self.hits, self.misses, len(self._entries), sum(map(len, self._entries.values())))
@@ -0,0 +1,143 @@
+"""Content-hash manifest for incremental rebuilds.
+
+The manifest lives next to the generated sheets and records, per output file,
+what it was built from: the hash of the input JSON, the render options and the
+package/template/CSS versions. A rebuild whose inputs all match is skipped, and
+an output that renders byte-identical to the file on disk is not rewritten, so
+unchanged sheets keep their mtimes.
+"""
+
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+from . import __version__
+from .options import BuildOptions
+
+MANIFEST_NAME = ".onepager-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def options_digest(options: BuildOptions) -> str:
+    payload = json.dumps(options.render_kwargs() | {"profile": options.profile_override}, sort_keys=True)
+    return content_digest(payload.encode("utf-8"))
+
+
+def make_entry(source: Path, input_digest: str, options: BuildOptions, render_fingerprint: str) -> dict:
+    return {
+        "source": str(source),
+        "input": input_digest,
+        "options": options_digest(options),
+        "package": __version__,
+        "render": render_fingerprint,
+    }
+
+
+def is_current(entry: dict | None, candidate: dict, out: Path) -> bool:
+    """True if ``out`` exists and ``entry`` was built from the same inputs as ``candidate``."""
+    if entry is None or not out.exists():
+        return False
+    return all(entry.get(key) == candidate[key] for key in ("input", "options", "package", "render"))
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = _tmp_path(path)
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` to ``path`` unless the file already holds exactly that.
+
+    Returns True if the file was written.
+    """
+    return write_bytes_if_changed(path, text.encode("utf-8"))
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """``write_if_changed`` for bytes."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    _atomic_write(path, data)
+    return True
+
+
+def stream_if_changed(path: Path, chunks: Iterable[str]) -> bool:
+    """``write_if_changed`` for a document produced in pieces.
+
+    The chunks are written to a temporary file beside ``path`` as they arrive,
+    which replaces ``path`` only if the contents differ, so memory use does not
+    grow with the document. Returns True if the file was written.
+    """
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.writelines(chunks)
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            tmp.unlink()
+            return False
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+class Manifest:
+    def __init__(self, path: Path, entries: dict[str, dict] | None = None) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, out_dir: Path) -> Manifest:
+        path = out_dir / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        entries = data.get("entries")
+        return cls(path, entries if isinstance(entries, dict) else {})
+
+    def _key(self, out: Path) -> str:
+        # Outputs can sit in subdirectories (see batch.output_path)
+        try:
+            return out.relative_to(self.path.parent).as_posix()
+        except ValueError:
+            return out.name
+
+    def get(self, out: Path) -> dict | None:
+        entry = self.entries.get(self._key(out))
+        return entry if isinstance(entry, dict) else None
+
+    def update(self, out: Path, entry: dict) -> None:
+        key = self._key(out)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        payload = {"version": MANIFEST_VERSION, "entries": dict(sorted(self.entries.items()))}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.path, (json.dumps(payload, indent=2) + "\n").encode("utf-8"))
+        self._dirty = False
@@ -0,0 +1,133 @@
+"""Shrink rendered documents for ``--minify``.
+
+Every document inlines the whole stylesheet, though a martial sheet never
+shows a spell list and a short one has no resistances box. ``Minifier``
+collects the classes the document's HTML uses, drops the CSS rules that need
+any other class (see ``css.prune_unused``), and collapses the template's
+indentation.
+
+Whitespace is only removed where the browser would not render it: each line
+loses its indentation, blank lines go, and line breaks next to block-level
+tags (``div``, ``section``, ``li``...) are dropped. What is left between
+inline elements is one line break, which renders as the space it was.
+``<script>`` and ``<style>`` contents only lose their indentation, and
+``<pre>`` and ``<textarea>`` contents are kept as they are. Tags are matched
+as the templates write them, in lower case.
+
+Pruned stylesheets are cached by the stylesheet and the classes of it the
+document uses, so sheets of the same shape share one entry. The minifier
+also counts the bytes it took in and gave back, for build reports.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+
+from .css import parse_css, prune_unused, serialize, stylesheet_classes
+
+DEFAULT_MAX_ENTRIES = 64
+
+_CLASS_ATTR = re.compile(r'class="([^"]*)"')
+# Contents kept apart from indentation, or whole for VERBATIM_TAGS; the group is the tag name
+_RAW = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>.*?</\2>)", re.S)
+VERBATIM_TAGS = ("pre", "textarea")
+# Elements that are never laid out inline, so line breaks beside their tags do not render
+BLOCK_TAGS = (
+    "html", "head", "body", "meta", "link", "title", "template", "section", "nav", "header", "footer",
+    "main", "div", "p", "ol", "ul", "li", "hr", "br", "table", "thead", "tbody", "tr", "td", "th",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+)
+_BLOCK_OPEN = "<(?:!DOCTYPE|/?(?:%s)\\b)" % "|".join(BLOCK_TAGS)
+_BREAK_BEFORE = re.compile(r"\n(?=%s)" % _BLOCK_OPEN)
+_BREAK_AFTER = re.compile(r"(%s[^>]*>)\n" % _BLOCK_OPEN)
+
+
+def bytes_since(before: tuple[int, int], after: tuple[int, int]) -> tuple[int, int]:
+    """The ``(bytes in, bytes out)`` added between two ``OnePagerEngine.minified_bytes`` readings."""
+    return after[0] - before[0], after[1] - before[1]
+
+
+def saved_summary(before: int, after: int) -> str:
+    """``saved 21.4 KiB of 52.4 KiB, 41%``."""
+    saved = before - after
+    share = saved / before if before else 0.0
+    return f"saved {saved / 1024:.1f} KiB of {before / 1024:.1f} KiB, {share:.0%}"
+
+
+def used_classes(html: str) -> frozenset[str]:
+    """Every class named in a ``class="..."`` attribute of ``html``."""
+    return frozenset(" ".join(_CLASS_ATTR.findall(html)).split())
+
+
+def _strip_lines(text: str) -> str:
+    # Only HTML whitespace: str.strip() would also take non-breaking spaces
+    return "\n".join([stripped for line in text.split("\n") if (stripped := line.strip(" \t\r\f"))])
+
+
+def minify_html(html: str) -> str:
+    """``html`` with whitespace removed where it does not render."""
+    parts = _RAW.split(html)
+    out: list[str] = []
+    # split() yields text, raw element, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        text = _strip_lines(parts[i])
+        # Joining the split drops the break after each tag; cheaper than sub(r"\1")
+        out.append("".join(_BREAK_AFTER.split(_BREAK_BEFORE.sub("", text))))
+        if i + 1 < len(parts):
+            raw, tag = parts[i + 1], parts[i + 2]
+            out.append(raw if tag in VERBATIM_TAGS else _strip_lines(raw))
+    return "".join(out)
+
+
+class Minifier:
+    """Prunes and minifies documents; thread-safe.
+
+    ``hits`` and ``misses`` count pruned-stylesheet cache lookups;
+    ``bytes_in`` and ``bytes_out`` are UTF-8 sizes before and after.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._stylesheets: dict[str, tuple[list, frozenset[str]]] = {}
+        self._entries: OrderedDict[tuple[str, frozenset[str]], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def prune(self, css: str, classes: frozenset[str]) -> str:
+        """``css`` without the rules no element with ``classes`` can match."""
+        parsed = self._stylesheets.get(css)
+        if parsed is None:
+            items = parse_css(css)
+            parsed = self._stylesheets.setdefault(css, (items, stylesheet_classes(items)))
+        items, vocabulary = parsed
+        key = (css, classes & vocabulary)
+        with self._lock:
+            pruned = self._entries.get(key)
+            if pruned is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pruned
+            self.misses += 1
+        pruned = serialize(prune_unused(items, key[1]))
+        with self._lock:
+            self._entries[key] = pruned
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return pruned
+
+    def minify(self, html: str, css: str) -> str:
+        """The complete document ``html``, whose ``<style>`` holds ``css``, pruned and minified."""
+        size = len(html.encode("utf-8"))
+        pruned = self.prune(css, used_classes(html))
+        if pruned != css:
+            html = html.replace(f"<style>{css}</style>", f"<style>{pruned}</style>", 1)
+        html = minify_html(html)
+        with self._lock:
+            self.bytes_in += size
+            self.bytes_out += len(html.encode("utf-8"))
+        return html
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+from typing import Any, TypeVar
+
 from pydantic import BaseModel, Field
+from pydantic_core import PydanticUndefined
+
+M = TypeVar("M", bound=BaseModel)
 
 
 class Identity(BaseModel):
@@ -148,3 +153,49 @@ class CharacterModel(BaseModel):
     focus_points: int = 0
     focus_spells: list[FocusSpell] = Field(default_factory=list)
     notes: list[str] = Field(default_factory=list)
+
+
+# --- Trusted construction -------------------------------------------------
+#
+# The parser computes and coerces every value itself, so re-running pydantic
+# validation on each of the dozens of small models per character is wasted
+# work in bulk runs. ``construct_trusted`` fills in defaults and sets the
+# instance state directly. Unlike ``BaseModel.model_construct`` it caches the
+# per-class default plan, which keeps it cheaper than validating.
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+_state_builders: dict[type, Any] = {}
+
+
+def _state_builder(cls: type[BaseModel]):
+    """Compile a function mapping keyword values to a declaration-ordered state dict.
+
+    Declaration order matters: it is the order ``model_dump`` serializes in.
+    """
+    namespace: dict[str, Any] = {}
+    entries = []
+    for i, (name, info) in enumerate(cls.model_fields.items()):
+        if info.default_factory is not None:
+            namespace[f"f{i}"] = info.default_factory
+            entries.append(f"{name!r}: v[{name!r}] if {name!r} in v else f{i}()")
+        elif info.default is PydanticUndefined:
+            entries.append(f"{name!r}: v[{name!r}]")
+        else:
+            namespace[f"d{i}"] = info.default
+            entries.append(f"{name!r}: v.get({name!r}, d{i})")
+    source = "def build(v):\n    return {" + ", ".join(entries) + "}\n"
+    exec(source, namespace)
+    _state_builders[cls] = builder = namespace["build"]
+    return builder
+
+
+def construct_trusted(cls: type[M], /, **values: Any) -> M:
+    """Build ``cls`` from already-valid field values (by name) without validation."""
+    builder = _state_builders.get(cls) or _state_builder(cls)
+    obj = _object_new(cls)
+    _object_setattr(obj, "__dict__", builder(values))
+    _object_setattr(obj, "__pydantic_fields_set__", set(values))
+    _object_setattr(obj, "__pydantic_extra__", None)
+    _object_setattr(obj, "__pydantic_private__", None)
+    return obj
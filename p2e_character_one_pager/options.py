@@ -0,0 +1,41 @@
+"""Rendering options shared by the CLI, batch builds and the HTTP service."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+PAGE_SIZE_CHOICES = ["letter", "a4"]
+THEME_CHOICES = ["default", "dark"]
+PROFILE_CHOICES = ["auto", "caster", "martial", "hybrid"]
+FONT_SOURCE_CHOICES = ["google", "inline", "none"]
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    page_size: str = "letter"
+    theme: str = "default"
+    profile_override: str = "auto"
+    max_skills: int = 8
+    include_prepared: bool = True
+    include_known: bool = False
+    font_source: str = "google"
+    fit: bool = False
+    minify: bool = False
+
+    def render_kwargs(self) -> dict:
+        kwargs = asdict(self)
+        kwargs.pop("profile_override")
+        return kwargs
+
+    def validate(self) -> None:
+        """Raise ValueError if any option is outside its allowed choices."""
+        for name, value, choices in (
+            ("page_size", self.page_size, PAGE_SIZE_CHOICES),
+            ("theme", self.theme, THEME_CHOICES),
+            ("profile", self.profile_override, PROFILE_CHOICES),
+            ("font_source", self.font_source, FONT_SOURCE_CHOICES),
+        ):
+            if value not in choices:
+                raise ValueError(f"{name} must be one of {', '.join(choices)} (got {value!r})")
+        if self.max_skills < 0:
+            raise ValueError(f"skills must be >= 0 (got {self.max_skills})")
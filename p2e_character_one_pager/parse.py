@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import json
 import math
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple, Sequence
 
 from .model import (
     Abilities,
@@ -22,8 +23,12 @@ from .model import (
     Skill,
     SpellEntry,
     Weapon,
+    construct_trusted,
 )
 
+if TYPE_CHECKING:
+    from .timings import StageTimer
+
 PROF_LABEL = {0: "U", 2: "T", 4: "E", 6: "M", 8: "L"}
 
 SKILL_NAMES = [
@@ -52,10 +57,46 @@ FEAT_TYPE_MAP = {
 }
 
 
+class DerivedStats(NamedTuple):
+    """Precomputed numbers for one build, from ``derived.derive_stats``.
+
+    When passed to ``parse_build`` these replace the per-character arithmetic;
+    they are exactly the values the scalar functions below would compute.
+    """
+
+    ability_mods: list[int]  # STR, DEX, CON, INT, WIS, CHA
+    hp: int
+    saves: list[int]  # fortitude, reflex, will, perception
+    skills: list[int]  # in SKILL_NAMES order
+    lores: list[int]  # one per well-formed lore entry
+    casters: list[tuple[int, int]]  # (spell DC, spell attack) per caster
+
+
 def _mod(score: int) -> int:
     return math.floor((score - 10) / 2)
 
 
+def _validated(cls, /, **values):
+    return cls(**values)
+
+
+def _maker(strict: bool):
+    """Model constructor for the parse mode.
+
+    The default trusted mode skips pydantic validation because every value is
+    computed or coerced here; ``strict=True`` validates each model as it is
+    built, which is slower but catches malformed exports early.
+    """
+    return _validated if strict else construct_trusted
+
+
+_UNTIMED = nullcontext()
+
+
+def _untimed(_stage: str) -> nullcontext:
+    return _UNTIMED
+
+
 def _get(d: dict, *keys: str, default: Any = None) -> Any:
     for k in keys:
         if d is None:
@@ -66,16 +107,23 @@ def _get(d: dict, *keys: str, default: Any = None) -> Any:
     return d
 
 
-def load_json(path: str | Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def unwrap_build(data: dict) -> dict:
+    """Return the build dict, accepting both bare and ``{"build": ...}`` exports."""
     if "build" in data:
         return data["build"]
     return data
 
 
-def parse_identity(b: dict) -> Identity:
-    return Identity(
+def load_json(path: str | Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return unwrap_build(data)
+
+
+def parse_identity(b: dict, strict: bool = False) -> Identity:
+    make = _maker(strict)
+    return make(
+        Identity,
         name=b.get("name", "Unknown"),
         level=b.get("level", 1),
         char_class=b.get("class", "Unknown"),
@@ -91,20 +139,23 @@ def parse_identity(b: dict) -> Identity:
     )
 
 
-def parse_abilities(b: dict) -> Abilities:
+def parse_abilities(b: dict, strict: bool = False, derived: DerivedStats | None = None) -> Abilities:
+    make = _maker(strict)
     ab = b.get("abilities", {})
-    def _a(key: str, label: str) -> Ability:
+    def _a(i: int, key: str, label: str) -> Ability:
         score = ab.get(key, 10)
-        return Ability(name=label, score=score, modifier=_mod(score))
-
-    return Abilities(**{
-        "str": _a("str", "STR"),
-        "dex": _a("dex", "DEX"),
-        "con": _a("con", "CON"),
-        "int": _a("int", "INT"),
-        "wis": _a("wis", "WIS"),
-        "cha": _a("cha", "CHA"),
-    })
+        modifier = _mod(score) if derived is None else derived.ability_mods[i]
+        return make(Ability, name=label, score=score, modifier=modifier)
+
+    return make(
+        Abilities,
+        str_=_a(0, "str", "STR"),
+        dex=_a(1, "dex", "DEX"),
+        con=_a(2, "con", "CON"),
+        int_=_a(3, "int", "INT"),
+        wis=_a(4, "wis", "WIS"),
+        cha=_a(5, "cha", "CHA"),
+    )
 
 
 def _prof_bonus(level: int, prof_rank: int) -> int:
@@ -117,63 +168,79 @@ def _save_mod(level: int, prof_rank: int, ability_mod: int) -> int:
     return _prof_bonus(level, prof_rank) + ability_mod
 
 
-def parse_defense(b: dict, abilities: Abilities) -> Defense:
+def has_toughness(b: dict) -> bool:
+    return any(
+        f[0] == "Toughness" for f in b.get("feats", []) if isinstance(f, (list, tuple)) and len(f) > 0
+    )
+
+
+def parse_defense(b: dict, abilities: Abilities, strict: bool = False, derived: DerivedStats | None = None) -> Defense:
+    make = _maker(strict)
     level = b.get("level", 1)
     profs = b.get("proficiencies", {})
 
     ac_total = _get(b, "acTotal", "acTotal", default=10)
 
-    con_mod = abilities.con.modifier
-    attrs = b.get("attributes", {})
-    ancestry_hp = attrs.get("ancestryhp", 0)
-    class_hp = attrs.get("classhp", 0)
-    bonus_hp = attrs.get("bonushp", 0)
-    bonus_hp_per_level = attrs.get("bonushpPerLevel", 0)
-
-    # Check for Toughness feat
-    has_toughness = any(
-        f[0] == "Toughness" for f in b.get("feats", []) if isinstance(f, (list, tuple)) and len(f) > 0
-    )
-    toughness_hp = level if has_toughness else 0
-
-    hp = ancestry_hp + (class_hp + con_mod + bonus_hp_per_level) * level + bonus_hp + toughness_hp
-
     fort_prof = profs.get("fortitude", 0)
     ref_prof = profs.get("reflex", 0)
     will_prof = profs.get("will", 0)
     perc_prof = profs.get("perception", 0)
 
-    return Defense(
+    if derived is not None:
+        hp = derived.hp
+        fortitude, reflex, will, perception = derived.saves
+    else:
+        con_mod = abilities.con.modifier
+        attrs = b.get("attributes", {})
+        ancestry_hp = attrs.get("ancestryhp", 0)
+        class_hp = attrs.get("classhp", 0)
+        bonus_hp = attrs.get("bonushp", 0)
+        bonus_hp_per_level = attrs.get("bonushpPerLevel", 0)
+        toughness_hp = level if has_toughness(b) else 0
+
+        hp = ancestry_hp + (class_hp + con_mod + bonus_hp_per_level) * level + bonus_hp + toughness_hp
+        fortitude = _save_mod(level, fort_prof, con_mod)
+        reflex = _save_mod(level, ref_prof, abilities.dex.modifier)
+        will = _save_mod(level, will_prof, abilities.wis.modifier)
+        perception = _save_mod(level, perc_prof, abilities.wis.modifier)
+
+    return make(
+        Defense,
         ac=ac_total,
         hp=hp,
-        fortitude=_save_mod(level, fort_prof, con_mod),
+        fortitude=fortitude,
         fort_prof=fort_prof,
-        reflex=_save_mod(level, ref_prof, abilities.dex.modifier),
+        reflex=reflex,
         reflex_prof=ref_prof,
-        will=_save_mod(level, will_prof, abilities.wis.modifier),
+        will=will,
         will_prof=will_prof,
-        perception=_save_mod(level, perc_prof, abilities.wis.modifier),
+        perception=perception,
         perception_prof=perc_prof,
         resistances=b.get("resistances", []),
     )
 
 
-def parse_skills(b: dict, abilities: Abilities) -> list[Skill]:
+def parse_skills(b: dict, abilities: Abilities, strict: bool = False, derived: DerivedStats | None = None) -> list[Skill]:
+    make = _maker(strict)
     level = b.get("level", 1)
     profs = b.get("proficiencies", {})
     skills: list[Skill] = []
 
-    for skill_name in SKILL_NAMES:
+    for i, skill_name in enumerate(SKILL_NAMES):
         prof_rank = profs.get(skill_name, 0)
-        ability_key = ABILITY_FOR_SKILL.get(skill_name, "dex")
-        attr = ability_key
-        if attr == "str":
-            attr = "str_"
-        elif attr == "int":
-            attr = "int_"
-        ability_mod = getattr(abilities, attr).modifier
-        mod = _prof_bonus(level, prof_rank) + ability_mod
-        skills.append(Skill(
+        if derived is not None:
+            mod = derived.skills[i]
+        else:
+            ability_key = ABILITY_FOR_SKILL.get(skill_name, "dex")
+            attr = ability_key
+            if attr == "str":
+                attr = "str_"
+            elif attr == "int":
+                attr = "int_"
+            ability_mod = getattr(abilities, attr).modifier
+            mod = _prof_bonus(level, prof_rank) + ability_mod
+        skills.append(make(
+            Skill,
             name=skill_name.capitalize(),
             modifier=mod,
             prof_rank=prof_rank,
@@ -182,7 +249,8 @@ def parse_skills(b: dict, abilities: Abilities) -> list[Skill]:
     return skills
 
 
-def parse_lores(b: dict, abilities: Abilities) -> list[Skill]:
+def parse_lores(b: dict, abilities: Abilities, strict: bool = False, derived: DerivedStats | None = None) -> list[Skill]:
+    make = _maker(strict)
     level = b.get("level", 1)
     lores = b.get("lores", [])
     result: list[Skill] = []
@@ -190,12 +258,16 @@ def parse_lores(b: dict, abilities: Abilities) -> list[Skill]:
     for lore in lores:
         if isinstance(lore, (list, tuple)) and len(lore) >= 2:
             name, rank = lore[0], lore[1]
-            mod = _prof_bonus(level, rank) + int_mod
-            result.append(Skill(name=f"{name} Lore", modifier=mod, prof_rank=rank))
+            if derived is not None:
+                mod = derived.lores[len(result)]
+            else:
+                mod = _prof_bonus(level, rank) + int_mod
+            result.append(make(Skill, name=f"{name} Lore", modifier=mod, prof_rank=rank))
     return result
 
 
-def parse_feats(b: dict) -> list[Feat]:
+def parse_feats(b: dict, strict: bool = False) -> list[Feat]:
+    make = _maker(strict)
     raw_feats = b.get("feats", [])
     feats: list[Feat] = []
     for f in raw_feats:
@@ -207,7 +279,8 @@ def parse_feats(b: dict) -> list[Feat]:
         feat_level = f[3] if isinstance(f[3], int) else 0
         feat_type = FEAT_TYPE_MAP.get(raw_type, raw_type)
         display_name = f"{name} ({sub_choice})" if sub_choice else name
-        feats.append(Feat(
+        feats.append(make(
+            Feat,
             name=display_name,
             feat_type=feat_type,
             level=feat_level,
@@ -215,7 +288,8 @@ def parse_feats(b: dict) -> list[Feat]:
     return feats
 
 
-def parse_weapons(b: dict) -> list[Weapon]:
+def parse_weapons(b: dict, strict: bool = False) -> list[Weapon]:
+    make = _maker(strict)
     raw = b.get("weapons", [])
     weapons: list[Weapon] = []
     for w in raw:
@@ -231,7 +305,8 @@ def parse_weapons(b: dict) -> list[Weapon]:
             dice_count = 1
         damage_dice = f"{dice_count}{die}"
 
-        weapons.append(Weapon(
+        weapons.append(make(
+            Weapon,
             name=w.get("name", "Unknown"),
             display=w.get("display", w.get("name", "Unknown")),
             attack=w.get("attack", 0),
@@ -243,7 +318,8 @@ def parse_weapons(b: dict) -> list[Weapon]:
     return weapons
 
 
-def parse_items(b: dict) -> tuple[list[ItemEntry], Money]:
+def parse_items(b: dict, strict: bool = False) -> tuple[list[ItemEntry], Money]:
+    make = _maker(strict)
     raw = b.get("equipment", [])
     items: list[ItemEntry] = []
     for entry in raw:
@@ -251,10 +327,11 @@ def parse_items(b: dict) -> tuple[list[ItemEntry], Money]:
             name = entry[0]
             qty = entry[1] if isinstance(entry[1], int) else 1
             invested = len(entry) >= 3 and entry[2] == "Invested"
-            items.append(ItemEntry(name=name, qty=qty, invested=invested))
+            items.append(make(ItemEntry, name=name, qty=qty, invested=invested))
 
     raw_money = b.get("money", {})
-    money = Money(
+    money = make(
+        Money,
         cp=raw_money.get("cp", 0),
         sp=raw_money.get("sp", 0),
         gp=raw_money.get("gp", 0),
@@ -263,27 +340,34 @@ def parse_items(b: dict) -> tuple[list[ItemEntry], Money]:
     return items, money
 
 
-def parse_spellcasters(b: dict, abilities: Abilities) -> list[CasterModel]:
+def parse_spellcasters(
+    b: dict, abilities: Abilities, strict: bool = False, derived: DerivedStats | None = None
+) -> list[CasterModel]:
+    make = _maker(strict)
     level = b.get("level", 1)
     raw_casters = b.get("spellCasters", [])
     casters: list[CasterModel] = []
 
     for rc in raw_casters:
         ability_key = rc.get("ability", "int")
-        if ability_key == "str":
-            ability_mod = abilities.str_.modifier
-        elif ability_key == "int":
-            ability_mod = abilities.int_.modifier
-        else:
-            ability_mod = getattr(abilities, ability_key, abilities.int_).modifier
         prof = rc.get("proficiency", 0)
-        prof_bonus = _prof_bonus(level, prof)
-        spell_dc = 10 + prof_bonus + ability_mod
-        spell_attack = prof_bonus + ability_mod
+        if derived is not None:
+            spell_dc, spell_attack = derived.casters[len(casters)]
+        else:
+            if ability_key == "str":
+                ability_mod = abilities.str_.modifier
+            elif ability_key == "int":
+                ability_mod = abilities.int_.modifier
+            else:
+                ability_mod = getattr(abilities, ability_key, abilities.int_).modifier
+            prof_bonus = _prof_bonus(level, prof)
+            spell_dc = 10 + prof_bonus + ability_mod
+            spell_attack = prof_bonus + ability_mod
 
         spells: list[SpellEntry] = []
         for s in rc.get("spells", []):
-            spells.append(SpellEntry(
+            spells.append(make(
+                SpellEntry,
                 spell_level=s.get("spellLevel", 0),
                 spells=s.get("list", []),
             ))
@@ -291,13 +375,15 @@ def parse_spellcasters(b: dict, abilities: Abilities) -> list[CasterModel]:
 
         prepared: list[SpellEntry] = []
         for p in rc.get("prepared", []):
-            prepared.append(SpellEntry(
+            prepared.append(make(
+                SpellEntry,
                 spell_level=p.get("spellLevel", 0),
                 spells=p.get("list", []),
             ))
         prepared.sort(key=lambda x: x.spell_level)
 
-        casters.append(CasterModel(
+        casters.append(make(
+            CasterModel,
             name=rc.get("name", "Unknown"),
             tradition=rc.get("magicTradition", ""),
             casting_type=rc.get("spellcastingType", ""),
@@ -315,7 +401,8 @@ def parse_spellcasters(b: dict, abilities: Abilities) -> list[CasterModel]:
     return casters
 
 
-def parse_focus(b: dict) -> tuple[int, list[FocusSpell]]:
+def parse_focus(b: dict, strict: bool = False) -> tuple[int, list[FocusSpell]]:
+    make = _maker(strict)
     focus_points = b.get("focusPoints", 0)
     focus_data = b.get("focus", {})
     spells: list[FocusSpell] = []
@@ -327,9 +414,9 @@ def parse_focus(b: dict) -> tuple[int, list[FocusSpell]]:
             if not isinstance(details, dict):
                 continue
             for spell_name in details.get("focusSpells", []):
-                spells.append(FocusSpell(name=spell_name, tradition=tradition))
+                spells.append(make(FocusSpell, name=spell_name, tradition=tradition))
             for spell_name in details.get("focusCantrips", []):
-                spells.append(FocusSpell(name=spell_name, tradition=tradition))
+                spells.append(make(FocusSpell, name=spell_name, tradition=tradition))
 
     return focus_points, spells
 
@@ -338,37 +425,72 @@ def parse_specials(b: dict) -> list[str]:
     return b.get("specials", [])
 
 
-def parse(path: str | Path) -> CharacterModel:
-    b = load_json(path)
-
-    identity = parse_identity(b)
-    abilities = parse_abilities(b)
-    defense = parse_defense(b, abilities)
-    skills = parse_skills(b, abilities)
-    lores = parse_lores(b, abilities)
-    feats = parse_feats(b)
-    weapons = parse_weapons(b)
-    items, money = parse_items(b)
-    spellcasters = parse_spellcasters(b, abilities)
-    focus_points, focus_spells = parse_focus(b)
+def parse(path: str | Path, strict: bool = False) -> CharacterModel:
+    return parse_build(load_json(path), strict=strict)
+
+
+def parse_builds(builds: Sequence[dict], strict: bool = False, vectorized: bool = False) -> list[CharacterModel]:
+    """Parse many builds; with ``vectorized``, derive their numbers in NumPy passes.
+
+    The models are identical either way (``bench vectorized`` cross-checks
+    this). Model construction, not arithmetic, dominates parse time, so the
+    vectorized pass is opt-in.
+    """
+    if not vectorized:
+        return [parse_build(b, strict=strict) for b in builds]
+    from .derived import derive_stats
+
+    return [parse_build(b, strict=strict, derived=d) for b, d in zip(builds, derive_stats(builds))]
+
+
+def parse_build(
+    b: dict,
+    strict: bool = False,
+    derived: DerivedStats | None = None,
+    timer: StageTimer | None = None,
+) -> CharacterModel:
+    make = _maker(strict)
+    stage = _untimed if timer is None else timer.stage
+    with stage("parse_identity"):
+        identity = parse_identity(b, strict=strict)
+    with stage("parse_abilities"):
+        abilities = parse_abilities(b, strict=strict, derived=derived)
+    with stage("parse_defense"):
+        defense = parse_defense(b, abilities, strict=strict, derived=derived)
+    with stage("parse_skills"):
+        skills = parse_skills(b, abilities, strict=strict, derived=derived)
+    with stage("parse_lores"):
+        lores = parse_lores(b, abilities, strict=strict, derived=derived)
+    with stage("parse_feats"):
+        feats = parse_feats(b, strict=strict)
+    with stage("parse_weapons"):
+        weapons = parse_weapons(b, strict=strict)
+    with stage("parse_items"):
+        items, money = parse_items(b, strict=strict)
+    with stage("parse_spellcasters"):
+        spellcasters = parse_spellcasters(b, abilities, strict=strict, derived=derived)
+    with stage("parse_focus"):
+        focus_points, focus_spells = parse_focus(b, strict=strict)
     specials = parse_specials(b)
 
     speed = b.get("attributes", {}).get("speed", 25)
     speed_bonus = b.get("attributes", {}).get("speedBonus", 0)
 
-    return CharacterModel(
-        identity=identity,
-        abilities=abilities,
-        defense=defense,
-        mobility=Mobility(speed=speed + speed_bonus),
-        skills=skills,
-        lores=lores,
-        feats=feats,
-        specials=specials,
-        weapons=weapons,
-        items=items,
-        money=money,
-        spellcasters=spellcasters,
-        focus_points=focus_points,
-        focus_spells=focus_spells,
-    )
+    with stage("parse_model"):
+        return make(
+            CharacterModel,
+            identity=identity,
+            abilities=abilities,
+            defense=defense,
+            mobility=make(Mobility, speed=speed + speed_bonus),
+            skills=skills,
+            lores=lores,
+            feats=feats,
+            specials=specials,
+            weapons=weapons,
+            items=items,
+            money=money,
+            spellcasters=spellcasters,
+            focus_points=focus_points,
+            focus_spells=focus_spells,
+        )
@@ -0,0 +1,268 @@
+"""Asyncio batch pipeline overlapping file I/O with rendering.
+
+``build-all`` normally reads, renders and writes each file inside a worker
+process, so on a slow network mount the CPUs wait on I/O. ``run_pipeline``
+splits the work into three stages joined by bounded queues:
+
+- ``io_concurrency`` reader tasks read inputs in threads and check the manifest
+- ``jobs`` render tasks hand parse/classify/render to an executor: a process
+  pool, or one thread with ``jobs=1``
+- ``io_concurrency`` writer tasks write outputs in threads
+
+A full queue blocks the stage feeding it, so at most ``queue_size`` inputs
+and ``queue_size`` rendered sheets wait at a time, however large the batch.
+``latency`` adds a delay to every read and write, which lets a local
+directory stand in for a slow mount (see ``bench pipeline``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from . import render as _render
+from .batch import (
+    FAILED,
+    SKIPPED,
+    UNCHANGED,
+    WRITTEN,
+    BuildResult,
+    _init_worker,
+    _record,
+    default_jobs,
+    load_character,
+    output_paths,
+)
+from .cache import ParseCache
+from .fragments import Counts, counts_since
+from .manifest import Manifest, content_digest, is_current, make_entry, stream_if_changed
+from .minify import bytes_since
+from .options import BuildOptions
+from .profile import classify
+from .timings import StageTimer
+
+DEFAULT_IO_CONCURRENCY = 8
+QUEUES = ("render", "write")
+
+
+@dataclass
+class PipelineStats:
+    """Counters for one pipeline run.
+
+    Queue depths are sampled whenever an item is queued.
+    """
+
+    files: int = 0
+    queue_size: int = 0
+    counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys((WRITTEN, UNCHANGED, SKIPPED, FAILED), 0))
+    bytes_read: int = 0
+    bytes_written: int = 0
+    elapsed: float = 0.0
+    max_depth: dict[str, int] = field(default_factory=lambda: dict.fromkeys(QUEUES, 0))
+    _depth_total: dict[str, int] = field(default_factory=lambda: dict.fromkeys(QUEUES, 0))
+    _depth_samples: dict[str, int] = field(default_factory=lambda: dict.fromkeys(QUEUES, 0))
+
+    def observe(self, name: str, queue: asyncio.Queue) -> None:
+        depth = queue.qsize()
+        self.max_depth[name] = max(self.max_depth[name], depth)
+        self._depth_total[name] += depth
+        self._depth_samples[name] += 1
+
+    def mean_depth(self, name: str) -> float:
+        samples = self._depth_samples[name]
+        return self._depth_total[name] / samples if samples else 0.0
+
+    @property
+    def done(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def throughput(self) -> float:
+        """Files finished per second."""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        depths = ", ".join(
+            f"{name} queue max {self.max_depth[name]}/{self.queue_size} (mean {self.mean_depth(name):.1f})"
+            for name in QUEUES
+        )
+        return (
+            f"{self.throughput:.1f} files/sec; {self.bytes_read / 1024:.0f} KiB read, "
+            f"{self.bytes_written / 1024:.0f} KiB written; {depths}"
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "counts": dict(self.counts),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "elapsed_s": round(self.elapsed, 4),
+            "files_per_sec": round(self.throughput, 2),
+            "queue_size": self.queue_size,
+            "max_depth": dict(self.max_depth),
+            "mean_depth": {name: round(self.mean_depth(name), 2) for name in QUEUES},
+        }
+
+
+def render_text(
+    raw: bytes, digest: str, options: BuildOptions, strict: bool = False, cache: ParseCache | None = None
+) -> tuple[str, str, dict[str, float], Counts, tuple[int, int]]:
+    """Parse and render export bytes.
+
+    Returns ``(html, profile type, stage seconds, fragment cache counts,
+    bytes before and after --minify)``.
+    """
+    timer = StageTimer()
+    char = load_character(raw, timer, strict=strict, cache=cache, input_digest=digest)
+    with timer.stage("classify"):
+        profile = classify(char, override=options.profile_override)
+    engine = _render.default_engine()
+    counts, sizes = engine.fragment_counts(), engine.minified_bytes()
+    chunks = engine.generate(char, profile, timer=timer, **options.render_kwargs())
+    with timer.stage("render"):
+        html = "".join(chunks)
+    return (
+        html,
+        profile.profile_type,
+        timer.stages,
+        counts_since(counts, engine.fragment_counts()),
+        bytes_since(sizes, engine.minified_bytes()),
+    )
+
+
+async def run_pipeline(
+    sources: list[Path],
+    out_dir: Path,
+    options: BuildOptions,
+    jobs: int | None = None,
+    io_concurrency: int = DEFAULT_IO_CONCURRENCY,
+    queue_size: int | None = None,
+    incremental: bool = True,
+    strict: bool = False,
+    cache: ParseCache | None = None,
+    latency: float = 0.0,
+    on_result: Callable[[BuildResult], None] | None = None,
+) -> PipelineStats:
+    """Build every source, calling ``on_result`` for each as it finishes.
+
+    Results arrive in completion order. ``queue_size`` defaults to twice
+    ``jobs``. The output directory's manifest is used and updated as in
+    ``build_many``.
+    """
+    jobs = jobs or default_jobs()
+    queue_size = queue_size or 2 * jobs
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest.load(out_dir)
+    fingerprint = _render.default_engine().fingerprint_for(options.font_source, options.fit)
+    stats = PipelineStats(files=len(sources), queue_size=queue_size)
+    to_render: asyncio.Queue = asyncio.Queue(queue_size)
+    to_write: asyncio.Queue = asyncio.Queue(queue_size)
+    pending = zip(sources, output_paths(sources, out_dir))
+    loop = asyncio.get_running_loop()
+
+    def finish(result: BuildResult, status: str, error: str = "") -> None:
+        result.status = status
+        if error:
+            result.error = error
+            result.entry = None
+        stats.counts[status] += 1
+        _record(manifest, result)
+        if on_result is not None:
+            on_result(result)
+
+    async def read() -> None:
+        for source, out in pending:
+            result = BuildResult(source=source, out=out)
+            timer = StageTimer()
+            result.stages = timer.stages
+            start = time.perf_counter()
+            try:
+                with timer.stage("read"):
+                    if latency:
+                        await asyncio.sleep(latency)
+                    raw = await asyncio.to_thread(source.read_bytes)
+                with timer.stage("manifest"):
+                    digest = content_digest(raw)
+                    entry = make_entry(source, digest, options, fingerprint)
+                    previous = manifest.get(result.out) if incremental else None
+                    current = is_current(previous, entry, result.out)
+            except OSError as e:
+                finish(result, FAILED, f"{type(e).__name__}: {e}")
+                continue
+            stats.bytes_read += len(raw)
+            result.entry = entry
+            result.seconds = time.perf_counter() - start
+            if current:
+                result.profile_type = entry["profile"] = previous.get("profile", "")
+                finish(result, SKIPPED)
+                continue
+            await to_render.put((result, raw, digest))
+            stats.observe("render", to_render)
+
+    async def render(executor: Executor) -> None:
+        while (item := await to_render.get()) is not None:
+            result, raw, digest = item
+            start = time.perf_counter()
+            try:
+                html, profile_type, stages, result.fragments, result.minified = await loop.run_in_executor(
+                    executor, render_text, raw, digest, options, strict, cache
+                )
+            except Exception as e:  # noqa: BLE001 - one bad file must not stop the batch
+                finish(result, FAILED, f"{type(e).__name__}: {e}")
+                continue
+            finally:
+                result.seconds += time.perf_counter() - start
+            result.stages.update(stages)
+            result.profile_type = result.entry["profile"] = profile_type
+            await to_write.put((result, html))
+            stats.observe("write", to_write)
+
+    async def write() -> None:
+        while (item := await to_write.get()) is not None:
+            result, html = item
+            start = time.perf_counter()
+            try:
+                if latency:
+                    await asyncio.sleep(latency)
+                result.out.parent.mkdir(parents=True, exist_ok=True)
+                written = await asyncio.to_thread(stream_if_changed, result.out, [html])
+            except OSError as e:
+                finish(result, FAILED, f"{type(e).__name__}: {e}")
+                continue
+            finally:
+                elapsed = time.perf_counter() - start
+                result.seconds += elapsed
+                result.stages["write"] = elapsed
+            if written:
+                stats.bytes_written += len(html.encode("utf-8"))
+            finish(result, WRITTEN if written else UNCHANGED)
+
+    if jobs == 1:
+        _init_worker()
+        executor: Executor = ThreadPoolExecutor(max_workers=1)
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker)
+    start = time.perf_counter()
+    readers = [asyncio.create_task(read()) for _ in range(io_concurrency)]
+    renderers = [asyncio.create_task(render(executor)) for _ in range(jobs)]
+    writers = [asyncio.create_task(write()) for _ in range(io_concurrency)]
+    try:
+        await asyncio.gather(*readers)
+        for _ in renderers:
+            await to_render.put(None)
+        await asyncio.gather(*renderers)
+        for _ in writers:
+            await to_write.put(None)
+        await asyncio.gather(*writers)
+    finally:
+        for task in (*readers, *renderers, *writers):
+            task.cancel()
+        executor.shutdown(cancel_futures=True)
+        manifest.save()
+        stats.elapsed = time.perf_counter() - start
+    return stats
@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
+import hashlib
+import secrets
+import threading
+import time
 from collections import OrderedDict
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Hashable, Iterator, Mapping, Sequence, TextIO
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment
 
+from . import __version__
+from .css import build_bundles, parse_css, serialize
+from .fit import FitResult, estimator_for, fit_sheet, glyph_widths
+from .fragments import DEFAULT_LINE_MAX_CHARS, ROW_BUILDERS, SECTION_KEYS, FragmentCache, section_args
+from .minify import Minifier
 from .model import CharacterModel
 from .parse import PROF_LABEL
+from .precompile import TEMPLATE_OPTIONS, TEMPLATES_DIR, template_loader, template_names
 from .profile import Profile
-from .spells import SPELL_DESCRIPTIONS
+from .spells import SpellDB, SpellResolver, default_db, read_aliases
+from .stream import slugify
+
+if TYPE_CHECKING:
+    from .fonts import FontSubsetter
+    from .timings import StageTimer
 
 ASSETS_DIR = Path(__file__).parent / "assets"
-TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Template output pieces joined per write when streaming to a file
+STREAM_BUFFER_CHUNKS = 64
+# Roster sheets rendered straight into the DOM; later ones are deferred
+ROSTER_EAGER_SHEETS = 2
 
 # Class features that are implied by the class/heritage and don't need to be shown
 IMPLIED_SPECIALS = {
@@ -60,11 +80,8 @@ FEAT_GROUP_ORDER = [
 ]
 
 
-def _load_css(filename: str) -> str:
-    path = ASSETS_DIR / filename
-    if path.exists():
-        return path.read_text(encoding="utf-8")
-    return ""
+def _untimed(_stage: str) -> nullcontext:
+    return nullcontext()
 
 
 def _fmt_mod(value: int) -> str:
@@ -97,6 +114,385 @@ def _group_feats(char: CharacterModel) -> OrderedDict[str, list]:
     return groups
 
 
+def _sheet_spell_names(char: CharacterModel) -> set[str]:
+    names = {fs.name for fs in char.focus_spells}
+    for caster in char.spellcasters:
+        for rank in caster.spells + caster.prepared:
+            names.update(rank.spells)
+    return names
+
+
+class OnePagerEngine:
+    """Warm rendering state: compiled template, CSS and spell descriptions.
+
+    Safe to share between threads; ``fragments``, ``lines`` and ``minifier``
+    are its only mutable parts. ``load_times`` holds the seconds each part of
+    ``__init__`` took.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path = TEMPLATES_DIR,
+        assets_dir: Path = ASSETS_DIR,
+        spell_descriptions: SpellDB | Mapping[str, str] | None = None,
+        spell_aliases: Mapping[str, str] | None = None,
+        compiled_templates: bool | None = None,
+        fragments: FragmentCache | None = None,
+        lines: FragmentCache | None = None,
+        fonts: FontSubsetter | None = None,
+        minifier: Minifier | None = None,
+    ) -> None:
+        self.load_times: dict[str, float] = {}
+        self.fragments = FragmentCache() if fragments is None else fragments
+        self.lines = FragmentCache(DEFAULT_LINE_MAX_CHARS) if lines is None else lines
+        self._fonts = fonts
+        self.minifier = Minifier() if minifier is None else minifier
+        self._local = threading.local()
+        # Stands in for the inline @font-face rules until the document is complete
+        self._font_marker = f"/*fonts-{secrets.token_hex(16)}*/"
+        start = time.perf_counter()
+        loader, self.compiled_templates = template_loader(templates_dir, compiled_templates)
+        env = Environment(loader=loader, **TEMPLATE_OPTIONS)
+        self._template = env.get_template("onepager.html.j2")
+        self._roster_template = env.get_template("roster.html.j2")
+        self._index_template = env.get_template("site_index.html.j2")
+        self._sections = env.get_template("_sections.html.j2").make_module(
+            dict(fmt_mod=_fmt_mod, fmt_bonus=_fmt_bonus, prof_label=_prof_label, lines=self._lines, **ROW_BUILDERS)
+        )
+        # Load the included partials now too, rather than on the first render
+        for name in template_names(templates_dir):
+            env.get_template(name)
+        start = self._loaded("load_templates" if self.compiled_templates else "compile_templates", start)
+
+        self._bundles = build_bundles(assets_dir)
+        self._roster_css = serialize(parse_css((assets_dir / "roster.css").read_text(encoding="utf-8")))
+        self._site_css = serialize(parse_css((assets_dir / "site.css").read_text(encoding="utf-8")))
+        start = self._loaded("build_css", start)
+        if spell_descriptions is None:
+            spell_descriptions = default_db()
+        elif not isinstance(spell_descriptions, SpellDB):
+            spell_descriptions = SpellDB.from_mapping(spell_descriptions)
+        if spell_aliases is None:
+            spell_aliases = read_aliases()
+        self.spells = SpellResolver(spell_descriptions, spell_aliases)
+        start = self._loaded("load_spells", start)
+        self.fingerprint = self._fingerprint(templates_dir)
+        self._loaded("fingerprint", start)
+
+    def _loaded(self, part: str, start: float) -> float:
+        now = time.perf_counter()
+        self.load_times[part] = now - start
+        return now
+
+    def _fingerprint(self, templates_dir: Path) -> str:
+        """Hash of everything besides the inputs that can change the output."""
+        digest = hashlib.sha256(__version__.encode())
+        for path in sorted(templates_dir.rglob("*.j2")):
+            digest.update(path.relative_to(templates_dir).as_posix().encode())
+            digest.update(path.read_bytes())
+        for key in sorted(self._bundles):
+            digest.update("/".join(key).encode())
+            digest.update(self._bundles[key].encode())
+        digest.update(self._roster_css.encode())
+        digest.update(self._site_css.encode())
+        digest.update(self.spells.digest.encode())
+        return digest.hexdigest()
+
+    @property
+    def fonts(self) -> FontSubsetter:
+        """The subsetter for ``font_source="inline"``, created on first use."""
+        if self._fonts is None:
+            from .fonts import FontSubsetter
+
+            self._fonts = FontSubsetter()
+        return self._fonts
+
+    def fingerprint_for(self, font_source: str = "google", fit: bool = False) -> str:
+        """``fingerprint`` plus the font files and glyph widths these options read."""
+        parts = [self.fingerprint]
+        if font_source == "inline":
+            parts.append(self.fonts.stamp)
+        if fit:
+            parts.append(glyph_widths().stamp)
+        if len(parts) == 1:
+            return self.fingerprint
+        return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+    def _inline_fonts(self, html: str) -> str:
+        """Replace the font marker with the fonts subsetted for the rest of the document."""
+        head, marker, rest = html.partition(self._font_marker)
+        if not marker:
+            return html
+        return head + self.fonts.css(rest) + rest
+
+    def _finish(self, html: str, context: dict, stage: Callable = _untimed) -> str:
+        """Post-process a complete document: inline its fonts, then prune and minify it."""
+        if context["font_css"]:
+            with stage("fonts"):
+                html = self._inline_fonts(html)
+        if context["minify"]:
+            with stage("minify"):
+                html = self.minifier.minify(html, context["css"])
+        return html
+
+    @staticmethod
+    def _buffered(options: dict) -> bool:
+        """Whether post-processing needs the whole document before any of it is written."""
+        return options.get("font_source") == "inline" or bool(options.get("minify"))
+
+    @property
+    def themes(self) -> list[str]:
+        return sorted({theme for theme, _page_size in self._bundles})
+
+    def css(self, theme: str = "default", page_size: str = "letter") -> str:
+        """The prebuilt stylesheet for a theme/page size (unknown values fall back)."""
+        css = self._bundles.get((theme, page_size))
+        if css is None:
+            css = self._bundles.get((theme, "letter")) or self._bundles.get(("default", page_size), "")
+        return css
+
+    def _sheet_context(self, char: CharacterModel, profile: Profile, max_skills: int = 8) -> dict:
+        """Template variables that differ per character."""
+        # Select top skills by modifier (trained+ only, then fill with best untrained)
+        trained = [s for s in char.skills if s.prof_rank > 0]
+        trained.sort(key=lambda s: (-s.modifier, s.name))
+        lores = sorted(char.lores, key=lambda s: (-s.modifier, s.name))
+        display_skills = trained + lores
+        if len(display_skills) < max_skills:
+            untrained = sorted(
+                [s for s in char.skills if s.prof_rank == 0],
+                key=lambda s: (-s.modifier, s.name),
+            )
+            display_skills.extend(untrained[: max_skills - len(display_skills)])
+
+        return dict(
+            char=char,
+            profile=profile,
+            display_skills=display_skills,
+            grouped_feats=_group_feats(char),
+            key_features=_filter_specials(char.specials, char.identity.heritage),
+            spell_desc=self.spells.lookup_many(_sheet_spell_names(char)),
+            scale=1.0,
+            spell_limit=None,
+        )
+
+    def _fit_sheet(
+        self,
+        sheet: dict,
+        page_size: str = "letter",
+        theme: str = "default",
+        include_prepared: bool = True,
+        **_options,
+    ) -> tuple[dict, FitResult]:
+        """Shrink and trim a sheet context until the layout estimate fits one page."""
+        result = self._local.fit = fit_sheet(estimator_for(self.css(theme, page_size)), sheet, include_prepared)
+        fitted = sheet | dict(scale=result.scale, spell_limit=result.spell_limit)
+        if result.skill_limit is not None:
+            fitted["display_skills"] = sheet["display_skills"][: result.skill_limit]
+        return fitted, result
+
+    @property
+    def last_fit(self) -> FitResult | None:
+        """The fit of the last sheet this thread rendered with ``fit=True``."""
+        return getattr(self._local, "fit", None)
+
+    def fit(self, char: CharacterModel, profile: Profile, max_skills: int = 8, **options) -> FitResult:
+        """The scale and limits ``fit=True`` would render ``char`` with."""
+        options.pop("fit", None)
+        return self._fit_sheet(self._sheet_context(char, profile, max_skills), **options)[1]
+
+    def _document_context(
+        self,
+        page_size: str = "letter",
+        theme: str = "default",
+        font_source: str = "google",
+        include_prepared: bool = True,
+        include_known: bool = False,
+        minify: bool = False,
+    ) -> dict:
+        """Template variables shared by every sheet in a document."""
+        return dict(
+            css=self.css(theme, page_size),
+            font_source=font_source,
+            font_css=self._font_marker if font_source == "inline" else "",
+            include_prepared=include_prepared,
+            include_known=include_known,
+            minify=minify,
+            fmt_mod=_fmt_mod,
+            fmt_bonus=_fmt_bonus,
+            prof_label=_prof_label,
+            part=self._part,
+            **ROW_BUILDERS,
+        )
+
+    def _lines(self, macro: str, rows: list[tuple]) -> str:
+        """The ``macro`` entry macro's output for each argument row, each cached in ``lines``."""
+        render = getattr(self._sections, macro)
+        keys = [(macro, *row) for row in rows]
+        return "".join(self.lines.get_many(keys, lambda key: str(render(*key[1:]))))
+
+    def _part(self, macro: str, *args: Hashable) -> str:
+        """The ``macro`` section macro's output for ``args``, cached in ``fragments``."""
+        render = getattr(self._sections, macro)
+        return self.fragments.get((macro, *args), lambda: str(render(*args)))
+
+    def fragment_counts(self) -> dict[str, tuple[int, int]]:
+        """``(hits, misses)`` so far per cache: sections, lines, and fonts and stylesheets once used."""
+        counts = {
+            "sections": (self.fragments.hits, self.fragments.misses),
+            "lines": (self.lines.hits, self.lines.misses),
+        }
+        if self._fonts is not None:
+            counts["fonts"] = (self._fonts.hits, self._fonts.misses)
+        if self.minifier.hits or self.minifier.misses:
+            counts["css"] = (self.minifier.hits, self.minifier.misses)
+        return counts
+
+    def minified_bytes(self) -> tuple[int, int]:
+        """UTF-8 bytes of the documents ``minify=True`` shrank so far, before and after."""
+        return self.minifier.bytes_in, self.minifier.bytes_out
+
+    def _fragment(self, sheet: dict) -> Callable[[str], str]:
+        """The ``fragment(section_id)`` function ``_sheet.html.j2`` renders sections with."""
+        def fragment(section_id: str) -> str:
+            key = SECTION_KEYS.get(section_id)
+            if key is None:
+                return ""
+            macro = getattr(self._sections, section_id)
+            return self.fragments.get((section_id, key(sheet)), lambda: str(macro(*section_args(section_id, sheet))))
+
+        return fragment
+
+    def _context(
+        self,
+        char: CharacterModel,
+        profile: Profile,
+        max_skills: int = 8,
+        fit: bool = False,
+        stage: Callable = _untimed,
+        **options,
+    ) -> dict:
+        with stage("context"):
+            sheet = self._sheet_context(char, profile, max_skills)
+        if fit:
+            with stage("fit"):
+                sheet, _result = self._fit_sheet(sheet, **options)
+        context = self._document_context(**options) | sheet
+        context["fragment"] = self._fragment(context)
+        return context
+
+    def render(self, char: CharacterModel, profile: Profile, timer: StageTimer | None = None, **options) -> str:
+        """The whole document as one string, with its stages recorded on ``timer`` if given."""
+        stage = _untimed if timer is None else timer.stage
+        context = self._context(char, profile, stage=stage, **options)
+        with stage("render"):
+            html = self._template.render(context)
+        return self._finish(html, context, stage)
+
+    def generate(
+        self, char: CharacterModel, profile: Profile, timer: StageTimer | None = None, **options
+    ) -> Iterator[str]:
+        """Yield the document in chunks; in one chunk with inline fonts or ``minify``."""
+        if self._buffered(options):
+            return iter([self.render(char, profile, timer=timer, **options)])
+        stage = _untimed if timer is None else timer.stage
+        return self._template.generate(self._context(char, profile, stage=stage, **options))
+
+    def render_to(
+        self, fp: TextIO, char: CharacterModel, profile: Profile, timer: StageTimer | None = None, **options
+    ) -> None:
+        """Write the document to ``fp`` as it is rendered."""
+        if self._buffered(options):
+            fp.write(self.render(char, profile, timer=timer, **options))
+            return
+        stage = _untimed if timer is None else timer.stage
+        stream = self._template.stream(self._context(char, profile, stage=stage, **options))
+        stream.enable_buffering(STREAM_BUFFER_CHUNKS)
+        stream.dump(fp)
+
+    def generate_roster(
+        self,
+        sheets: Sequence[tuple[CharacterModel, Profile]],
+        max_skills: int = 8,
+        lazy: bool = True,
+        fit: bool = False,
+        **options,
+    ) -> Iterator[str]:
+        """Yield one HTML document holding every sheet, with a jump index.
+
+        With ``lazy``, sheets after the first ``ROSTER_EAGER_SHEETS`` are
+        deferred in ``<template>`` elements until scrolled near or printed.
+        """
+        anchors = []
+        used: set[str] = set()
+        for char, _profile in sheets:
+            stem = f"sheet-{slugify(char.identity.name)}"
+            anchor, n = stem, 1
+            while anchor in used:
+                n += 1
+                anchor = f"{stem}-{n}"
+            used.add(anchor)
+            anchors.append(anchor)
+
+        index = [
+            dict(
+                anchor=anchor,
+                name=char.identity.name,
+                summary=f"Level {char.identity.level} {char.identity.char_class}",
+            )
+            for (char, _profile), anchor in zip(sheets, anchors)
+        ]
+        context = self._document_context(**options)
+        context["css"] += self._roster_css
+
+        def sheet_context(char: CharacterModel, profile: Profile) -> dict:
+            sheet = self._sheet_context(char, profile, max_skills)
+            if fit:
+                sheet = self._fit_sheet(sheet, **options)[0]
+            sheet["fragment"] = self._fragment(sheet | dict(include_prepared=context["include_prepared"]))
+            return sheet
+
+        entries = (
+            sheet_context(char, profile) | dict(anchor=anchor, deferred=lazy and n >= ROSTER_EAGER_SHEETS)
+            for n, ((char, profile), anchor) in enumerate(zip(sheets, anchors))
+        )
+        title = f"Roster — {len(sheets)} character{'s' if len(sheets) != 1 else ''}"
+        chunks = self._roster_template.generate(context, title=title, index=index, sheets=entries)
+        if context["font_css"] or context["minify"]:
+            return iter([self._finish("".join(chunks), context)])
+        return chunks
+
+    def render_index(
+        self,
+        entries: Sequence[Mapping[str, object]],
+        title: str = "Characters",
+        page_size: str = "letter",
+        theme: str = "default",
+        font_source: str = "google",
+        minify: bool = False,
+        **_options,
+    ) -> str:
+        """The static-site index page; entries hold ``href``, ``name``, ``char_class``, ``level``, ``ancestry``."""
+        context = self._document_context(page_size=page_size, theme=theme, font_source=font_source, minify=minify)
+        context["css"] += self._site_css
+        html = self._index_template.render(context, title=title, entries=entries)
+        return self._finish(html, context)
+
+
+_default_engine: OnePagerEngine | None = None
+_default_engine_lock = threading.Lock()
+
+
+def default_engine() -> OnePagerEngine:
+    """Return the process-wide engine, creating it on first use."""
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = OnePagerEngine()
+    return _default_engine
+
+
 def render(
     char: CharacterModel,
     profile: Profile,
@@ -106,52 +502,22 @@ def render(
     max_skills: int = 8,
     include_prepared: bool = True,
     include_known: bool = False,
+    fit: bool = False,
+    minify: bool = False,
 ) -> str:
-    base_css = _load_css("base.css")
-    print_css = _load_css("print.css")
-    theme_css = _load_css(f"themes/{theme}.css")
-
-    if page_size == "a4":
-        print_css = print_css.replace("size: letter;", "size: A4;")
-
-    # Select top skills by modifier (trained+ only, then fill with best untrained)
-    trained = [s for s in char.skills if s.prof_rank > 0]
-    trained.sort(key=lambda s: (-s.modifier, s.name))
-    lores = sorted(char.lores, key=lambda s: (-s.modifier, s.name))
-    display_skills = trained + lores
-    if len(display_skills) < max_skills:
-        untrained = sorted(
-            [s for s in char.skills if s.prof_rank == 0],
-            key=lambda s: (-s.modifier, s.name),
-        )
-        display_skills.extend(untrained[: max_skills - len(display_skills)])
-
-    grouped_feats = _group_feats(char)
-    key_features = _filter_specials(char.specials, char.identity.heritage)
-
-    env = Environment(
-        loader=FileSystemLoader(str(TEMPLATES_DIR)),
-        autoescape=False,
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-    template = env.get_template("onepager.html.j2")
-
-    html = template.render(
+    return default_engine().render(
         char=char,
         profile=profile,
-        base_css=base_css,
-        print_css=print_css,
-        theme_css=theme_css,
+        page_size=page_size,
+        theme=theme,
         font_source=font_source,
-        display_skills=display_skills,
-        grouped_feats=grouped_feats,
+        max_skills=max_skills,
         include_prepared=include_prepared,
         include_known=include_known,
-        key_features=key_features,
-        spell_desc=SPELL_DESCRIPTIONS,
-        fmt_mod=_fmt_mod,
-        fmt_bonus=_fmt_bonus,
-        prof_label=_prof_label,
+        fit=fit,
+        minify=minify,
     )
-    return html
+
+
+def render_to(fp: TextIO, char: CharacterModel, profile: Profile, **options) -> None:
+    default_engine().render_to(fp, char, profile, **options)
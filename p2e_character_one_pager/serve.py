@@ -0,0 +1,198 @@
+"""Long-lived local HTTP service that renders POSTed Pathbuilder JSON.
+
+``POST /render`` with the export as the request body returns the one-pager
+HTML. Rendering options are passed as query parameters using the same names
+as the ``build`` flags (``theme``, ``page-size``, ``profile``, ``skills``,
+``include-prepared``, ``include-known``, ``font-source``).
+
+Responses carry an ``ETag`` derived from the request body, the effective
+options and the engine's template/CSS (and inlined font) fingerprint, so a
+client that sends ``If-None-Match`` gets ``304 Not Modified`` without the
+sheet being parsed or rendered again.
+
+A body that cannot be parsed gets ``400``; any other failure while rendering
+gets ``500`` and is logged, and the server keeps serving.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .manifest import options_digest
+from .options import BuildOptions
+from .parse import parse_build, unwrap_build
+from .profile import classify
+from .render import OnePagerEngine, default_engine
+
+RENDER_PATHS = ("/", "/render")
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def _flag(value: str, name: str) -> bool:
+    lowered = value.lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"{name} must be true or false (got {value!r})")
+
+
+def options_from_query(query: str) -> BuildOptions:
+    """Build validated BuildOptions from a URL query string."""
+    params = {k.replace("_", "-"): v[-1] for k, v in parse_qs(query).items()}
+    kwargs: dict = {}
+    if "page-size" in params:
+        kwargs["page_size"] = params["page-size"]
+    if "theme" in params:
+        kwargs["theme"] = params["theme"]
+    if "profile" in params:
+        kwargs["profile_override"] = params["profile"]
+    if "font-source" in params:
+        kwargs["font_source"] = params["font-source"]
+    if "skills" in params:
+        try:
+            kwargs["max_skills"] = int(params["skills"])
+        except ValueError:
+            raise ValueError(f"skills must be an integer (got {params['skills']!r})") from None
+    for flag in ("include-prepared", "include-known", "fit", "minify"):
+        if flag in params:
+            kwargs[flag.replace("-", "_")] = _flag(params[flag], flag)
+    options = BuildOptions(**kwargs)
+    options.validate()
+    return options
+
+
+def compute_etag(body: bytes, options: BuildOptions, render_fingerprint: str = "") -> str:
+    digest = hashlib.sha256(body)
+    digest.update(options_digest(options).encode())
+    digest.update(render_fingerprint.encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], engine: OnePagerEngine | None = None) -> None:
+        super().__init__(address, RenderHandler)
+        self.engine = engine or default_engine()
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server: RenderServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == "/health":
+            self._send(HTTPStatus.OK, b"ok\n", "text/plain; charset=utf-8")
+        else:
+            self._error(HTTPStatus.NOT_FOUND, "POST Pathbuilder JSON to /render")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path not in RENDER_PATHS:
+            self._error(HTTPStatus.NOT_FOUND, f"unknown path {url.path}")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = None
+        # The body is left unread, so the connection cannot carry another request
+        if length is None:
+            self.close_connection = True
+            self._error(HTTPStatus.LENGTH_REQUIRED, "Content-Length is required")
+            return
+        if length < 0:
+            self.close_connection = True
+            self._error(HTTPStatus.BAD_REQUEST, "Content-Length must not be negative")
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"body exceeds {MAX_BODY_BYTES} bytes")
+            return
+        body = self.rfile.read(length)
+
+        try:
+            options = options_from_query(url.query)
+            # Fails for font-source=inline if the fonts are not installed
+            fingerprint = self.server.engine.fingerprint_for(options.font_source, options.fit)
+        except ValueError as e:
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        etag = compute_etag(body, options, fingerprint)
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self._send(HTTPStatus.NOT_MODIFIED, b"", None, etag=etag)
+            return
+
+        try:
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            char = parse_build(unwrap_build(data))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._error(HTTPStatus.BAD_REQUEST, f"Error parsing request body: {e}")
+            return
+        except Exception as e:  # noqa: BLE001 - one bad sheet must not take the service down
+            self._internal_error(e)
+            return
+
+        try:
+            profile = classify(char, override=options.profile_override)
+            html = self.server.engine.render(char=char, profile=profile, **options.render_kwargs())
+        except Exception as e:  # noqa: BLE001
+            self._internal_error(e)
+            return
+        self._send(
+            HTTPStatus.OK,
+            html.encode("utf-8"),
+            "text/html; charset=utf-8",
+            etag=etag,
+            extra={"X-Profile": profile.profile_type},
+        )
+
+    def _internal_error(self, error: Exception) -> None:
+        self.log_error("Error rendering %s: %s: %s", self.path, type(error).__name__, error)
+        self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "Error rendering the sheet")
+
+    def _error(self, status: HTTPStatus, message: str) -> None:
+        self._send(status, f"{message}\n".encode("utf-8"), "text/plain; charset=utf-8")
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        payload: bytes,
+        content_type: str | None,
+        etag: str | None = None,
+        extra: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8000, engine: OnePagerEngine | None = None) -> RenderServer:
+    """Create a server bound to ``host:port`` (port 0 picks a free port)."""
+    return RenderServer((host, port), engine=engine)
@@ -1,56 +1,443 @@
-"""Brief spell descriptions for PF2e spells."""
-
-SPELL_DESCRIPTIONS: dict[str, str] = {
-    # Arcane Cantrips
-    "Detect Magic": "Sense magical auras in a 30-foot emanation.",
-    "Electric Arc": "Zap one or two creatures within 30 ft for 1d4+ability electricity damage (basic Reflex).",
-    "Light": "Make an object glow as bright as a torch for 1 hour.",
-    "Message": "Whisper a message to a creature within 120 ft that only the target can hear.",
-    "Prestidigitation": "Perform a minor magical trick — cook, lift, clean, make sounds, etc.",
-    "Read Aura": "Detect whether an object is magical and determine its school.",
-    "Shield": "Raise a magical shield granting +1 AC. Can Shield Block for 5 damage.",
-    "Telekinetic Hand": "Remotely manipulate a small unattended object within 30 ft.",
-    "Telekinetic Projectile": "Hurl a loose object at a creature for 1d6+ability bludgeoning, piercing, or slashing.",
-
-    # Arcane Rank 1
-    "Charm": "A creature within 30 ft becomes friendly to you (Will save). Hostile creatures are immune.",
-    "Command": "Speak a one-word command a creature must obey on its turn (Will save).",
-    "Fear": "Frighten a creature within 30 ft (Will save). Frightened 1, or 2 on crit fail; fleeing on crit fail.",
-    "Grease": "Coat a 4-square area in grease. Creatures must balance (Reflex) or fall prone.",
-    "Illusory Object": "Create a visual illusion of an object up to 20-ft cube within 500 ft.",
-    "Leaden Steps": "Impede a creature's movement — 10-ft status penalty to Speed (Fort save).",
-    "Mystic Armor": "Ward yourself with magical force, gaining a +1 item bonus to AC (like Mage Armor).",
-
-    # Arcane Rank 2
-    "Blur": "Target becomes concealed (20% miss chance) for 1 minute.",
-    "Dispel Magic": "Counteract a spell effect. Counteract check vs the spell's DC.",
-    "Invisibility": "Target becomes invisible for 10 minutes or until it takes a hostile action.",
-    "Laughing Fit": "Target is overcome with laughter — slowed 1 (Will save). Crit fail: prone and slowed.",
-    "Resist Energy": "Grant resistance 5 to one energy type (acid, cold, electricity, fire, sonic) for 10 min.",
-    "Stupefy": "Dull a creature's mind — clumsy 1 and stupefied 1 (Will save).",
-    "Sudden Bolt": "A bolt of lightning strikes a creature for 4d12 electricity (basic Reflex).",
-    "Telekinetic Maneuver": "Perform a Disarm, Shove, or Trip using spell attack vs target's Fortitude DC.",
-
-    # Arcane Rank 3
-    "Fireball": "A 20-ft burst within 500 ft deals 6d6 fire damage (basic Reflex).",
-    "Haste": "Target gains quickened 1 for 1 minute — extra action for Strike or Stride.",
-    "Lightning Bolt": "A 120-ft line of lightning deals 4d12 electricity (basic Reflex).",
-    "Slow": "Slow a creature — it becomes slowed 1 for 1 minute (Fort save).",
-
-    # Arcane Rank 4
-    "Containment": "Trap a creature in a magical prison — they can't leave a 10-ft emanation (Will save).",
-    "Translocate": "Teleport yourself up to 120 ft to a location you can see.",
-    "Wall of Fire": "Create a 60-ft line of fire. Passing through deals 4d6 fire; adjacent takes 1d6.",
-
-    # Divine Cantrips
-    "Guidance": "Grant a creature +1 status bonus to one attack, Perception, save, or skill check.",
-    "Stabilize": "Stabilize a dying creature within 30 ft — stops dying but remains unconscious.",
-
-    # Divine Spells
-    "Heal": "Restore 1d8 HP per rank to a living target, or damage undead. 1-action touch, 2-action 30 ft ranged, 3-action 30 ft emanation.",
-    "Bless": "30-ft emanation centered on you grants +1 status bonus to attack rolls for allies.",
-
-    # Focus Spells
-    "Hand of the Apprentice": "Hurl your melee weapon at a target within 500 ft using a spell attack roll, dealing weapon damage.",
-    "Interdisciplinary Incantation": "Cast a non-arcane spell from another tradition's list that you have in your spellbook.",
-}
+"""Indexed spell description database.
+
+Descriptions are kept out of Python source. ``data/spells.tsv`` is the
+editable source list, and ``spells compile`` turns it into ``data/spells.idx``,
+a sorted key/offset table that is memory-mapped and binary-searched by
+normalized spell name. Nothing is read until a lookup touches it. Worker
+processes share the mapped pages instead of each holding its own copy of the
+catalog.
+
+Pathbuilder names don't always match the catalog: legacy names from before the
+remaster ("Magic Missile" vs "Force Barrage"), odd casing or punctuation, and
+small spelling slips. ``SpellResolver`` handles these. It normalizes names,
+applies the legacy/remaster alias table in ``data/spell_aliases.tsv``, and
+falls back to a trigram index for fuzzy matches. Results are memoized, so a
+batch run resolves each distinct name once per process.
+
+Index layout (little-endian)::
+
+    header   magic "P2SPELL1", entry count (u32), key version (u32)
+    table    per entry: blob offset (u32), key length (u16),
+             name length (u16), description length (u32); sorted by key
+    blob     per entry: key | display name | description, UTF-8
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping
+
+DATA_DIR = Path(__file__).parent / "data"
+SPELL_SOURCE = DATA_DIR / "spells.tsv"
+SPELL_INDEX = DATA_DIR / "spells.idx"
+SPELL_ALIASES = DATA_DIR / "spell_aliases.tsv"
+
+_MAGIC = b"P2SPELL1"
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<IHHI")
+# Bump whenever normalize_name changes, so indexes with stale keys are rejected
+KEY_VERSION = 2
+
+# Fuzzy matching: the trigram index proposes the FUZZY_CANDIDATES keys with the
+# best Dice score (at least FUZZY_MIN_SCORE). A name may be at most
+# FUZZY_MAX_EDIT_RATIO of its length, and at most FUZZY_MAX_EDITS, in typos
+# (inserts, deletes, substitutions or swaps) from a candidate: none up to 5
+# characters, one from 6. The match is used only if exactly one candidate is
+# that close. Short names are real spells more often than typos (Harm is not
+# Charm, Seal is not Heal), and so are longer ones two letters apart, like
+# Telekinetic Haul/Hand.
+FUZZY_MIN_SCORE = 0.3
+FUZZY_CANDIDATES = 5
+FUZZY_MAX_EDIT_RATIO = 1 / 6
+FUZZY_MAX_EDITS = 1
+RESOLVE_CACHE_SIZE = 1 << 16
+
+_APOSTROPHES = str.maketrans("", "", "'’‘`")
+_NON_WORD = re.compile(r"[\W_]+")
+_QUALIFIER = re.compile(r"\s*[(\[][^)\]]*[)\]]")
+
+
+def normalize_name(name: str) -> str:
+    """Lookup key for a spell name.
+
+    Accents and apostrophes are dropped, everything is case-folded, and any run
+    of punctuation or whitespace becomes one space, so "Hand-of-the Apprentice"
+    and "hand of the apprentice" share a key.
+    """
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.translate(_APOSTROPHES).casefold()
+    return " ".join(filter(None, _NON_WORD.split(text)))
+
+
+def read_source(path: Path) -> list[tuple[str, str]]:
+    """Read ``(name, description)`` pairs from a TSV or JSON source list.
+
+    TSV lines are ``<name><TAB><description>``; blank lines and lines starting
+    with ``#`` are ignored. JSON may be a ``{name: description}`` object or a
+    list of ``{"name": ..., "description": ...}`` objects.
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return [(str(k), str(v)) for k, v in data.items()]
+        return [(str(d["name"]), str(d["description"])) for d in data]
+
+    entries = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        name, sep, description = line.partition("\t")
+        if not sep:
+            raise ValueError(f"{path}:{lineno}: expected <name><TAB><description>")
+        entries.append((name.strip(), description.strip()))
+    return entries
+
+
+def compile_index(entries: Iterable[tuple[str, str]]) -> bytes:
+    """Build the binary index for ``(name, description)`` pairs."""
+    records: dict[bytes, tuple[bytes, bytes]] = {}
+    for name, description in entries:
+        key = normalize_name(name).encode("utf-8")
+        if not key:
+            raise ValueError("empty spell name")
+        if key in records:
+            raise ValueError(f"duplicate spell name: {name!r}")
+        records[key] = (name.encode("utf-8"), description.encode("utf-8"))
+
+    table = bytearray(_HEADER.pack(_MAGIC, len(records), KEY_VERSION))
+    blob = bytearray()
+    offset = _HEADER.size + len(records) * _ENTRY.size
+    for key in sorted(records):
+        name, description = records[key]
+        table += _ENTRY.pack(offset + len(blob), len(key), len(name), len(description))
+        blob += key + name + description
+    return bytes(table + blob)
+
+
+def compile_file(source: Path = SPELL_SOURCE, out: Path = SPELL_INDEX) -> int:
+    """Compile a source list into an index file; returns the number of spells.
+
+    The file is replaced atomically so processes that have the old index
+    mapped keep a consistent view.
+    """
+    data = compile_index(read_source(source))
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, out)
+    return _HEADER.unpack_from(data)[1]
+
+
+class SpellDB:
+    """Read-only view over a compiled index held in ``bytes`` or an ``mmap``."""
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        magic, count, key_version = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError("not a spell index (bad magic)")
+        if key_version != KEY_VERSION:
+            raise ValueError("spell index was compiled by another version; run `spells compile`")
+        self._buf = buffer
+        self._count = count
+        self._digest: str | None = None
+
+    @classmethod
+    def open(cls, path: Path = SPELL_INDEX) -> SpellDB:
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_mapping(cls, descriptions: Mapping[str, str]) -> SpellDB:
+        return cls(compile_index(descriptions.items()))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._buf, _HEADER.size + i * _ENTRY.size)
+
+    def _key(self, i: int) -> bytes:
+        offset, key_len, _name_len, _desc_len = self._entry(i)
+        return self._buf[offset : offset + key_len]
+
+    def _search(self, key: bytes, lo: int = 0) -> int:
+        """Index of the first entry whose key is >= ``key``, starting at ``lo``."""
+        hi = self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def description_at(self, i: int) -> str:
+        offset, key_len, name_len, desc_len = self._entry(i)
+        start = offset + key_len + name_len
+        return self._buf[start : start + desc_len].decode("utf-8")
+
+    def find_key(self, key: str) -> int:
+        """Entry number for an already-normalized key, or -1."""
+        raw = key.encode("utf-8")
+        i = self._search(raw)
+        return i if i < self._count and self._key(i) == raw else -1
+
+    def key_at(self, i: int) -> str:
+        return self._key(i).decode("utf-8")
+
+    def name_at(self, i: int) -> str:
+        offset, key_len, name_len, _desc_len = self._entry(i)
+        return self._buf[offset + key_len : offset + key_len + name_len].decode("utf-8")
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        i = self.find_key(normalize_name(name))
+        return self.description_at(i) if i >= 0 else default
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name) is not None
+
+    def lookup_many(self, names: Iterable[str]) -> dict[str, str]:
+        """Descriptions for every name in ``names`` that is in the index.
+
+        Keys are the names exactly as given. The lookups are sorted and resolved
+        in one forward pass, so each binary search starts where the last ended.
+        """
+        by_key: dict[bytes, list[str]] = {}
+        for name in names:
+            by_key.setdefault(normalize_name(name).encode("utf-8"), []).append(name)
+        found: dict[str, str] = {}
+        lo = 0
+        for key in sorted(by_key):
+            lo = self._search(key, lo)
+            if lo == self._count:
+                break
+            if self._key(lo) == key:
+                description = self.description_at(lo)
+                for name in by_key[key]:
+                    found[name] = description
+        return found
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """``(display name, description)`` pairs in index order."""
+        for i in range(self._count):
+            yield self.name_at(i), self.description_at(i)
+
+    def names(self) -> list[str]:
+        return [name for name, _description in self.items()]
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the index, for render fingerprints."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._buf).hexdigest()
+        return self._digest
+
+
+def read_aliases(path: Path = SPELL_ALIASES) -> dict[str, str]:
+    """Normalized ``{legacy name: remaster name}`` from a two-column TSV."""
+    return {normalize_name(old): normalize_name(new) for old, new in read_source(path)}
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Typos (insert, delete, substitute, swap) between ``a`` and ``b``, capped at ``limit + 1``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous: list[int] = []
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, row = previous, row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+    return min(row[-1], limit + 1)
+
+
+class SpellResolver:
+    """Maps names as written on a sheet to entries in a ``SpellDB``.
+
+    Resolution order: the normalized name; the alias table (legacy → remaster,
+    then the reverse); the name without a parenthesized qualifier such as
+    "(Amped)"; and finally a fuzzy match against the trigram index. The
+    trigram index is built once, on the first name that needs it.
+    """
+
+    def __init__(
+        self,
+        db: SpellDB,
+        aliases: Mapping[str, str] | None = None,
+        min_score: float = FUZZY_MIN_SCORE,
+    ) -> None:
+        self.db = db
+        self.aliases = {normalize_name(k): normalize_name(v) for k, v in (aliases or {}).items()}
+        # Several legacy spells can share a remaster name (Remove Disease and
+        # Neutralize Poison are both Cleanse Affliction)
+        self._reverse: dict[str, list[str]] = {}
+        for old, new in self.aliases.items():
+            self._reverse.setdefault(new, []).append(old)
+        self.min_score = min_score
+        self._cache: dict[str, int] = {}
+        self._grams: dict[str, list[int]] | None = None
+        self._gram_counts: list[int] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def digest(self) -> str:
+        """Hash of everything that decides matches: index, aliases and fuzzy settings."""
+        payload = json.dumps(
+            [
+                self.db.digest,
+                sorted(self.aliases.items()),
+                self.min_score,
+                FUZZY_CANDIDATES,
+                FUZZY_MAX_EDIT_RATIO,
+                FUZZY_MAX_EDITS,
+                KEY_VERSION,
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _direct(self, key: str) -> int:
+        i = self.db.find_key(key)
+        if i < 0 and key in self.aliases:
+            i = self.db.find_key(self.aliases[key])
+        if i < 0:
+            for old in self._reverse.get(key, ()):
+                i = self.db.find_key(old)
+                if i >= 0:
+                    break
+        return i
+
+    def _trigram_index(self) -> dict[str, list[int]]:
+        with self._lock:
+            if self._grams is None:
+                grams: dict[str, list[int]] = {}
+                counts = []
+                for i in range(len(self.db)):
+                    key_grams = _trigrams(self.db.key_at(i))
+                    counts.append(len(key_grams))
+                    for gram in key_grams:
+                        grams.setdefault(gram, []).append(i)
+                self._gram_counts = counts
+                self._grams = grams
+        return self._grams
+
+    def _fuzzy(self, key: str) -> int:
+        max_edits = min(int(len(key) * FUZZY_MAX_EDIT_RATIO), FUZZY_MAX_EDITS)
+        if not max_edits or not len(self.db):
+            return -1
+        grams = self._trigram_index()
+        query = _trigrams(key)
+        shared = Counter(i for gram in query for i in grams.get(gram, ()))
+        scored = []
+        for i, n in shared.items():
+            score = 2 * n / (len(query) + self._gram_counts[i])  # Dice coefficient
+            if score >= self.min_score:
+                scored.append((-score, i))
+        close = [
+            i
+            for _score, i in sorted(scored)[:FUZZY_CANDIDATES]
+            if _edit_distance(key, self.db.key_at(i), max_edits) <= max_edits
+        ]
+        # Two spells equally plausible: better no description than the wrong one
+        return close[0] if len(close) == 1 else -1
+
+    def resolve_index(self, name: str) -> int:
+        """Entry number for ``name``, or -1 if nothing matches."""
+        cached = self._cache.get(name)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        key = normalize_name(name)
+        i = self._direct(key)
+        if i < 0:
+            bare = normalize_name(_QUALIFIER.sub("", name))
+            if bare and bare != key:
+                i = self._direct(bare)
+        if i < 0:
+            i = self._fuzzy(key)
+        if len(self._cache) >= RESOLVE_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[name] = i
+        return i
+
+    def resolve(self, name: str) -> str | None:
+        """Catalog name that ``name`` refers to, or None."""
+        i = self.resolve_index(name)
+        return self.db.name_at(i) if i >= 0 else None
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        i = self.resolve_index(name)
+        return self.db.description_at(i) if i >= 0 else default
+
+    def lookup_many(self, names: Iterable[str]) -> dict[str, str]:
+        """Descriptions keyed by each name exactly as given; unresolved names are left out."""
+        found = {}
+        for name in set(names):
+            i = self.resolve_index(name)
+            if i >= 0:
+                found[name] = self.db.description_at(i)
+        return found
+
+
+_default_db: SpellDB | None = None
+_default_db_lock = threading.Lock()
+
+
+def default_db() -> SpellDB:
+    """Return the process-wide spell database, opening it on first use.
+
+    Falls back to compiling the source list in memory when the index is missing
+    or was compiled with a different key version.
+    """
+    global _default_db
+    if _default_db is None:
+        with _default_db_lock:
+            if _default_db is None:
+                try:
+                    _default_db = SpellDB.open(SPELL_INDEX)
+                except (FileNotFoundError, ValueError):
+                    _default_db = SpellDB(compile_index(read_source(SPELL_SOURCE)))
+    return _default_db
+
+
+def default_resolver() -> SpellResolver:
+    """A resolver over ``default_db()`` with the packaged alias table."""
+    return SpellResolver(default_db(), read_aliases())
+
+
+_spell_descriptions: Mapping[str, str] | None = None
+
+
+def __getattr__(name: str) -> Mapping[str, str]:
+    # SPELL_DESCRIPTIONS used to be a dict literal in this module. It is kept
+    # for existing imports as a read-only {name: description} copy of
+    # default_db(), built on first access.
+    global _spell_descriptions
+    if name == "SPELL_DESCRIPTIONS":
+        if _spell_descriptions is None:
+            _spell_descriptions = MappingProxyType(dict(default_db().items()))
+        return _spell_descriptions
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
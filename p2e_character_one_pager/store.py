@@ -0,0 +1,412 @@
+"""Columnar roster store: a few numbers per character, queryable without parsing.
+
+``index`` parses each export once and appends one row per character to a
+store directory. Every column lives in its own file of native int32s
+(``array('i')``), so a query reads only the columns it touches. String
+columns hold codes into a dictionary file with one JSON string per line.
+``meta.json`` records how many rows, and how many dictionary bytes, are
+committed. It is replaced last on every append, so a crash mid-append
+leaves trailing bytes that readers ignore and the next append truncates.
+
+The store is append-only. Re-indexing a changed export appends new rows,
+and the old ones stop being *live* (see ``RosterStore.live``). Exports whose
+content ``digest`` matches their latest indexing are skipped.
+Integer columns use ``MISSING`` where a character has no value, such as
+``spell_dc`` for a non-caster. Filters never match it and aggregates skip it.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import statistics
+import sys
+from array import array
+from itertools import compress, repeat
+from operator import and_, eq, ge, gt, le, lt, ne
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, NamedTuple
+
+from .manifest import content_digest
+
+if TYPE_CHECKING:
+    from .model import CharacterModel
+
+FORMAT = 1
+MISSING = -(2**31)
+INT = "int"
+STR = "str"
+
+# The on-disk schema is spelled out rather than taken from the parser, so it
+# only changes along with FORMAT (and queries need not import the parser).
+ABILITY_COLUMNS = ("str", "dex", "con", "int", "wis", "cha")
+SKILL_COLUMNS = (
+    "acrobatics", "arcana", "athletics", "crafting", "deception",
+    "diplomacy", "intimidation", "medicine", "nature", "occultism",
+    "performance", "religion", "society", "stealth", "survival", "thievery",
+)
+COLUMNS: dict[str, str] = {
+    "source": STR,
+    "record": INT,
+    "digest": STR,
+    "name": STR,
+    "class": STR,
+    "ancestry": STR,
+    "heritage": STR,
+    "background": STR,
+    "level": INT,
+    **{key: INT for key in ABILITY_COLUMNS},
+    "ac": INT,
+    "hp": INT,
+    "fortitude": INT,
+    "reflex": INT,
+    "will": INT,
+    "perception": INT,
+    **{name: INT for name in SKILL_COLUMNS},
+    "spell_dc": INT,
+    "spell_attack": INT,
+}
+
+META = "meta.json"
+# Rows buffered by index_files before each append
+APPEND_ROWS = 5000
+
+# IndexResult.status values
+INDEXED = "indexed"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+class StoreError(ValueError):
+    """Raised for an unreadable store or a malformed query."""
+
+
+def row_values(char: CharacterModel, source: str, record: int, digest: str) -> dict[str, int | str]:
+    """One store row for a parsed character.
+
+    ``spell_dc`` and ``spell_attack`` are the best of the character's
+    spellcasting entries, ignoring innate spells unless that is all there is.
+    """
+    ident = char.identity
+    row: dict[str, int | str] = {
+        "source": source,
+        "record": record,
+        "digest": digest,
+        "name": ident.name,
+        "class": ident.char_class,
+        "ancestry": ident.ancestry,
+        "heritage": ident.heritage,
+        "background": ident.background,
+        "level": ident.level,
+    }
+    scores = [a.score for a in char.abilities.as_list()] if char.abilities is not None else [MISSING] * 6
+    row.update(zip(ABILITY_COLUMNS, scores))
+    d = char.defense
+    row.update(ac=d.ac, hp=d.hp, fortitude=d.fortitude, reflex=d.reflex, will=d.will, perception=d.perception)
+    modifiers = {skill.name.lower(): skill.modifier for skill in char.skills}
+    row.update((name, modifiers.get(name, MISSING)) for name in SKILL_COLUMNS)
+    casters = [c for c in char.spellcasters if not c.innate] or char.spellcasters
+    row["spell_dc"] = max((c.spell_dc for c in casters), default=MISSING)
+    row["spell_attack"] = max((c.spell_attack for c in casters), default=MISSING)
+    for name, kind in COLUMNS.items():
+        value = row[name]
+        if kind == INT and (type(value) is not int or not MISSING <= value < 2**31):
+            row[name] = MISSING  # not an int32 (trusted parsing passes values through): unknown
+    return row
+
+
+class RosterStore:
+    """A store directory; columns are loaded on first use."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.meta = self._read_meta()
+        self._ints: dict[str, array] = {}
+        self._strings: dict[str, list[str]] = {}
+        self._lookups: dict[str, dict[str, int]] = {}
+
+    def _read_meta(self) -> dict:
+        try:
+            meta = json.loads((self.path / META).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {
+                "format": FORMAT,
+                "rows": 0,
+                "byteorder": sys.byteorder,
+                "columns": COLUMNS,
+                "string_bytes": {name: 0 for name, kind in COLUMNS.items() if kind == STR},
+            }
+        except ValueError as e:
+            raise StoreError(f"{self.path / META}: {e}") from None
+        if meta.get("format") != FORMAT or meta.get("columns") != COLUMNS:
+            raise StoreError(f"{self.path} was written by another version; index into a new store")
+        return meta
+
+    @property
+    def rows(self) -> int:
+        return self.meta["rows"]
+
+    def ints(self, name: str) -> array:
+        """The raw int32 column ``name`` (codes, for string columns)."""
+        if name not in COLUMNS:
+            raise StoreError(f"unknown column {name!r}")
+        if name not in self._ints:
+            column = array("i")
+            if self.rows:
+                with open(self.path / f"{name}.col", "rb") as f:
+                    column.fromfile(f, self.rows)
+                if self.meta["byteorder"] != sys.byteorder:
+                    column.byteswap()
+            self._ints[name] = column
+        return self._ints[name]
+
+    def strings(self, name: str) -> list[str]:
+        """The dictionary of string column ``name``: code → value."""
+        if name not in self._strings:
+            size = self.meta["string_bytes"][name]
+            data = b""
+            if size:
+                with open(self.path / f"{name}.strings", "rb") as f:
+                    data = f.read(size)
+            self._strings[name] = [json.loads(line) for line in data.splitlines()]
+        return self._strings[name]
+
+    def values(self, name: str, rows: Iterable[int]) -> list[int | str | None]:
+        """Decoded values of column ``name`` at ``rows`` (``None`` where missing)."""
+        column = self.ints(name)
+        if COLUMNS[name] == STR:
+            strings = self.strings(name)
+            return [strings[column[i]] for i in rows]
+        return [None if column[i] == MISSING else column[i] for i in rows]
+
+    def live(self) -> list[bool]:
+        """Per row: is it from the latest indexing of its source?
+
+        One indexing of a file appends its records contiguously, numbered
+        from 1, so the latest starts at the source's last ``record == 1``.
+        """
+        source = self.ints("source")
+        first = list(map(eq, self.ints("record"), repeat(1)))
+        starts = dict(zip(compress(source, first), compress(range(self.rows), first)))
+        return list(map(ge, range(self.rows), map(starts.__getitem__, source)))
+
+    def latest(self) -> dict[str, str]:
+        """Source → content digest of its most recently indexed version."""
+        sources, digests = self.strings("source"), self.strings("digest")
+        latest = dict(zip(self.ints("source"), self.ints("digest")))
+        return {sources[s]: digests[d] for s, d in latest.items()}
+
+    def append(self, rows: list[dict[str, int | str]]) -> None:
+        """Append ``rows`` (from ``row_values``) and commit them."""
+        if not rows:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        swap = self.meta["byteorder"] != sys.byteorder
+        meta = json.loads(json.dumps(self.meta))
+        for name, kind in COLUMNS.items():
+            if kind == STR:
+                strings = self.strings(name)
+                known = len(strings)
+                codes = array("i", map(self._encoder(name), (row[name] for row in rows)))
+                data = "".join(json.dumps(value) + "\n" for value in strings[known:]).encode("utf-8")
+                committed = self.meta["string_bytes"][name]
+                _append(self.path / f"{name}.strings", committed, data)
+                meta["string_bytes"][name] = committed + len(data)
+            else:
+                codes = array("i", [row[name] for row in rows])
+            column = self.ints(name)
+            stored = array("i", codes)
+            if swap:
+                stored.byteswap()
+            _append(self.path / f"{name}.col", len(column) * column.itemsize, stored.tobytes())
+            column.extend(codes)
+        meta["rows"] = self.rows + len(rows)
+        tmp = self.path / f".{META}.tmp"
+        tmp.write_text(json.dumps(meta, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path / META)
+        self.meta = meta
+
+    def _encoder(self, name: str) -> Callable[[str], int]:
+        """Map a value to its code in ``name``'s dictionary, adding it if new."""
+        strings = self.strings(name)
+        lookup = self._lookups.get(name)
+        if lookup is None:
+            lookup = self._lookups[name] = {value: code for code, value in enumerate(strings)}
+
+        def encode(value: str) -> int:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(strings)
+                strings.append(value)
+            return code
+
+        return encode
+
+
+def _append(path: Path, committed: int, data: bytes) -> None:
+    """Write ``data`` after the first ``committed`` bytes of ``path``, dropping the rest."""
+    with open(path, "r+b" if path.exists() else "wb") as f:
+        f.truncate(committed)
+        f.seek(committed)
+        f.write(data)
+
+
+class IndexResult(NamedTuple):
+    source: Path
+    status: str
+    rows: int = 0
+    error: str = ""
+
+
+def index_files(
+    store: RosterStore, sources: Iterable[Path], strict: bool = False, vectorized: bool = False
+) -> Iterator[IndexResult]:
+    """Parse and append every export that changed since it was last indexed.
+
+    A file may hold one export or an archive of them (see ``iter_builds``);
+    with ``vectorized`` an archive's builds are parsed as one batch (see
+    ``parse_builds``). A file that fails to read or parse contributes no
+    rows. Rows are committed every ``APPEND_ROWS`` and when the iteration ends.
+    """
+    from .parse import parse_builds
+    from .stream import iter_builds
+
+    latest = store.latest()
+    pending: list[dict[str, int | str]] = []
+    try:
+        for source in sources:
+            key = str(source.resolve())
+            try:
+                raw = source.read_bytes()
+                digest = content_digest(raw)
+                if latest.get(key) == digest:
+                    yield IndexResult(source, UNCHANGED)
+                    continue
+                builds = list(iter_builds(io.StringIO(raw.decode("utf-8-sig"))))
+                rows = [
+                    row_values(char, key, record, digest)
+                    for record, char in enumerate(parse_builds(builds, strict, vectorized), start=1)
+                ]
+            except Exception as e:  # noqa: BLE001 - one bad file must not stop the index
+                yield IndexResult(source, FAILED, error=f"{type(e).__name__}: {e}")
+                continue
+            latest[key] = digest
+            pending.extend(rows)
+            if len(pending) >= APPEND_ROWS:
+                store.append(pending)
+                pending = []
+            yield IndexResult(source, INDEXED, len(rows))
+    finally:
+        store.append(pending)
+
+
+# --- Queries ----------------------------------------------------------------
+
+OPERATORS: dict[str, Callable[[object, object], bool]] = {
+    ">=": ge, "<=": le, "!=": ne, "==": eq, "=": eq, ">": gt, "<": lt,
+}
+AGGREGATES: dict[str, Callable[[list[int]], float]] = {
+    "count": len,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "mean": statistics.fmean,
+    "median": statistics.median,
+}
+_FILTER = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|==|=|>|<)\s*(.*?)\s*$")
+
+
+class Filter(NamedTuple):
+    column: str
+    op: str
+    value: str
+
+    @classmethod
+    def parse(cls, text: str) -> Filter:
+        """``level=5``, ``ac>=22``, ``class=Wizard``."""
+        match = _FILTER.match(text)
+        if match is None:
+            raise StoreError(f"cannot parse filter {text!r} (expected e.g. ac>=22)")
+        column, op, value = match.groups()
+        if column not in COLUMNS:
+            raise StoreError(f"unknown column {column!r} in filter {text!r}")
+        if COLUMNS[column] == STR and OPERATORS[op] not in (eq, ne):
+            raise StoreError(f"{column!r} is text; only = and != apply")
+        return cls(column, op, value)
+
+    def mask(self, store: RosterStore) -> list[bool]:
+        """Per row: does it match? Missing values never do."""
+        column = store.ints(self.column)
+        op = OPERATORS[self.op]
+        if COLUMNS[self.column] == STR:
+            wanted = self.value.casefold()
+            codes = {code for code, value in enumerate(store.strings(self.column)) if value.casefold() == wanted}
+            hits = map(codes.__contains__, column)
+            return list(hits) if op is eq else [not hit for hit in hits]
+        try:
+            value = int(self.value)
+        except ValueError:
+            raise StoreError(f"{self.column!r} needs a whole number, got {self.value!r}") from None
+        return list(map(and_, map(op, column, repeat(value)), map(ne, column, repeat(MISSING))))
+
+
+class Aggregate(NamedTuple):
+    func: str
+    column: str | None
+
+    @classmethod
+    def parse(cls, text: str) -> Aggregate:
+        """``count``, or ``FUNC:COLUMN`` such as ``median:will``."""
+        func, _, column = text.partition(":")
+        func = func.strip().lower()
+        if func not in AGGREGATES:
+            raise StoreError(f"unknown aggregate {func!r} (choose from {', '.join(AGGREGATES)})")
+        if not column:
+            if func != "count":
+                raise StoreError(f"{func} needs a column, e.g. {func}:will")
+            return cls(func, None)
+        column = column.strip()
+        if COLUMNS.get(column) != INT:
+            raise StoreError(f"cannot aggregate {column!r}: not a number column")
+        return cls(func, column)
+
+    @property
+    def label(self) -> str:
+        return f"{self.func}({self.column})" if self.column else self.func
+
+    def compute(self, store: RosterStore, rows: list[int]) -> float | int | None:
+        if self.column is None:
+            return len(rows)
+        values = [v for v in map(store.ints(self.column).__getitem__, rows) if v != MISSING]
+        if not values:
+            return 0 if self.func == "count" else None
+        return AGGREGATES[self.func](values)
+
+
+def select(store: RosterStore, filters: Iterable[Filter]) -> list[int]:
+    """Indexes of the live rows matching every filter."""
+    mask = store.live()
+    for f in filters:
+        mask = list(map(and_, mask, f.mask(store)))
+    return list(compress(range(store.rows), mask))
+
+
+def aggregate(
+    store: RosterStore, rows: list[int], aggregates: list[Aggregate], group_by: str | None = None
+) -> list[dict[str, object]]:
+    """One result row per group (or a single row), sorted by group value."""
+    if group_by is None:
+        groups = {None: rows}
+    else:
+        groups = {}
+        for key, row in zip(store.values(group_by, rows), rows):
+            groups.setdefault(key, []).append(row)
+    results = []
+    for key in sorted(groups, key=lambda k: (k is None, k)):
+        result: dict[str, object] = {group_by: key} if group_by is not None else {}
+        for agg in aggregates:
+            result[agg.label] = agg.compute(store, groups[key])
+        results.append(result)
+    return results
@@ -0,0 +1,163 @@
+"""Incremental reading of multi-character exports.
+
+Archive tools emit either one large JSON array of builds or a stream of JSON
+objects (NDJSON, or simply concatenated objects). ``iter_builds`` walks such
+input chunk by chunk and hands out one build at a time, so memory stays
+bounded by the largest single character rather than the whole archive. A
+plain single-character export is just a stream of one object.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Callable, Iterator, TextIO
+
+from .model import CharacterModel
+from .parse import parse_build, unwrap_build
+
+CHUNK_SIZE = 1 << 16
+
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SEPARATORS = " \t\r\n,"
+
+
+class StreamError(ValueError):
+    """Raised for input that cannot be split into JSON objects."""
+
+
+class RecordError(ValueError):
+    """One record was delimited correctly but is not a valid build."""
+
+    def __init__(self, index: int, message: str) -> None:
+        super().__init__(f"record {index}: {message}")
+        self.index = index
+
+
+class _Reader:
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+
+    def fill(self, keep_from: int) -> int:
+        """Append a chunk, discarding everything before ``keep_from``.
+
+        Returns how far existing offsets shifted, or -1 at end of input.
+        """
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            return -1
+        self.buf = self.buf[keep_from:] + chunk
+        self.pos -= keep_from
+        return keep_from
+
+    def peek(self, skip: str) -> str:
+        """Skip characters in ``skip`` and return the next one ("" at end)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in skip:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.fill(self.pos) < 0:
+                return ""
+
+    def read_value(self) -> str:
+        """Return the raw text of the object or array starting at ``pos``."""
+        start = i = self.pos
+        depth = 0
+        in_string = False
+        while True:
+            pattern = _STRING_SPECIAL if in_string else _STRUCTURAL
+            m = pattern.search(self.buf, i)
+            if m is None:
+                # Everything up to the end of the buffer has been scanned
+                scanned = max(i, len(self.buf))
+                shift = self.fill(start)
+                if shift < 0:
+                    raise StreamError("input ended in the middle of a JSON value")
+                start -= shift
+                i = scanned - shift
+                continue
+            c = m.group()
+            i = m.end()
+            if in_string:
+                if c == "\\":
+                    i += 1  # skip the escaped character, even if not read yet
+                else:
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self.pos = i
+                    return self.buf[start:i]
+
+
+def iter_builds(
+    fp: TextIO,
+    chunk_size: int = CHUNK_SIZE,
+    on_error: Callable[[RecordError], None] | None = None,
+) -> Iterator[dict]:
+    """Yield build dicts from a JSON array, NDJSON or a single export.
+
+    A record that is delimited but is not a valid JSON object raises
+    ``RecordError``, or is passed to ``on_error`` and skipped if given.
+    Structurally broken input (e.g. truncated, or with data after the closing
+    ``]`` of an array) always raises ``StreamError``.
+    """
+    reader = _Reader(fp, chunk_size)
+    first = reader.peek(" \t\r\n\ufeff")
+    in_array = first == "["
+    if in_array:
+        reader.pos += 1
+
+    index = 0
+    while True:
+        c = reader.peek(_SEPARATORS)
+        if c == "":
+            if in_array:
+                raise StreamError("input ended before the closing ']'")
+            return
+        if in_array and c == "]":
+            reader.pos += 1
+            trailing = reader.peek(" \t\r\n")
+            if trailing:
+                raise StreamError(f"unexpected {trailing!r} after the closing ']'")
+            return
+        if c not in "{[":
+            raise StreamError(f"expected a JSON object, found {c!r}")
+        text = reader.read_value()
+        index += 1
+        try:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise RecordError(index, "expected a JSON object")
+        except (json.JSONDecodeError, RecordError) as e:
+            error = e if isinstance(e, RecordError) else RecordError(index, str(e))
+            if on_error is None:
+                raise error from None
+            on_error(error)
+            continue
+        yield unwrap_build(data)
+
+
+def iter_characters(
+    fp: TextIO,
+    strict: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    on_error: Callable[[RecordError], None] | None = None,
+) -> Iterator[CharacterModel]:
+    """Parse each build from ``fp`` as it is read."""
+    for b in iter_builds(fp, chunk_size=chunk_size, on_error=on_error):
+        yield parse_build(b, strict=strict)
+
+
+def slugify(name: str) -> str:
+    slug = re.sub(r"[^\w]+", "_", name.strip().lower(), flags=re.UNICODE).strip("_")
+    return slug or "character"
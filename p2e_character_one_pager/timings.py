@@ -0,0 +1,185 @@
+"""Per-stage build timings, batch percentiles, stage hooks and cProfile dumps.
+
+A ``StageTimer`` is threaded through one build and records the seconds spent
+in each stage: ``load_json``, every ``parse_*`` function, ``classify``,
+``context`` (per-sheet template variables), ``fit`` (with ``--fit``),
+``render`` (template output), ``fonts`` and ``minify`` (with inline fonts or
+``--minify``) and ``write`` (file I/O). The engine records its own stages when
+given the timer. ``summarize`` turns many builds' timings into
+percentiles.
+
+Hooks let library code attach its own timers or metrics to the same stages::
+
+    from p2e_character_one_pager import timings
+
+    timings.add_hook(lambda stage, seconds: histogram(stage).observe(seconds))
+
+A hook is called with the stage name and its duration each time a stage
+finishes, in the process doing the work (for ``build-all`` that is a worker
+unless ``-j 1``).
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+StageHook = Callable[[str, float], None]
+
+PERCENTILES = (50, 90, 99)
+
+_hooks: list[StageHook] = []
+
+
+def add_hook(hook: StageHook) -> None:
+    """Call ``hook(stage, seconds)`` whenever any StageTimer records a stage."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: StageHook) -> None:
+    _hooks.remove(hook)
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: StageTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timer.record(self.name, time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """Seconds per stage for one build, in the order the stages first ran."""
+
+    def __init__(self, hooks: Iterable[StageHook] = ()) -> None:
+        self.stages: dict[str, float] = {}
+        self._hooks = [*_hooks, *hooks]
+
+    def stage(self, name: str) -> _Stage:
+        """Context manager timing the block as ``name`` (repeats accumulate)."""
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for hook in self._hooks:
+            hook(name, seconds)
+
+    def stream(
+        self,
+        write: Callable[[Iterator[str]], T],
+        chunks: Iterable[str],
+        render_stage: str = "render",
+        write_stage: str = "write",
+    ) -> T:
+        """Call ``write(chunks)``, splitting its time into producing and writing chunks."""
+        produced = 0.0
+
+        def timed() -> Iterator[str]:
+            nonlocal produced
+            it = iter(chunks)
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    produced += time.perf_counter() - start
+                yield chunk
+
+        start = time.perf_counter()
+        try:
+            return write(timed())
+        finally:
+            elapsed = time.perf_counter() - start
+            self.record(render_stage, produced)
+            self.record(write_stage, elapsed - produced)
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def as_ms(self) -> dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+
+
+def timed_iter(items: Iterable[T]) -> Iterator[tuple[float, T]]:
+    """Yield ``(seconds spent producing it, item)`` for each item."""
+    it = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        yield time.perf_counter() - start, item
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """The ``p``-th percentile of sorted ``ordered``, interpolating between ranks."""
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _distribution(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    stats = {"count": len(ordered), "mean": sum(ordered) / len(ordered) * 1000}
+    for p in PERCENTILES:
+        stats[f"p{p}"] = percentile(ordered, p) * 1000
+    stats["max"] = ordered[-1] * 1000
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def summarize(runs: Iterable[dict[str, float]]) -> dict:
+    """Millisecond percentiles per stage, and of the total, over many builds' stages."""
+    by_stage: dict[str, list[float]] = {}
+    totals = []
+    for stages in runs:
+        for name, seconds in stages.items():
+            by_stage.setdefault(name, []).append(seconds)
+        totals.append(sum(stages.values()))
+    if not totals:
+        return {"builds": 0, "stages_ms": {}, "total_ms": {}}
+    return {
+        "builds": len(totals),
+        "stages_ms": {name: _distribution(values) for name, values in by_stage.items()},
+        "total_ms": _distribution(totals),
+    }
+
+
+def write_report(report: dict, target: str) -> None:
+    """Write ``report`` as JSON to ``target`` (a path, or ``-`` for stderr)."""
+    text = json.dumps(report, indent=2) + "\n"
+    if target == "-":
+        sys.stderr.write(text)
+    else:
+        Path(target).write_text(text, encoding="utf-8")
+
+
+@contextmanager
+def profiled(path: str | Path) -> Iterator[None]:
+    """Run the block under cProfile and dump pstats data to ``path``."""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(path))
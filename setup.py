@@ -0,0 +1,39 @@
+"""Build hook: precompile the Jinja2 templates and CSS bundles into the built package.
+
+Project metadata lives in pyproject.toml; this only extends build_py.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+def _load(name: str):
+    # Load a module on its own: the package's runtime dependencies are not
+    # installed in an isolated build environment, jinja2 is
+    path = Path(__file__).parent / "p2e_character_one_pager" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses look their module up there
+    spec.loader.exec_module(module)
+    return module
+
+
+class build_py_with_templates(build_py):
+    def run(self) -> None:
+        super().run()
+        precompile = _load("precompile")
+        package_dir = Path(self.build_lib) / "p2e_character_one_pager"
+        count = precompile.compile_templates(
+            precompile.TEMPLATES_DIR, package_dir / "templates" / precompile.COMPILED_DIR.name
+        )
+        self.announce(f"precompiled {count} templates", level=2)
+        css = _load("css")
+        count = css.compile_bundles(package_dir / "assets")
+        self.announce(f"precompiled {count} stylesheets", level=2)
+
+
+setup(cmdclass={"build_py": build_py_with_templates})
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from p2e_character_one_pager.batch import SKIPPED, UNCHANGED, WRITTEN, build_many, output_paths
+from p2e_character_one_pager.cli import main
+from p2e_character_one_pager.corpus import generate_corpus
+from p2e_character_one_pager.manifest import MANIFEST_NAME
+from p2e_character_one_pager.options import BuildOptions
+from p2e_character_one_pager.pipeline import run_pipeline
+from p2e_character_one_pager.render import default_engine
+
+
+def _same_stem_in_two_dirs(tmp_path: Path) -> list[Path]:
+    sources = []
+    for folder, build in zip(("a", "b"), generate_corpus(2, seed=1)):
+        path = tmp_path / "in" / folder / "wizard.json"
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps(build), encoding="utf-8")
+        sources.append(path)
+    return sources
+
+
+def test_output_paths_are_flat_for_one_directory(tmp_path):
+    sources = [tmp_path / "wizard.json", tmp_path / "fighter.json"]
+    assert output_paths(sources, tmp_path / "out") == [
+        tmp_path / "out" / "wizard_onepager.html",
+        tmp_path / "out" / "fighter_onepager.html",
+    ]
+
+
+def test_same_stem_in_two_directories_builds_twice_then_skips(tmp_path):
+    sources = _same_stem_in_two_dirs(tmp_path)
+    out_dir = tmp_path / "out"
+    first = list(build_many(sources, out_dir, BuildOptions(), jobs=1))
+    assert [r.status for r in first] == [WRITTEN, WRITTEN]
+    assert [r.out for r in first] == [out_dir / "a" / "wizard_onepager.html", out_dir / "b" / "wizard_onepager.html"]
+    assert first[0].out.read_bytes() != first[1].out.read_bytes()
+
+    again = list(build_many(sources, out_dir, BuildOptions(), jobs=1))
+    assert [r.status for r in again] == [SKIPPED, SKIPPED]
+
+
+def test_pipeline_writes_same_stems_to_separate_files(tmp_path):
+    sources = _same_stem_in_two_dirs(tmp_path)
+    out_dir = tmp_path / "out"
+    results = []
+    asyncio.run(run_pipeline(sources, out_dir, BuildOptions(), jobs=1, io_concurrency=2, on_result=results.append))
+    assert sorted(r.out for r in results) == [out_dir / "a" / "wizard_onepager.html", out_dir / "b" / "wizard_onepager.html"]
+    assert all(r.status == WRITTEN for r in results)
+
+
+@pytest.fixture
+def roster(tmp_path: Path) -> list[Path]:
+    sources = []
+    for i, build in enumerate(generate_corpus(3, seed=2)):
+        path = tmp_path / "in" / f"pc{i}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(build), encoding="utf-8")
+        sources.append(path)
+    return sources
+
+
+def _statuses(sources: list[Path], out_dir: Path, options: BuildOptions | None = None) -> list[str]:
+    return [r.status for r in build_many(sources, out_dir, options or BuildOptions(), jobs=1)]
+
+
+def test_second_build_all_skips_everything(roster, tmp_path):
+    out_dir = tmp_path / "out"
+    args = ["build-all", str(roster[0].parent), "-d", str(out_dir), "-j", "1", "--no-cache"]
+    first = CliRunner().invoke(main, args)
+    assert first.exit_code == 0, first.output
+    assert first.output.count("Written: ") == 3
+
+    again = CliRunner().invoke(main, args)
+    assert again.exit_code == 0, again.output
+    assert "Written: " not in again.output
+    assert "3 skipped, 0 unchanged" in again.output
+
+
+def test_changed_input_rebuilds_only_that_file(roster, tmp_path):
+    out_dir = tmp_path / "out"
+    _statuses(roster, out_dir)
+    build = json.loads(roster[1].read_text(encoding="utf-8"))
+    build["build"]["name"] = "Renamed"
+    roster[1].write_text(json.dumps(build), encoding="utf-8")
+    assert _statuses(roster, out_dir) == [SKIPPED, WRITTEN, SKIPPED]
+
+
+def test_changed_options_rebuild_every_file(roster, tmp_path):
+    out_dir = tmp_path / "out"
+    _statuses(roster, out_dir)
+    assert _statuses(roster, out_dir, BuildOptions(theme="dark")) == [WRITTEN] * 3
+    assert _statuses(roster, out_dir, BuildOptions(theme="dark")) == [SKIPPED] * 3
+
+
+def test_new_fingerprint_with_identical_output_is_unchanged_and_keeps_mtime(roster, tmp_path, monkeypatch):
+    out_dir = tmp_path / "out"
+    _statuses(roster, out_dir)
+    outs = output_paths(roster, out_dir)
+    for out in outs:
+        os.utime(out, (1_000_000, 1_000_000))
+
+    monkeypatch.setattr(default_engine(), "fingerprint", "templates edited")
+    assert _statuses(roster, out_dir) == [UNCHANGED] * 3
+    assert [out.stat().st_mtime for out in outs] == [1_000_000] * 3
+    # The manifest now holds the new fingerprint
+    assert _statuses(roster, out_dir) == [SKIPPED] * 3
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        "{not json",
+        "[]",
+        json.dumps({"version": 0, "entries": {}}),
+        json.dumps({"version": 1, "entries": []}),
+        json.dumps({"version": 1, "entries": {"pc0_onepager.html": "?"}}),
+    ],
+)
+def test_corrupt_or_foreign_manifest_is_ignored(roster, tmp_path, manifest):
+    out_dir = tmp_path / "out"
+    _statuses(roster, out_dir)
+    (out_dir / MANIFEST_NAME).write_text(manifest, encoding="utf-8")
+    assert _statuses(roster, out_dir) == [UNCHANGED] * 3
+    assert _statuses(roster, out_dir) == [SKIPPED] * 3
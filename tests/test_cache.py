@@ -0,0 +1,31 @@
+import json
+import os
+import random
+
+import pytest
+
+from p2e_character_one_pager.cache import ParseCache
+from p2e_character_one_pager.corpus import generate_build
+
+RAW = json.dumps(generate_build(random.Random(0), 5, "hybrid")).encode("utf-8")
+
+
+def test_second_load_is_a_hit(tmp_path):
+    cache = ParseCache(tmp_path / "parse")
+    first = cache.load(RAW)
+    assert cache.load(RAW) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (tmp_path / "parse").stat().st_mode & 0o777 == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_directory_others_can_write_to_is_not_used(tmp_path):
+    directory = tmp_path / "parse"
+    ParseCache(directory).load(RAW)
+    directory.chmod(0o777)
+
+    cache = ParseCache(directory)
+    assert "writable by other users" in cache.problem
+    cache.load(RAW)
+    cache.load(RAW)
+    assert cache.hits == 0
@@ -0,0 +1,70 @@
+import json
+import random
+
+import pytest
+from click.testing import CliRunner
+
+pytest.importorskip("numpy")
+
+from p2e_character_one_pager import derived  # noqa: E402
+from p2e_character_one_pager.cli import main  # noqa: E402
+from p2e_character_one_pager.corpus import ARCHETYPES, generate_build, generate_corpus  # noqa: E402
+from p2e_character_one_pager.derived import derive_stats  # noqa: E402
+from p2e_character_one_pager.parse import parse_builds, unwrap_build  # noqa: E402
+from p2e_character_one_pager.store import COLUMNS, RosterStore  # noqa: E402
+
+
+def _differences(a: object, b: object, path: str = "") -> list[str]:
+    """Every field path where ``a`` and ``b`` disagree."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return [
+            diff
+            for key in sorted(a.keys() | b.keys(), key=str)
+            for diff in _differences(a.get(key), b.get(key), f"{path}.{key}")
+        ]
+    if isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        return [diff for i, (x, y) in enumerate(zip(a, b)) for diff in _differences(x, y, f"{path}[{i}]")]
+    return [] if a == b else [f"{path}: {a!r} != {b!r}"]
+
+
+@pytest.mark.parametrize("archetype", ARCHETYPES)
+def test_numpy_pass_matches_scalar_parse(archetype):
+    rng = random.Random(archetype)
+    builds = [
+        unwrap_build(generate_build(rng, level, archetype, extreme=level % 7 == 0))
+        for level in range(1, 21)
+    ]
+    # Otherwise every build would fall back to the scalar path and trivially match
+    assert all(stats is not None for stats in derive_stats(builds))
+
+    scalar = parse_builds(builds)
+    vectorized = parse_builds(builds, vectorized=True)
+    for build, a, b in zip(builds, scalar, vectorized):
+        assert _differences(a.model_dump(), b.model_dump()) == [], f"level {build['level']}"
+
+
+def test_vectorized_build_stream_writes_the_same_sheets(tmp_path, monkeypatch):
+    monkeypatch.setattr(derived, "BATCH_SIZE", 3)  # 7 records: two full batches and a short one
+    archive = tmp_path / "archive.json"
+    archive.write_text(json.dumps(list(generate_corpus(7, seed=3))), encoding="utf-8")
+    report = tmp_path / "timings.json"
+
+    for out, flags in (("scalar", []), ("vectorized", ["--vectorized", "--timings", str(report)])):
+        result = CliRunner().invoke(main, ["build-stream", str(archive), "-d", str(tmp_path / out), *flags])
+        assert result.exit_code == 0, result.output
+    scalar = sorted((tmp_path / "scalar").iterdir())
+    assert len(scalar) == 7
+    assert [p.read_bytes() for p in scalar] == [p.read_bytes() for p in sorted((tmp_path / "vectorized").iterdir())]
+    assert "derive" in json.loads(report.read_text(encoding="utf-8"))["stages_ms"]
+
+
+def test_vectorized_index_stores_the_same_rows(tmp_path):
+    archive = tmp_path / "archive.json"
+    archive.write_text(json.dumps(list(generate_corpus(5, seed=4))), encoding="utf-8")
+    for store, flags in (("scalar", []), ("vectorized", ["--vectorized"])):
+        result = CliRunner().invoke(main, ["index", str(archive), "-s", str(tmp_path / store), *flags])
+        assert result.exit_code == 0, result.output
+    scalar, vectorized = RosterStore(tmp_path / "scalar"), RosterStore(tmp_path / "vectorized")
+    assert scalar.rows == vectorized.rows == 5
+    for column in COLUMNS:
+        assert scalar.values(column, range(5)) == vectorized.values(column, range(5)), column
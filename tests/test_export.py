@@ -0,0 +1,96 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from p2e_character_one_pager.corpus import generate_build
+from p2e_character_one_pager.export import INDEX_NAME, SITE_MANIFEST, encodings, export_site
+from p2e_character_one_pager.options import BuildOptions
+from p2e_character_one_pager.parse import parse_build, unwrap_build
+from p2e_character_one_pager.profile import classify
+
+
+def _sheet(name: str, level: int, archetype: str = "hybrid"):
+    build = unwrap_build(generate_build(random.Random(level), level, archetype))
+    build["name"] = name
+    char = parse_build(build)
+    return char, classify(char)
+
+
+@pytest.fixture
+def sheets():
+    return [_sheet("Ayla", 3), _sheet("Brom", 7, "martial")]
+
+
+def _files(out_dir: Path) -> set[str]:
+    return {path.relative_to(out_dir).as_posix() for path in out_dir.rglob("*") if path.is_file()}
+
+
+def test_second_export_writes_nothing(tmp_path, sheets):
+    first = export_site(sheets, tmp_path, BuildOptions())
+    assert first.written == (len(sheets) + 1) * (1 + len(encodings())) + 1
+    files = _files(tmp_path)
+
+    again = export_site(sheets, tmp_path, BuildOptions())
+    assert (again.written, again.removed) == (0, 0)
+    assert again.unchanged == first.written
+    assert _files(tmp_path) == files
+
+
+def test_renamed_sheet_removes_old_file_and_variants(tmp_path, sheets):
+    first = export_site(sheets, tmp_path, BuildOptions())
+    old = next(name for name in first.files if "brom" in name)
+    old_files = {old, *(variant["path"] for variant in first.files[old]["encodings"].values())}
+    assert old_files <= _files(tmp_path)
+
+    second = export_site([sheets[0], _sheet("Bromwell", 7, "martial")], tmp_path, BuildOptions())
+    assert second.removed == len(old_files)
+    assert not old_files & _files(tmp_path)
+    assert any("bromwell" in name for name in second.files)
+    manifest = json.loads((tmp_path / SITE_MANIFEST).read_text(encoding="utf-8"))
+    assert set(manifest["files"]) == set(second.files)
+
+
+def test_manifest_entries_outside_the_export_are_never_deleted(tmp_path, sheets):
+    out_dir = tmp_path / "site"
+    export_site(sheets, out_dir, BuildOptions())
+    outside = tmp_path / "x"
+    outside.write_text("keep me", encoding="utf-8")
+    manifest = json.loads((out_dir / SITE_MANIFEST).read_text(encoding="utf-8"))
+    manifest["files"]["../x"] = {"encodings": {"gzip": {"path": "../x"}}}
+    manifest["files"][str(outside)] = {"encodings": {}}
+    (out_dir / SITE_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+
+    result = export_site(sheets, out_dir, BuildOptions())
+    assert result.removed == 0
+    assert outside.read_text(encoding="utf-8") == "keep me"
+
+
+@pytest.mark.parametrize("manifest", ["{not json", "[]", json.dumps({"version": 1, "files": {"a.html": "?"}})])
+def test_unreadable_manifest_removes_nothing(tmp_path, sheets, manifest):
+    export_site(sheets, tmp_path, BuildOptions())
+    (tmp_path / SITE_MANIFEST).write_text(manifest, encoding="utf-8")
+    assert export_site(sheets, tmp_path, BuildOptions()).removed == 0
+
+
+def test_gzip_output_is_identical_across_runs(tmp_path, sheets):
+    first = export_site(sheets, tmp_path / "one", BuildOptions())
+    export_site(sheets, tmp_path / "two", BuildOptions())
+    for name, entry in first.files.items():
+        gz = entry["encodings"]["gzip"]["path"]
+        assert (tmp_path / "one" / gz).read_bytes() == (tmp_path / "two" / gz).read_bytes()
+        assert (tmp_path / "one" / name).read_bytes() == (tmp_path / "two" / name).read_bytes()
+    assert INDEX_NAME in first.files
+
+
+def test_names_are_escaped_in_the_index_and_sheets(tmp_path):
+    char, profile = _sheet("<script>alert(1)</script>", 5)
+    char.identity.ancestry = '"><img src=x onerror=alert(2)>'
+    result = export_site([(char, profile)], tmp_path, BuildOptions(), title="A & B")
+    for name in result.files:
+        html = (tmp_path / name).read_text(encoding="utf-8")
+        assert "<script>alert" not in html
+        assert "<img" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "<title>A &amp; B</title>" in (tmp_path / INDEX_NAME).read_text(encoding="utf-8")
@@ -0,0 +1,51 @@
+import json
+import random
+
+from click.testing import CliRunner
+
+from p2e_character_one_pager.cli import main
+from p2e_character_one_pager.corpus import generate_build
+from p2e_character_one_pager.fit import FALLBACK_WIDTH_FACTOR, StyleMetrics, fallback_widths, fit_sheet, font_widths
+
+CSS = """
+.box { border: 1.5px solid #999; border-top: none; padding: 2px 6px 1px; }
+.rule { border-bottom: 1px solid #aaa; }
+"""
+
+
+def test_fallback_table_is_times_narrowed():
+    widths = fallback_widths()
+    assert widths.regular["n"] == 500 * FALLBACK_WIDTH_FACTOR / 1000
+    assert widths.bold["—"] == 1000 * FALLBACK_WIDTH_FACTOR / 1000
+    assert "Times" in widths.source
+
+
+def test_no_font_in_the_searched_dirs_means_no_measured_widths(tmp_path):
+    assert font_widths(dirs=[tmp_path]) is None
+
+
+def test_border_widths_follow_shorthand_and_longhands():
+    metrics = StyleMetrics(CSS)
+    assert metrics.border(".box", "bottom") == 1.5
+    assert metrics.border(".box", "top") == 0.0
+    assert metrics.border(".rule", "bottom") == 1.0
+    assert metrics.border(".rule", "top") == 0.0
+    assert metrics.edges(".box", "padding") == (2.0, 6.0, 1.0, 6.0)
+
+
+def test_build_fits_the_sheet_once_and_reports_that_fit(tmp_path, monkeypatch):
+    from p2e_character_one_pager import render
+
+    results = []
+
+    def counting_fit_sheet(*args, **kwargs):
+        results.append(fit_sheet(*args, **kwargs))
+        return results[-1]
+
+    monkeypatch.setattr(render, "fit_sheet", counting_fit_sheet)
+    source = tmp_path / "caster.json"
+    source.write_text(json.dumps(generate_build(random.Random(3), 15, "caster", extreme=True)), encoding="utf-8")
+    result = CliRunner().invoke(main, ["build", str(source), "-o", str(tmp_path / "out.html"), "--fit"])
+    assert result.exit_code == 0, result.output
+    assert len(results) == 1
+    assert f"Fit: {results[0].summary()}" in result.output
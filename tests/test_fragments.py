@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from p2e_character_one_pager.corpus import ARCHETYPES, generate_build
+from p2e_character_one_pager.fragments import FragmentCache
+from p2e_character_one_pager.model import CharacterModel
+from p2e_character_one_pager.parse import parse_build, unwrap_build
+from p2e_character_one_pager.profile import classify
+from p2e_character_one_pager.render import OnePagerEngine
+
+
+def _character(archetype: str, seed: int = 0) -> CharacterModel:
+    return parse_build(unwrap_build(generate_build(random.Random(seed), 9, archetype)))
+
+
+def _bump_top_skill(char: CharacterModel) -> None:
+    max(char.skills, key=lambda skill: skill.modifier).modifier += 1
+
+
+def _rename_spell(char: CharacterModel) -> None:
+    caster = char.spellcasters[0]
+    (caster.prepared or caster.spells)[-1].spells[0] = "Renamed Spell"
+
+
+# One field per cached section (see SECTION_KEYS and the spellcasting parts)
+EDITS = {
+    "header": lambda char: setattr(char.identity, "background", "Edited Background"),
+    "abilities": lambda char: setattr(char.abilities.wis, "score", char.abilities.wis.score + 2),
+    "defense": lambda char: char.defense.resistances.append("fire 5"),
+    "skills": _bump_top_skill,
+    "weapons": lambda char: setattr(char.money, "gp", char.money.gp + 1),
+    "spell_rank": _rename_spell,
+    "focus_block": lambda char: setattr(char, "focus_points", char.focus_points + 1),
+}
+
+
+def _cold(char: CharacterModel) -> str:
+    return OnePagerEngine().render(char, classify(char))
+
+
+@pytest.fixture(scope="module")
+def warm():
+    engine = OnePagerEngine()
+    for archetype in ARCHETYPES:
+        char = _character(archetype)
+        engine.render(char, classify(char))
+    return engine
+
+
+@pytest.fixture(scope="module")
+def disabled():
+    return OnePagerEngine(fragments=FragmentCache(0), lines=FragmentCache(0))
+
+
+@pytest.mark.parametrize("archetype", ARCHETYPES)
+def test_cold_warm_and_disabled_caches_render_the_same(warm, disabled, archetype):
+    char = _character(archetype)
+    expected = _cold(char)
+    hits = warm.fragments.hits
+    assert warm.render(char, classify(char)) == expected
+    assert warm.fragments.hits > hits
+    assert disabled.render(char, classify(char)) == expected
+    assert disabled.fragments.hits == disabled.lines.hits == 0
+
+
+@pytest.mark.parametrize("section", EDITS)
+def test_one_changed_field_is_rendered_through_a_warm_cache(warm, disabled, section):
+    base = _character("caster")
+    assert base.focus_spells and base.spellcasters
+    char = base.model_copy(deep=True)
+    EDITS[section](char)
+
+    expected = _cold(char)
+    assert expected != _cold(base)
+    assert warm.render(char, classify(char)) == expected
+    assert disabled.render(char, classify(char)) == expected
+    # The warm cache still holds the unedited sections and fragments
+    assert warm.render(base, classify(base)) == _cold(base)
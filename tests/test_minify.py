@@ -0,0 +1,82 @@
+import random
+import re
+
+import pytest
+
+from p2e_character_one_pager.corpus import ARCHETYPES, generate_build
+from p2e_character_one_pager.css import AtBlock, parse_css, prune_unused, selector_classes
+from p2e_character_one_pager.minify import Minifier, minify_html, used_classes
+from p2e_character_one_pager.parse import parse_build, unwrap_build
+from p2e_character_one_pager.profile import classify
+from p2e_character_one_pager.render import OnePagerEngine
+
+# Commas outside parentheses separate the selectors of a rule
+_SELECTOR_LIST = re.compile(r",(?![^(]*\))")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OnePagerEngine()
+
+
+def _selectors(items: list) -> set[tuple[str, str]]:
+    """``(enclosing at-rule, selector)`` for every selector in ``items``."""
+    found = set()
+    for item in items:
+        context, rules = (item.prelude, item.rules) if isinstance(item, AtBlock) else ("", [item])
+        for rule in rules:
+            found.update((context, selector) for selector in _SELECTOR_LIST.split(rule.selector))
+    return found
+
+
+@pytest.mark.parametrize("archetype", ARCHETYPES)
+@pytest.mark.parametrize("theme", ["default", "dark"])
+def test_pruning_keeps_every_selector_the_sheet_can_match(engine, archetype, theme):
+    char = parse_build(unwrap_build(generate_build(random.Random(archetype), 9, archetype)))
+    html = engine.render(char, classify(char), theme=theme)
+    items = parse_css(engine.css(theme))
+    used = used_classes(html)
+
+    kept = _selectors(prune_unused(items, used))
+    matchable = {(context, s) for context, s in _selectors(items) if selector_classes(s) <= used}
+    assert matchable <= kept
+    # ...and nothing else: pruning did remove the selectors for absent classes
+    assert kept == matchable | {(context, s) for context, s in kept if not selector_classes(s)}
+    assert len(kept) < len(_selectors(items))
+
+
+def test_verbatim_elements_and_inline_whitespace_are_kept():
+    html = (
+        "<div>\n"
+        "    <p>\n"
+        "      <b>Strike</b>\n"
+        "      <i>+9</i> <em>2d6</em>\n"
+        "    </p>\n"
+        "    <pre>  line one\n\n    indented\n</pre>\n"
+        "    <textarea name=\"notes\">\n  keep   this\n</textarea>\n"
+        "    <script>\n      let x = 1;\n    </script>\n"
+        "</div>\n"
+    )
+    out = minify_html(html)
+    assert "<pre>  line one\n\n    indented\n</pre>" in out
+    assert "<textarea name=\"notes\">\n  keep   this\n</textarea>" in out
+    assert "<script>\nlet x = 1;\n</script>" in out
+    # A break between inline elements renders as a space, so it stays
+    assert "<b>Strike</b>\n<i>+9</i> <em>2d6</em>" in out
+    assert "<div><p><b>" in out
+
+
+def test_non_breaking_spaces_are_not_stripped():
+    assert minify_html("<td>\n  \u00a0x\u00a0 \n</td>") == "<td>\u00a0x\u00a0</td>"
+
+
+@pytest.mark.parametrize("archetype", ARCHETYPES)
+def test_minify_is_idempotent(engine, archetype):
+    char = parse_build(unwrap_build(generate_build(random.Random(archetype), 15, archetype, extreme=True)))
+    html = engine.render(char, classify(char))
+    css = engine.css()
+    minifier = Minifier()
+    once = minifier.minify(html, css)
+    assert len(once) < len(html)
+    assert minifier.minify(once, css) == once
+    assert minify_html(once) == once
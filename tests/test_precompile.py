@@ -0,0 +1,62 @@
+import json
+import random
+import shutil
+
+import pytest
+
+from p2e_character_one_pager.corpus import generate_build
+from p2e_character_one_pager.css import COMPILED_BUNDLES, build_bundles, compile_bundles
+from p2e_character_one_pager.parse import parse_build, unwrap_build
+from p2e_character_one_pager.precompile import COMPILED_DIR, STAMP, TEMPLATES_DIR, compile_templates, is_current
+from p2e_character_one_pager.profile import classify
+from p2e_character_one_pager.render import ASSETS_DIR, OnePagerEngine
+
+MARKER = "<!-- edited after compiling -->"
+
+
+def test_edited_template_is_rendered_from_source(tmp_path):
+    templates = tmp_path / "templates"
+    compiled_dir = templates / COMPILED_DIR.name
+    shutil.copytree(TEMPLATES_DIR, templates, ignore=shutil.ignore_patterns(COMPILED_DIR.name))
+    compile_templates(templates, compiled_dir)
+    char = parse_build(unwrap_build(generate_build(random.Random(0), 5, "caster")))
+    profile = classify(char)
+
+    before = OnePagerEngine(templates_dir=templates)
+    assert before.compiled_templates
+    assert MARKER not in before.render(char, profile)
+
+    stamp = (compiled_dir / STAMP).read_bytes()
+    partial = templates / "_sheet.html.j2"
+    partial.write_text(partial.read_text(encoding="utf-8") + MARKER + "\n", encoding="utf-8")
+    assert not is_current(templates, compiled_dir)
+    # The stale modules are still there, but no longer used
+    assert (compiled_dir / STAMP).read_bytes() == stamp
+
+    after = OnePagerEngine(templates_dir=templates)
+    assert not after.compiled_templates
+    assert MARKER in after.render(char, profile)
+    assert after.fingerprint != before.fingerprint
+    with pytest.raises(ValueError, match="stale"):
+        OnePagerEngine(templates_dir=templates, compiled_templates=True)
+
+
+def test_compiled_bundles_are_used_until_a_stylesheet_changes(tmp_path):
+    assets = tmp_path / "assets"
+    shutil.copytree(ASSETS_DIR, assets, ignore=shutil.ignore_patterns(COMPILED_BUNDLES, "fonts"))
+    built = build_bundles(assets)
+    assert compile_bundles(assets) == len(built)
+    assert build_bundles(assets) == built
+
+    # Loaded from the file, not rebuilt
+    compiled = assets / COMPILED_BUNDLES
+    payload = json.loads(compiled.read_text(encoding="utf-8"))
+    payload["bundles"]["default/letter"] = "/* from the file */"
+    compiled.write_text(json.dumps(payload), encoding="utf-8")
+    assert build_bundles(assets)[("default", "letter")] == "/* from the file */"
+
+    theme = assets / "themes" / "dark.css"
+    theme.write_text(theme.read_text(encoding="utf-8") + ".edited{color:red}", encoding="utf-8")
+    rebuilt = build_bundles(assets)
+    assert rebuilt[("default", "letter")] == built[("default", "letter")]
+    assert ".edited{color:red}" in rebuilt[("dark", "a4")]
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from p2e_character_one_pager.corpus import generate_build
+from p2e_character_one_pager.parse import parse_build, unwrap_build
+from p2e_character_one_pager.profile import classify
+from p2e_character_one_pager.render import OnePagerEngine
+from p2e_character_one_pager.timings import StageTimer
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OnePagerEngine()
+
+
+def test_large_spell_list_streams_in_several_chunks(engine):
+    char = parse_build(unwrap_build(generate_build(random.Random(0), 20, "caster", extreme=True)))
+    profile = classify(char)
+    ranks = sum(len(caster.prepared or caster.spells) for caster in char.spellcasters)
+    assert ranks > 5
+    expected = engine.render(char, profile)
+
+    # The second pass comes from the warm fragment cache, which must not merge the ranks
+    for _ in range(2):
+        chunks = list(engine.generate(char, profile))
+        assert "".join(chunks) == expected
+        spell_chunks = [chunk for chunk in chunks if 'class="spell-entry"' in chunk]
+        assert len(spell_chunks) >= ranks
+        assert max(map(len, chunks)) < len(expected) / 4
+
+
+def test_roster_escapes_names(engine):
+    char = parse_build(unwrap_build(generate_build(random.Random(1), 4, "martial")))
+    char.identity.name = "<b>Bold</b> & co"
+    html = "".join(engine.generate_roster([(char, classify(char))]))
+    assert "<b>Bold" not in html
+    assert html.count("&lt;b&gt;Bold&lt;/b&gt; &amp; co") == 2  # index entry and sheet header
+
+
+def test_buffered_build_times_fit_render_and_minify_separately(engine):
+    char = parse_build(unwrap_build(generate_build(random.Random(2), 12, "caster")))
+    recorded = []
+    timer = StageTimer(hooks=[lambda stage, seconds: recorded.append(stage)])
+    chunks = engine.generate(char, classify(char), timer=timer, fit=True, minify=True)
+    assert list(timer.stages) == ["context", "fit", "render", "minify"]
+    assert recorded == list(timer.stages)
+    assert "".join(chunks) == engine.render(char, classify(char), fit=True, minify=True)
+
+
+def test_streamed_build_times_context_before_the_first_chunk(engine):
+    char = parse_build(unwrap_build(generate_build(random.Random(2), 12, "caster")))
+    timer = StageTimer()
+    timer.stream("".join, engine.generate(char, classify(char), timer=timer))
+    assert list(timer.stages) == ["context", "render", "write"]
@@ -0,0 +1,63 @@
+import http.client
+import json
+import random
+import threading
+
+import pytest
+
+from p2e_character_one_pager.corpus import generate_build
+from p2e_character_one_pager.serve import make_server
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = make_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, body: bytes, headers: dict[str, str] | None = None, path: str = "/render"):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    try:
+        conn.putrequest("POST", path)
+        for name, value in ({"Content-Length": str(len(body))} | (headers or {})).items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_render_then_not_modified(server):
+    body = json.dumps(generate_build(random.Random(0), 5, "caster")).encode("utf-8")
+    status, headers, html = _post(server, body)
+    assert status == 200
+    assert html.startswith(b"<!DOCTYPE html>")
+    assert headers["X-Profile"]
+
+    status, again, payload = _post(server, body, {"If-None-Match": headers["ETag"]})
+    assert status == 304
+    assert again["ETag"] == headers["ETag"]
+    assert payload == b""
+
+
+def test_bad_requests(server):
+    assert _post(server, b"not json")[0] == 400
+    assert _post(server, b"[]")[0] == 400
+    assert _post(server, b"{}", path="/render?theme=nope")[0] == 400
+    assert _post(server, b"", {"Content-Length": "-1"})[0] == 400
+
+
+def test_render_failure_is_500_and_server_keeps_serving(server, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("template exploded")
+
+    body = json.dumps(generate_build(random.Random(1), 3, "martial")).encode("utf-8")
+    with monkeypatch.context() as patch:
+        patch.setattr(server.engine, "render", fail)
+        assert _post(server, body)[0] == 500
+    assert _post(server, body)[0] == 200
@@ -0,0 +1,66 @@
+import pytest
+
+from p2e_character_one_pager.spells import (
+    SPELL_INDEX,
+    SPELL_SOURCE,
+    SpellDB,
+    SpellResolver,
+    compile_index,
+    default_resolver,
+    read_source,
+)
+
+ALIASES = {
+    "Remove Disease": "Cleanse Affliction",
+    "Neutralize Poison": "Cleanse Affliction",
+    "Faerie Fire": "Revealing Light",
+    "Glitterdust": "Revealing Light",
+}
+
+
+def test_typos_in_longer_names_resolve():
+    resolver = default_resolver()
+    assert resolver.resolve("Fierball") == "Fireball"
+    assert resolver.resolve("Force Barage") == "Force Barrage"
+
+
+def test_short_or_distant_names_are_not_guessed():
+    resolver = default_resolver()
+    assert resolver.resolve("Harm") is None
+    assert resolver.resolve("Seal") is None
+    assert resolver.resolve("Telekinetic Haul") is None
+
+
+def test_ambiguous_fuzzy_match_is_rejected():
+    db = SpellDB.from_mapping({"Shield Ally": "a", "Shield Alle": "b"})
+    assert SpellResolver(db).resolve("Shield Allx") is None
+
+
+def test_reverse_alias_tries_every_legacy_name():
+    for catalog in (["Remove Disease", "Faerie Fire"], ["Neutralize Poison", "Glitterdust"]):
+        resolver = SpellResolver(SpellDB.from_mapping(dict.fromkeys(catalog, "text")), ALIASES)
+        assert resolver.resolve("Cleanse Affliction") == catalog[0]
+        assert resolver.resolve("Revealing Light") == catalog[1]
+
+
+def test_compiled_index_returns_the_source_list():
+    entries = read_source(SPELL_SOURCE)
+    db = SpellDB(compile_index(entries))
+    assert len(db) == len(entries)
+    assert db.lookup_many(name for name, _description in entries) == dict(entries)
+    for name, description in entries:
+        assert db.get(name) == description
+        assert db.get(name.upper()) == description
+
+
+def test_packaged_index_matches_the_source_list():
+    # Fails when spells.tsv was edited without running `spells compile`
+    assert sorted(SpellDB.open(SPELL_INDEX).items()) == sorted(read_source(SPELL_SOURCE))
+
+
+def test_spell_descriptions_is_a_read_only_view_of_the_index():
+    from p2e_character_one_pager.spells import SPELL_DESCRIPTIONS
+
+    assert SPELL_DESCRIPTIONS == dict(read_source(SPELL_SOURCE))
+    with pytest.raises(TypeError):
+        SPELL_DESCRIPTIONS["Fireball"] = "changed"
@@ -0,0 +1,20 @@
+import json
+import random
+
+from p2e_character_one_pager import bench
+from p2e_character_one_pager.corpus import generate_build
+
+# Only the import totals: wall-clock times say more about the machine than the code
+IMPORT_BUDGETS_MS = {name: ms for name, ms in bench.STARTUP_BUDGETS_MS.items() if name.endswith(".imports")}
+
+
+def test_cli_imports_stay_within_startup_budget(tmp_path):
+    path = tmp_path / "typical.json"
+    path.write_text(json.dumps(generate_build(random.Random(0), 5, "hybrid")), encoding="utf-8")
+    args = ["build", str(path), "-o", str(tmp_path / "out.html"), "--no-cache"]
+
+    metrics = {}
+    metrics["help.imports"], help_modules = bench.import_profile(["--help"], repeat=3)
+    metrics["build.imports"], _ = bench.import_profile(args, repeat=3)
+
+    assert bench.check_startup(metrics, help_modules, IMPORT_BUDGETS_MS) == []
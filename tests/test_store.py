@@ -0,0 +1,120 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from p2e_character_one_pager.corpus import generate_build
+from p2e_character_one_pager.store import (
+    COLUMNS,
+    INDEXED,
+    META,
+    UNCHANGED,
+    Aggregate,
+    Filter,
+    RosterStore,
+    StoreError,
+    aggregate,
+    index_files,
+    select,
+)
+
+
+def _export(path: Path, name: str, level: int, archetype: str = "caster") -> Path:
+    build = generate_build(random.Random(level), level, archetype)
+    build["build"]["name"] = name
+    path.write_text(json.dumps(build), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def exports(tmp_path: Path) -> list[Path]:
+    return [
+        _export(tmp_path / "ayla.json", "Ayla", 3),
+        _export(tmp_path / "brom.json", "Brom", 7, "martial"),
+        _export(tmp_path / "cass.json", "Cass", 12),
+    ]
+
+
+def _live_names(store: RosterStore, *filters: str) -> list[str]:
+    return sorted(store.values("name", select(store, [Filter.parse(f) for f in filters])))
+
+
+def test_append_reopen_and_query(tmp_path, exports):
+    results = list(index_files(RosterStore(tmp_path / "store"), exports))
+    assert [r.status for r in results] == [INDEXED] * 3
+
+    store = RosterStore(tmp_path / "store")
+    assert store.rows == 3
+    assert _live_names(store) == ["Ayla", "Brom", "Cass"]
+    assert _live_names(store, "level>=5", "class!=nobody") == ["Brom", "Cass"]
+    assert _live_names(store, "name=ayla") == ["Ayla"]
+    # Brom is no caster: his spell DC is missing, so it matches no filter
+    assert _live_names(store, "spell_dc>0") == ["Ayla", "Cass"]
+    [row] = aggregate(store, select(store, []), [Aggregate.parse("count"), Aggregate.parse("max:level")])
+    assert row == {"count": 3, "max(level)": 12}
+    assert [r.status for r in index_files(store, exports)] == [UNCHANGED] * 3
+
+
+def test_reindexed_file_replaces_its_old_rows(tmp_path, exports):
+    store = RosterStore(tmp_path / "store")
+    list(index_files(store, exports))
+    _export(exports[1], "Brom the Second", 8, "martial")
+
+    assert [r.status for r in index_files(store, exports)] == [UNCHANGED, INDEXED, UNCHANGED]
+    store = RosterStore(tmp_path / "store")
+    assert store.rows == 4
+    assert store.live() == [True, False, True, True]
+    assert _live_names(store) == ["Ayla", "Brom the Second", "Cass"]
+    assert _live_names(store, "level=7") == []
+
+
+def test_torn_append_is_ignored_then_truncated(tmp_path, exports):
+    path = tmp_path / "store"
+    list(index_files(RosterStore(path), exports[:2]))
+    meta = (path / META).read_bytes()
+    # A crash after writing column data but before meta.json was replaced
+    with open(path / "level.col", "ab") as f:
+        f.write(b"\x63\x00\x00\x00garbage")
+    with open(path / "name.strings", "ab") as f:
+        f.write(b'"Ghost"\n"half a na')
+
+    store = RosterStore(path)
+    assert (path / META).read_bytes() == meta
+    assert store.values("level", range(store.rows)) == [3, 7]
+    assert store.strings("name") == ["Ayla", "Brom"]
+
+    list(index_files(store, exports[2:]))
+    store = RosterStore(path)
+    assert store.values("level", range(store.rows)) == [3, 7, 12]
+    assert store.strings("name") == ["Ayla", "Brom", "Cass"]
+    assert (path / "level.col").stat().st_size == 3 * store.ints("level").itemsize
+    assert (path / "name.strings").stat().st_size == store.meta["string_bytes"]["name"]
+
+
+@pytest.mark.parametrize("text", ["", "level", "level ~ 3", "=3", "nope=3", "class>Wizard", "name<=b"])
+def test_malformed_filters_raise(text):
+    with pytest.raises(StoreError):
+        Filter.parse(text)
+
+
+@pytest.mark.parametrize("text", ["avg:level", "median", "sum:name", "max:nope"])
+def test_malformed_aggregates_raise(text):
+    with pytest.raises(StoreError):
+        Aggregate.parse(text)
+
+
+def test_unreadable_or_foreign_store_raises(tmp_path, exports):
+    store = RosterStore(tmp_path / "store")
+    list(index_files(store, exports[:1]))
+    with pytest.raises(StoreError, match="whole number"):
+        Filter.parse("level>=three").mask(store)
+    with pytest.raises(StoreError, match="unknown column"):
+        store.ints("nope")
+
+    (tmp_path / "store" / META).write_text(json.dumps({"format": 0, "columns": COLUMNS}), encoding="utf-8")
+    with pytest.raises(StoreError, match="another version"):
+        RosterStore(tmp_path / "store")
+    (tmp_path / "store" / META).write_text("{", encoding="utf-8")
+    with pytest.raises(StoreError):
+        RosterStore(tmp_path / "store")
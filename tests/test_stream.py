@@ -0,0 +1,65 @@
+import io
+import json
+
+import pytest
+
+from p2e_character_one_pager.stream import RecordError, StreamError, iter_builds
+
+# Every chunk boundary falls at every offset of these records at least once
+CHUNK_SIZES = [1, 2, 3, 5, 7]
+
+TRICKY = [
+    {"name": 'Quote "Q" Person', "notes": "ends with a backslash \\"},
+    {"name": "Brace } and ] in a string", "notes": "{ [ \\\" \\\\ } ]"},
+    {"name": "Unicode é \\u escape", "ancestry": "Elf"},
+]
+
+
+def _builds(text: str, chunk_size: int, **kwargs) -> list[dict]:
+    return list(iter_builds(io.StringIO(text), chunk_size=chunk_size, **kwargs))
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_escapes_and_braces_in_strings_across_chunks(chunk_size):
+    array = json.dumps([{"build": b} for b in TRICKY])
+    ndjson = "\n".join(json.dumps(b) for b in TRICKY) + "\n"
+    assert _builds(array, chunk_size) == TRICKY
+    assert _builds(ndjson, chunk_size) == TRICKY
+    # Concatenated with no separators, and a BOM before a single export
+    assert _builds("".join(json.dumps(b) for b in TRICKY), chunk_size) == TRICKY
+    assert _builds("\ufeff" + json.dumps({"build": TRICKY[0]}), chunk_size) == TRICKY[:1]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_truncated_final_record_is_a_stream_error(chunk_size):
+    text = json.dumps(TRICKY[0]) + "\n" + json.dumps(TRICKY[1])[:-3]
+    builds = iter_builds(io.StringIO(text), chunk_size=chunk_size)
+    assert next(builds) == TRICKY[0]
+    with pytest.raises(StreamError, match="middle of a JSON value"):
+        next(builds)
+    with pytest.raises(StreamError, match="before the closing"):
+        _builds(json.dumps(TRICKY)[:-1], chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_trailing_junk_after_array_is_a_stream_error(chunk_size):
+    assert _builds(json.dumps(TRICKY) + " \n", chunk_size) == TRICKY
+    with pytest.raises(StreamError, match="after the closing"):
+        _builds(json.dumps(TRICKY) + "\n]x", chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_bad_record_in_the_middle_is_skipped_with_on_error(chunk_size):
+    text = "\n".join([json.dumps(TRICKY[0]), '{"name": }', "[1, 2]", json.dumps(TRICKY[2])])
+    errors: list[RecordError] = []
+    assert _builds(text, chunk_size, on_error=errors.append) == [TRICKY[0], TRICKY[2]]
+    assert [e.index for e in errors] == [2, 3]
+
+    with pytest.raises(RecordError) as raised:
+        _builds(text, chunk_size)
+    assert raised.value.index == 2
+
+
+def test_text_between_records_is_a_stream_error():
+    with pytest.raises(StreamError, match="expected a JSON object"):
+        _builds('{"a": 1} nope {"b": 2}', 4)